@@ -0,0 +1,337 @@
+"""
+benchmark suite for the nba_parser calculations at 1, 10, 100 and 1,230 game
+scales, along with the SeasonPbP and season_bygamestats calculations of every
+game at once at 100 and 1,230 games. Scales past the twelve games in test/
+are built by resampling those games with new game ids, or with --synthetic
+every scale is a season of games from nba_parser.synthetic. Results are
+written to a JSON file so runs on different commits can be compared:
+
+    python -m benchmarks.bench_nba_parser --output before.json
+    git checkout other-branch
+    python -m benchmarks.bench_nba_parser --output after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import nba_parser as npar
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+GAME_DIR = REPO_DIR / "test"
+SCALES = [1, 10, 100, 1230]
+SEASON_SCALES = [100, 1230]
+# games each season_bygamestats worker calculates at once
+SEASON_CHUNKSIZE = 100
+
+
+def load_games(game_dir=GAME_DIR):
+    """
+    function to read every nba_scraper csv file in a directory
+
+    Inputs:
+    game_dir - directory holding the game csv files
+
+    Outputs:
+    games    - list of play by play dataframes one per game
+    """
+    return [pd.read_csv(path) for path in sorted(Path(game_dir).glob("*.csv"))]
+
+
+def resample_games(games, n_games, seed=0):
+    """
+    function to build n_games games by drawing from games with replacement.
+    Each drawn game gets its own game id so the games stay separate in the
+    box scores and RAPM possessions. The first min(n_games, len(games)) games
+    are used as they are before any are drawn twice
+
+    Inputs:
+    games   - list of play by play dataframes to draw from
+    n_games - number of games to return
+    seed    - seed of the random draws so every run uses the same games
+
+    Outputs:
+    sample  - list of n_games play by play dataframes
+    """
+    rng = np.random.default_rng(seed)
+    picks = list(range(min(n_games, len(games))))
+    picks += list(rng.integers(len(games), size=n_games - len(picks)))
+
+    sample = []
+    for i, pick in enumerate(picks):
+        game = games[pick].copy()
+        game["game_id"] = 21900001 + i
+        sample.append(game)
+
+    return sample
+
+
+def synthetic_games(n_games, seed=0):
+    """
+    function to generate n_games synthetic games
+
+    Inputs:
+    n_games - number of games to return
+    seed    - seed of the generated season
+
+    Outputs:
+    games - list of play by play dataframes one per game
+    """
+    # only imported here so resampled runs work on commits without it
+    from nba_parser import synthetic
+
+    season_df = synthetic.generate_season(n_games, seed=seed)
+
+    return [game for _, game in season_df.groupby("game_id", sort=False)]
+
+
+def time_call(func, repeat):
+    """
+    function to time func repeat times
+
+    Outputs:
+    result  - the return value of the last call
+    seconds - list of the wall clock seconds of each call
+    """
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+
+    return result, seconds
+
+
+def uncached(pbp, method):
+    """
+    function to call a PbP method with everything it caches thrown away so
+    every repeat times the full calculation instead of reusing the results,
+    melted lineup table, and event masks the last repeat built. clear_cache
+    isn't used since it also recalculates the possessions, which are timed
+    as part of PbP.__init__. Commits from before PbP cached anything have
+    none of these to reset
+    """
+    if hasattr(pbp, "_cache"):
+        pbp._cache = {}
+    for name in ["_on_court", "_event_masks"]:
+        if hasattr(pbp, name):
+            setattr(pbp, name, None)
+    return getattr(pbp, method)()
+
+
+def bench_scale(games, repeat):
+    """
+    function to time every benchmarked calculation on one list of games. Each
+    calculation is fed the output of the one before it, the same way the
+    calculations are chained together outside of the benchmark
+
+    Inputs:
+    games   - list of play by play dataframes
+    repeat  - number of times each calculation is timed
+
+    Outputs:
+    timings - dict of calculation name to its list of seconds
+    """
+    timings = {}
+
+    pbps, timings["PbP.__init__"] = time_call(
+        lambda: [npar.PbP(game) for game in games], repeat
+    )
+    pbg_dfs, timings["PbP.playerbygamestats"] = time_call(
+        lambda: [uncached(pbp, "playerbygamestats") for pbp in pbps], repeat
+    )
+    tbg_dfs, timings["PbP.teambygamestats"] = time_call(
+        lambda: [uncached(pbp, "teambygamestats") for pbp in pbps], repeat
+    )
+    rapm_dfs, timings["PbP.rapm_possessions"] = time_call(
+        lambda: [uncached(pbp, "rapm_possessions") for pbp in pbps], repeat
+    )
+
+    player_totals = npar.PlayerTotals(pbg_dfs)
+    _, timings["PlayerTotals.player_advanced_stats"] = time_call(
+        player_totals.player_advanced_stats, repeat
+    )
+    rapm_shifts = pd.concat(rapm_dfs, ignore_index=True)
+    _, timings["PlayerTotals.player_rapm_results"] = time_call(
+        lambda: npar.PlayerTotals.player_rapm_results(rapm_shifts), repeat
+    )
+    team_totals = npar.TeamTotals(tbg_dfs)
+    _, timings["TeamTotals.team_rapm_results"] = time_call(
+        team_totals.team_rapm_results, repeat
+    )
+
+    return timings
+
+
+def bench_season(games, repeat):
+    """
+    function to time calculating the box scores of every game at once, in
+    one SeasonPbP and spread over worker processes by season_bygamestats.
+    Commits from before either of them existed skip their timings
+
+    Inputs:
+    games   - list of play by play dataframes
+    repeat  - number of times each calculation is timed
+
+    Outputs:
+    timings - dict of calculation name to its list of seconds
+    """
+    timings = {}
+
+    if hasattr(npar, "SeasonPbP"):
+        season_df = pd.concat(games, ignore_index=True)
+        season, timings["SeasonPbP.__init__"] = time_call(
+            lambda: npar.SeasonPbP(season_df), repeat
+        )
+        _, timings["SeasonPbP.playerbygamestats"] = time_call(
+            lambda: uncached(season, "playerbygamestats"), repeat
+        )
+        _, timings["SeasonPbP.teambygamestats"] = time_call(
+            lambda: uncached(season, "teambygamestats"), repeat
+        )
+        del season, season_df
+
+    if hasattr(npar, "season_bygamestats"):
+        _, timings["season_bygamestats"] = time_call(
+            lambda: npar.season_bygamestats(games, chunksize=SEASON_CHUNKSIZE), repeat
+        )
+
+    return timings
+
+
+def git_commit():
+    """
+    function to return the commit the benchmarks were run on, or None when
+    the repository isn't a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(
+    scales=SCALES, repeat=3, seed=0, use_synthetic=False, season_scales=SEASON_SCALES
+):
+    """
+    function to run the benchmark suite at every scale
+
+    Inputs:
+    scales        - list of numbers of games to benchmark
+    repeat        - number of times each calculation is timed at each scale
+    seed          - seed of the resampled or synthetic games
+    use_synthetic - generate synthetic games instead of resampling test/
+    season_scales - the scales the SeasonPbP and season_bygamestats
+                    benchmarks are also run at
+
+    Outputs:
+    results       - dict of the run's environment and timings ready to dump to
+                    JSON. results["benchmarks"][name][scale] holds the min,
+                    median and every timing in seconds
+    """
+    games = None if use_synthetic else load_games()
+    results = {
+        "commit": git_commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "seed": seed,
+        "games": "synthetic" if use_synthetic else "resampled",
+        "benchmarks": {},
+    }
+
+    for scale in scales:
+        if use_synthetic:
+            scale_games = synthetic_games(scale, seed)
+        else:
+            scale_games = resample_games(games, scale, seed)
+        timings = bench_scale(scale_games, repeat)
+        if scale in season_scales:
+            timings.update(bench_season(scale_games, repeat))
+        for name, seconds in timings.items():
+            results["benchmarks"].setdefault(name, {})[str(scale)] = {
+                "min": min(seconds),
+                "median": statistics.median(seconds),
+                "seconds": seconds,
+            }
+            print(f"{name:<36} {scale:>5} games {min(seconds):10.4f}s")
+
+    return results
+
+
+def compare(results, baseline):
+    """
+    function to print the ratio of each benchmark's min time to the min time
+    of the same benchmark and scale in a baseline run. Ratios over 1 are
+    slower than the baseline
+
+    Inputs:
+    results  - dict returned by run_benchmarks
+    baseline - dict returned by run_benchmarks on another commit
+    """
+    print(f"\ncompared to {baseline.get('commit')}")
+    for name, scales in results["benchmarks"].items():
+        for scale, timing in scales.items():
+            base_timing = baseline["benchmarks"].get(name, {}).get(scale)
+            if base_timing is None:
+                continue
+            ratio = timing["min"] / base_timing["min"]
+            print(f"{name:<36} {scale:>5} games {ratio:8.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scales", type=int, nargs="+", default=SCALES, help="numbers of games"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="timings of each benchmark"
+    )
+    parser.add_argument(
+        "--season-scales",
+        type=int,
+        nargs="*",
+        default=SEASON_SCALES,
+        help="numbers of games to also benchmark SeasonPbP and season_bygamestats at",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the games")
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="benchmark synthetic games instead of resampling test/",
+    )
+    parser.add_argument(
+        "--output", default="benchmarks.json", help="JSON file to write results to"
+    )
+    parser.add_argument("--compare", help="JSON file of a baseline run")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.scales, args.repeat, args.seed, args.synthetic, args.season_scales
+    )
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
-from .pbp import PbP
-from .playertotals import PlayerTotals
+from .pbp import PbP, SeasonPbP, LivePbP
+from .playertotals import PlayerIndex, PlayerRapm, PlayerTotals
 from .teamtotals import TeamTotals
+from .runner import season_bygamestats
@@ -0,0 +1,186 @@
+"""
+opt in instrumentation of the internal stages of the PbP, PlayerTotals, and
+TeamTotals calculations. Every method decorated with stage reports its wall
+time, the rows it returned, and optionally its peak memory to the hooks added
+with add_hook. With no hooks added a stage is only a check of an empty list
+before calling the method, so nothing is timed or traced.
+
+Stages nest, so the seconds and memory of a stage like
+PbP.playerbygamestats include the stages it calls. Hooks are per process;
+the workers of season_bygamestats don't report to the hooks of the process
+that started them.
+
+    from nba_parser import instrument
+
+    with instrument.Report() as report:
+        pbp.playerbygamestats()
+    print(report.summary())
+"""
+import time
+import tracemalloc
+from functools import wraps
+
+import pandas as pd
+
+# the callbacks every finished stage record is passed to and whether each one
+# wants peak memory traced
+_hooks = []
+_memory_hooks = []
+# [memory at the start, highest peak seen so far] of every running stage when
+# memory is traced, innermost stage last
+_frames = []
+_started_tracing = False
+
+
+def add_hook(hook, memory=False):
+    """
+    function to add a callback that is passed the record of every stage that
+    finishes. Each record is a dict of the stage name, the wall clock
+    seconds, the rows returned, and the peak memory in bytes the stage
+    allocated over what was allocated when it started. rows is None for
+    stages that don't return a dataframe or array and peak_memory is None
+    unless memory is traced
+
+    Inputs:
+    hook   - callable taking one record dict
+    memory - trace peak memory with tracemalloc while this hook is added,
+             which slows down every allocation while it's on
+    """
+    global _started_tracing
+
+    _hooks.append(hook)
+    if memory:
+        _memory_hooks.append(hook)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+
+
+def remove_hook(hook):
+    """
+    function to remove a callback added with add_hook. tracemalloc is stopped
+    once no hooks want memory if add_hook started it
+    """
+    global _started_tracing
+
+    _hooks.remove(hook)
+    if hook in _memory_hooks:
+        _memory_hooks.remove(hook)
+        if not _memory_hooks and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def _rows(result):
+    """
+    function to return the number of rows in a stage's result, the first
+    item of the result is used for stages that return a tuple
+    """
+    if isinstance(result, tuple) and result:
+        result = result[0]
+
+    shape = getattr(result, "shape", None)
+    if shape:
+        return shape[0]
+    return None
+
+
+def _run_stage(name, func, args, kwargs):
+    """
+    function to call a stage's method and pass its record to every hook
+    """
+    # tracemalloc.reset_peak is only in python 3.9 and later
+    memory = (
+        bool(_memory_hooks)
+        and tracemalloc.is_tracing()
+        and hasattr(tracemalloc, "reset_peak")
+    )
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if _frames:
+            _frames[-1][1] = max(_frames[-1][1], peak)
+        tracemalloc.reset_peak()
+        _frames.append([current, current])
+
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        seconds = time.perf_counter() - start
+        if memory:
+            start_memory, peak = _frames.pop()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            if _frames:
+                _frames[-1][1] = max(_frames[-1][1], peak)
+
+    record = {
+        "stage": name,
+        "seconds": seconds,
+        "rows": _rows(result),
+        "peak_memory": peak - start_memory if memory else None,
+    }
+    for hook in list(_hooks):
+        hook(record)
+
+    return result
+
+
+def stage(func):
+    """
+    decorator to make a method a stage reported to the hooks, named by the
+    method's qualified name such as PbP._player_stat_events
+    """
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _hooks:
+            return func(*args, **kwargs)
+        return _run_stage(name, func, args, kwargs)
+
+    return wrapper
+
+
+class Report:
+    """
+    This class is a hook that keeps the record of every stage so a batch run
+    can be summed up by stage afterwards. Used as a context manager it adds
+    itself as a hook on entering and removes itself on exiting
+    """
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def __enter__(self):
+        add_hook(self, memory=self.memory)
+        return self
+
+    def __exit__(self, *exc_info):
+        remove_hook(self)
+
+    def summary(self):
+        """
+        method to aggregate the records by stage
+
+        Outputs:
+        summary_df - dataframe with one row per stage of its calls, total,
+                     mean, and max seconds, total rows, and max peak memory
+                     sorted by total seconds
+        """
+        records_df = pd.DataFrame(
+            self.records, columns=["stage", "seconds", "rows", "peak_memory"]
+        )
+        summary_df = records_df.groupby("stage").agg(
+            calls=("seconds", "size"),
+            seconds=("seconds", "sum"),
+            mean_seconds=("seconds", "mean"),
+            max_seconds=("seconds", "max"),
+            rows=("rows", "sum"),
+            peak_memory=("peak_memory", "max"),
+        )
+
+        return summary_df.sort_values("seconds", ascending=False).reset_index()
@@ -1,7 +1,198 @@
-from datetime import datetime
-import math
+from functools import wraps
 import numpy as np
 import pandas as pd
+from . import instrument
+from .store import load_arrow, load_games, typed_pbp
+
+# the play by play columns the PbP calculations use which are the only ones
+# read when loading games from the game store
+PBP_COLUMNS = (
+    [
+        "game_id",
+        "eventnum",
+        "eventmsgactiontype",
+        "period",
+        "pctimestring",
+        "homedescription",
+        "visitordescription",
+        "player1_id",
+        "player1_team_id",
+        "player2_id",
+        "player2_team_id",
+        "player3_id",
+        "player3_team_id",
+        "home_team_abbrev",
+        "away_team_abbrev",
+        "home_team_id",
+        "away_team_id",
+        "game_date",
+        "season",
+        "event_team",
+        "event_type_de",
+        "shot_made",
+        "is_block",
+        "seconds_elapsed",
+        "event_length",
+        "is_three",
+        "points_made",
+        "is_o_rebound",
+        "is_d_rebound",
+        "is_turnover",
+        "is_steal",
+    ]
+    + [f"home_player_{i}{suffix}" for i in range(1, 6) for suffix in ["", "_id"]]
+    + [f"away_player_{i}{suffix}" for i in range(1, 6) for suffix in ["", "_id"]]
+)
+# the player counting stats credited to the players making the play, in the
+# order they come out in playerbygamestats
+PLAYER_PLAY_STATS = [
+    "fgm",
+    "fga",
+    "tpm",
+    "tpa",
+    "ftm",
+    "fta",
+    "points",
+    "blk",
+    "ast",
+    "oreb",
+    "dreb",
+    "tov",
+    "pf",
+    "stl",
+]
+# the player counting stats summed out of _player_stat_events, plus and minus
+# are credited to everyone on court
+PLAYER_COUNT_STATS = PLAYER_PLAY_STATS + ["plus", "minus"]
+# the categories of the stat column of _player_stat_events, every counting
+# stat along with the time on court and possessions of the players on court
+PLAYER_EVENT_STATS = ["toc", "possessions"] + PLAYER_COUNT_STATS
+# the stats that can be picked with the stats argument of playerbygamestats
+# and teambygamestats, and the stats each derived one is calculated from. toc
+# is always calculated since it decides which players played in a game
+PLAYER_BOX_STATS = ["toc"] + PLAYER_COUNT_STATS + ["plus_minus", "possessions"]
+PLAYER_DERIVED_STATS = {"plus_minus": ["plus", "minus"]}
+TEAM_BOX_STATS = [
+    "points_for",
+    "tpa",
+    "fga",
+    "fta",
+    "fgm",
+    "tpm",
+    "ftm",
+    "blk",
+    "shots_blocked",
+    "ast",
+    "dreb",
+    "oreb",
+    "tov",
+    "pf",
+    "fouls_drawn",
+    "stl",
+    "points_against",
+    "plus_minus",
+    "possessions",
+    "is_win",
+]
+TEAM_DERIVED_STATS = {
+    "shots_blocked": ["blk"],
+    "fouls_drawn": ["pf"],
+    "points_against": ["points_for"],
+    "plus_minus": ["points_for"],
+    "is_win": ["points_for"],
+}
+
+
+def _stat_dependencies(stats, box_stats, derived_stats):
+    """
+    function to resolve the stats a box score has to calculate to return the
+    stats asked for
+
+    Inputs:
+    stats         - list of stats to return, None for every stat
+    box_stats     - list of every stat the box score can return
+    derived_stats - dict of the stats each derived stat is calculated from
+
+    Outputs:
+    needed        - set of the stats to calculate, None for every stat
+    """
+    if stats is None:
+        return None
+
+    unknown = [stat for stat in stats if stat not in box_stats]
+    if unknown:
+        raise ValueError(f"unknown stats {unknown}, choose from {box_stats}")
+
+    needed = set(stats)
+    for stat in stats:
+        needed.update(derived_stats.get(stat, []))
+
+    return needed
+
+
+def _column_arrays(pbp_df):
+    """
+    function to get the array behind every column of a dataframe without
+    copying any of them, the codes of categorical columns
+
+    Inputs:
+    pbp_df      - dataframe to get the arrays of
+
+    Outputs:
+    arrays      - list of the column arrays. Holding on to them keeps their
+                  memory from being reused by arrays created later
+    fingerprint - tuple of the name, length, and memory address of every
+                  column, which changes when a column is added, dropped, or
+                  replaced but not when values are changed in place
+    """
+    arrays = [
+        pbp_df[col].values.codes
+        if pbp_df[col].dtype == "category"
+        else pbp_df[col].to_numpy()
+        for col in pbp_df.columns
+    ]
+    fingerprint = tuple(
+        (col, array.shape[0], array.__array_interface__["data"][0])
+        for col, array in zip(pbp_df.columns, arrays)
+    )
+
+    return arrays, fingerprint
+
+
+def _memoize(method):
+    """
+    decorator to keep a PbP method's result in self._cache keyed by the
+    method's name and arguments, so calling it again on the same play by play
+    is a dict lookup. Lists passed as arguments are keyed as tuples and calls
+    with any other unhashable argument aren't cached. The cached result is
+    copied on the way out so callers can change what they get back, like
+    player_rapm_results adding columns to rapm_possessions, without changing
+    the cache. The cache is cleared first if a column of self.df has been
+    added, dropped, or replaced since it was filled
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _column_arrays(self.df)[1] != self._df_fingerprint:
+            self.clear_cache()
+        key = (
+            method.__name__,
+            tuple(tuple(arg) if isinstance(arg, list) else arg for arg in args),
+            tuple(
+                (name, tuple(arg) if isinstance(arg, list) else arg)
+                for name, arg in sorted(kwargs.items())
+            ),
+        )
+        try:
+            result = self._cache[key]
+        except KeyError:
+            result = self._cache[key] = method(self, *args, **kwargs)
+        except TypeError:
+            result = method(self, *args, **kwargs)
+
+        return result.copy()
+
+    return wrapper
 
 
 class PbP:
@@ -10,1900 +201,1168 @@ class PbP:
     building methods on top of this class to streamline the calculation of
     stats from the play by player and then insertion into a database of the
     users choosing
+
+    The play by play dataframe is converted to compact dtypes on load, with
+    categorical event types, team abbreviations, and player names, int32 ids
+    and boolean event flags. Derived event columns like possessions are kept off
+    of self.df and the dataframe passed in is never modified
+
+    The box scores, RAPM possessions, and the masks and tables they share are
+    cached on the object so calling playerbygamestats, teambygamestats, and
+    rapm_possessions on the same game only calculates each of them once.
+    Setting self.df or any of its columns clears the cache
     """
 
     def __init__(self, pbp_df):
         self.df = pbp_df
-        self.home_team = pbp_df["home_team_abbrev"].unique()[0]
-        self.away_team = pbp_df["away_team_abbrev"].unique()[0]
-        self.home_team_id = pbp_df["home_team_id"].unique()[0]
-        self.away_team_id = pbp_df["away_team_id"].unique()[0]
-        self.season = pbp_df["season"].unique()[0]
-
-        # done to handle PbP classes created from imported csv files versus
-        # those that are created by nba_scraper that handles game_date as a
-        # proper datetime dtype
-        if self.df["game_date"].dtypes == "O":
-            self.game_date = datetime.strptime(
-                pbp_df["game_date"].unique()[0], "%Y-%m-%d"
-            )
-            self.df["game_date"] = pd.to_datetime(self.df["game_date"])
-        else:
-            self.game_date = pbp_df["game_date"].unique()[0]
 
-        # change column types to fit my database at a later time on insert
+    @property
+    def df(self):
+        """
+        the play by play dataframe with compact dtypes. Setting it to a new
+        play by play dataframe converts its dtypes and clears the cache. It
+        doesn't share any arrays that can be changed with the dataframe it
+        was set to
+        """
+        return self._df
 
-        self.df["scoremargin"] = self.df["scoremargin"].astype(str)
+    @df.setter
+    def df(self, pbp_df):
+        self._df = typed_pbp(pbp_df)
+        self.clear_cache()
 
-        # calculating home and away possesions to later aggregate for players
-        # and teams
+    def clear_cache(self):
+        """
+        method to throw away every cached result and recalculate the
+        possessions and game info. Setting self.df or one of its columns
+        clears the cache already, call this after changing values of self.df
+        in place like pbp.df.loc[rows, col] = value
+        """
+        self._df_arrays, self._df_fingerprint = _column_arrays(self.df)
+        self._cache = {}
+        self._on_court = None
+        self._event_masks = None
+        self._possession_calc()
+        self.games = self._game_info()
+        self._game_attributes()
+
+    def _game_attributes(self):
+        """
+        method to set the teams, season, and date of the game from the game
+        info so they change along with self.df
+        """
+        game = self.games.iloc[0]
+        self.home_team = game["home_team_abbrev"]
+        self.away_team = game["away_team_abbrev"]
+        self.home_team_id = game["home_team_id"]
+        self.away_team_id = game["away_team_id"]
+        self.season = game["season"]
+        # game_date is parsed to a datetime by typed_pbp whether it came from
+        # an imported csv file or straight from nba_scraper
+        self.game_date = game["game_date"].to_pydatetime()
+
+    @classmethod
+    def from_store(cls, path, game_ids=None, seasons=None):
+        """
+        method to create the class from games in the game store written by
+        nba_parser.store.write_games. Only the columns in PBP_COLUMNS are read
+
+        Inputs:
+        path     - root directory of the game store
+        game_ids - list of game ids to load
+        seasons  - list of seasons to load
+        """
+        return cls(
+            load_games(path, game_ids=game_ids, seasons=seasons, columns=PBP_COLUMNS)
+        )
+
+    @classmethod
+    def from_arrow(cls, source, game_ids=None):
+        """
+        method to create the class from an Arrow table or a Feather file
+        written by nba_parser.store.write_feather. Feather files are memory
+        mapped so processes working on the same file share one copy of it in
+        the OS page cache. Only the columns in PBP_COLUMNS are converted to
+        pandas
+
+        Inputs:
+        source   - pyarrow Table or path to a Feather file
+        game_ids - list of game ids to load
+        """
+        return cls(load_arrow(source, game_ids=game_ids, columns=PBP_COLUMNS))
+
+    def _event_mask(self, *event_types):
+        """
+        method to return a boolean mask of the rows whose event_type_de is one
+        of event_types. The categorical codes of event_type_de are split into
+        one mask per event type the first time this is called so the calc
+        methods don't have to compare strings over the whole dataframe again
+
+        Inputs:
+        event_types - event_type_de values to match, i.e. "shot", "foul"
+
+        Outputs:
+        mask        - boolean numpy array the length of self.df
+        """
+        if self._event_masks is None:
+            event_type = self.df["event_type_de"].astype("category")
+            codes = event_type.cat.codes.to_numpy()
+            self._event_masks = {
+                name: codes == code
+                for code, name in enumerate(event_type.cat.categories)
+            }
+
+        mask = np.zeros(self.df.shape[0], dtype=bool)
+        for event_type in event_types:
+            if event_type in self._event_masks:
+                mask |= self._event_masks[event_type]
+
+        return mask
+
+    @_memoize
+    def _personal_fouls(self):
+        """
+        method to return a boolean mask of the fouls that count as a personal
+        foul for the player and team box scores
+        """
+        return self._event_mask("foul") & (
+            self.df["eventmsgactiontype"]
+            .isin([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 14, 15, 26, 27, 28])
+            .to_numpy()
+        )
+
+    @instrument.stage
+    def _possession_calc(self):
+        """
+        method to calculate home and away possessions on every event row to
+        later aggregate for players and teams. All of the calculations are
+        vectorized over the whole dataframe so they work the same whether it
+        holds one game or many. The flags are stored in self.possessions
+        instead of being added to self.df so the play by play dataframe can be
+        shared with other processes without being copied
+        """
+        # whether the event before a rebound was a free throw, masked at the
+        # start of each game so a multi game dataframe doesn't look back into
+        # the previous game
+        prev_free_throw = np.roll(self._event_mask("free-throw"), 1) & (
+            self.df["game_id"] == self.df["game_id"].shift(1)
+        )
+
+        self.possessions = pd.DataFrame(index=self.df.index)
 
         # calculating made shot possessions
-        self.df["home_possession"] = np.where(
-            (self.df.event_team == self.df.home_team_abbrev)
-            & (self.df.event_type_de == "shot"),
+        self.possessions["home_possession"] = np.where(
+            (self.df.event_team == self.df.home_team_abbrev) & self._event_mask("shot"),
             1,
             0,
         )
         # calculating turnover possessions
-        self.df["home_possession"] = np.where(
+        self.possessions["home_possession"] = np.where(
             (self.df.event_team == self.df.home_team_abbrev)
-            & (self.df.event_type_de == "turnover"),
+            & self._event_mask("turnover"),
             1,
-            self.df["home_possession"],
+            self.possessions["home_possession"],
         )
         # calculating defensive rebound possessions
-        self.df["home_possession"] = np.where(
+        self.possessions["home_possession"] = np.where(
             (
                 (self.df.event_team == self.df.away_team_abbrev)
                 & (self.df.is_d_rebound == 1)
             )
             | (
-                (self.df.event_type_de == "rebound")
+                self._event_mask("rebound")
                 & (self.df.is_d_rebound == 0)
                 & (self.df.is_o_rebound == 0)
                 & (self.df.event_team == self.df.away_team_abbrev)
-                & (self.df.event_type_de.shift(1) != "free-throw")
+                & ~prev_free_throw
             ),
             1,
-            self.df["home_possession"],
+            self.possessions["home_possession"],
         )
         # calculating final free throw possessions
-        self.df["home_possession"] = np.where(
+        self.possessions["home_possession"] = np.where(
             (self.df.event_team == self.df.home_team_abbrev)
             & (
                 (self.df.homedescription.str.contains("Free Throw 2 of 2"))
                 | (self.df.homedescription.str.contains("Free Throw 3 of 3"))
             ),
             1,
-            self.df["home_possession"],
+            self.possessions["home_possession"],
         )
         # calculating made shot possessions
-        self.df["away_possession"] = np.where(
-            (self.df.event_team == self.df.away_team_abbrev)
-            & (self.df.event_type_de == "shot"),
+        self.possessions["away_possession"] = np.where(
+            (self.df.event_team == self.df.away_team_abbrev) & self._event_mask("shot"),
             1,
             0,
         )
         # calculating turnover possessions
-        self.df["away_possession"] = np.where(
+        self.possessions["away_possession"] = np.where(
             (self.df.event_team == self.df.away_team_abbrev)
-            & (self.df.event_type_de == "turnover"),
+            & self._event_mask("turnover"),
             1,
-            self.df["away_possession"],
+            self.possessions["away_possession"],
         )
         # calculating defensive rebound possessions
-        self.df["away_possession"] = np.where(
+        self.possessions["away_possession"] = np.where(
             (
                 (self.df.event_team == self.df.home_team_abbrev)
                 & (self.df.is_d_rebound == 1)
             )
             | (
-                (self.df.event_type_de == "rebound")
+                self._event_mask("rebound")
                 & (self.df.is_d_rebound == 0)
                 & (self.df.is_o_rebound == 0)
                 & (self.df.event_team == self.df.home_team_abbrev)
-                & (self.df.event_type_de.shift(1) != "free-throw")
+                & ~prev_free_throw
             ),
             1,
-            self.df["away_possession"],
+            self.possessions["away_possession"],
         )
         # calculating final free throw possessions
-        self.df["away_possession"] = np.where(
+        self.possessions["away_possession"] = np.where(
             (self.df.event_team == self.df.away_team_abbrev)
             & (
                 (self.df.visitordescription.str.contains("Free Throw 2 of 2"))
                 | (self.df.visitordescription.str.contains("Free Throw 3 of 3"))
             ),
             1,
-            self.df["away_possession"],
+            self.possessions["away_possession"],
         )
 
-    def _point_calc_player(self):
+    def _game_info(self):
         """
-        method calculates simple shooting stats like field goals, three points,
-        and free throws made and attempted.
+        method to build a table of the game level info for every game in the
+        play by play dataframe indexed by game_id. This is used to fill in the
+        home/away and opponent columns of the player and team box scores
         """
-        self.df["fgm"] = np.where(
-            (self.df["shot_made"] == 1) & (self.df["event_type_de"] == "shot"), 1, 0
-        )
-        self.df["fga"] = np.where(
-            self.df["event_type_de"].str.contains("shot|missed_shot", regex=True), 1, 0
-        )
-        self.df["tpm"] = np.where(
-            (self.df["shot_made"] == 1) & (self.df["is_three"] == 1), 1, 0
-        )
-        self.df["tpa"] = np.where(self.df["is_three"] == 1, 1, 0)
-        self.df["ftm"] = np.where(
-            (self.df["shot_made"] == 1)
-            & (self.df["event_type_de"].str.contains("free-throw")),
-            1,
-            0,
-        )
-        self.df["fta"] = np.where(
-            self.df["event_type_de"].str.contains("free-throw"), 1, 0
-        )
+        columns = [
+            "game_id",
+            "home_team_id",
+            "away_team_id",
+            "home_team_abbrev",
+            "away_team_abbrev",
+            "game_date",
+            "season",
+        ]
+        return self._columns(columns).drop_duplicates("game_id").set_index("game_id")
 
-        player_points_df = (
-            self.df.groupby(["player1_id", "game_date", "game_id", "player1_team_id"])[
-                ["fgm", "fga", "tpm", "tpa", "ftm", "fta", "points_made"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        player_points_df["player1_team_id"] = player_points_df[
-            "player1_team_id"
-        ].astype(int)
-        player_points_df.rename(
-            columns={
-                "player1_id": "player_id",
-                "player1_team_id": "team_id",
-                "points_made": "points",
-            },
-            inplace=True,
-        )
+    def _columns(self, columns, rows=None):
+        """
+        method to select columns of self.df into a new dataframe one column at
+        a time. Selecting a list of columns or a boolean mask of rows straight
+        off of self.df makes pandas consolidate all of its columns into new
+        arrays, which would copy the memory mapped columns from from_arrow
 
-        return player_points_df
+        Inputs:
+        columns  - list of column names to select
+        rows     - boolean mask of the rows to keep, defaults to every row
 
-    def _assist_calc_player(self):
+        Outputs:
+        selected - dataframe of just the selected columns and rows
         """
-        method to calculat players assist totals from a game play by play
+        selected = pd.DataFrame({col: self.df[col] for col in columns})
+        if rows is not None:
+            selected = selected[rows]
+
+        return selected
+
+    def _player_stat_columns(self, columns):
         """
-        assists = self.df[
-            (self.df["event_type_de"] == "shot") & (self.df["shot_made"] == 1)
-        ]
+        method to select a few columns of playerbygamestats with the keys to
+        join them to other player stats. The single stat player methods below
+        are these selections so they're calculated by the same
+        _player_stat_sums pass as playerbygamestats
 
-        assists = (
-            assists.groupby(["player2_id", "game_id", "game_date", "player2_team_id"])[
-                ["eventnum"]
-            ]
-            .count()
-            .reset_index()
-        )
+        Inputs:
+        columns  - list of playerbygamestats columns to select, the
+                   PLAYER_BOX_STATS among them are the only ones calculated
 
-        assists["player2_team_id"] = assists["player2_team_id"].astype(int)
-        assists.rename(
-            columns={
-                "player2_id": "player_id",
-                "player2_team_id": "team_id",
-                "eventnum": "ast",
-            },
-            inplace=True,
-        )
+        Outputs:
+        stats_df - dataframe of player_id, team_id, game_id, and game_date
+                   along with the selected columns
+        """
+        stats = [col for col in columns if col in PLAYER_BOX_STATS]
+        keys = ["player_id", "team_id", "game_id", "game_date"]
 
-        return assists
+        return self.playerbygamestats(stats=stats)[keys + columns]
 
-    def _rebound_calc_player(self):
+    def _point_calc_player(self):
         """
-        function to calculate player's offensive and defensive rebound totals
+        method calculates simple shooting stats like field goals, three points,
+        and free throws made and attempted.
         """
-        rebounds = (
-            self.df.groupby(["player1_id", "game_id", "game_date"])[
-                ["is_o_rebound", "is_d_rebound"]
-            ]
-            .sum()
-            .reset_index()
+        return self._player_stat_columns(
+            ["fgm", "fga", "tpm", "tpa", "ftm", "fta", "points"]
         )
 
-        rebounds.rename(
-            columns={
-                "player1_id": "player_id",
-                "is_o_rebound": "oreb",
-                "is_d_rebound": "dreb",
-            },
-            inplace=True,
-        )
+    def _assist_calc_player(self):
+        """
+        method to calculat players assist totals from a game play by play
+        """
+        return self._player_stat_columns(["ast"])
 
-        return rebounds
+    def _rebound_calc_player(self):
+        """
+        function to calculate player's offensive and defensive rebound totals
+        """
+        return self._player_stat_columns(["oreb", "dreb"])
 
     def _turnover_calc_player(self):
         """
         function to calculate player's turnover totals
         """
-        turnovers = (
-            self.df.groupby(["player1_id", "game_id", "game_date", "player1_team_id"])[
-                ["is_turnover"]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        turnovers["player1_team_id"] = turnovers["player1_team_id"].astype(int)
-        turnovers.rename(
-            columns={
-                "player1_id": "player_id",
-                "player1_team_id": "team_id",
-                "is_turnover": "tov",
-            },
-            inplace=True,
-        )
-
-        return turnovers
+        return self._player_stat_columns(["tov"])
 
     def _foul_calc_player(self):
         """
         method to calculate players personal fouls in a game
         """
-        fouls = self.df[
-            (self.df["event_type_de"] == "foul")
-            & (
-                self.df["eventmsgactiontype"].isin(
-                    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 14, 15, 26, 27, 28]
-                )
-            )
-        ]
-        fouls = (
-            fouls.groupby(["player1_id", "game_id", "game_date", "player1_team_id"])[
-                "eventnum"
-            ]
-            .count()
-            .reset_index()
-        )
-        fouls["player1_team_id"] = fouls["player1_team_id"].astype(int)
-        fouls.rename(
-            columns={
-                "player1_id": "player_id",
-                "player1_team_id": "team_id",
-                "eventnum": "pf",
-            },
-            inplace=True,
-        )
-
-        return fouls
+        return self._player_stat_columns(["pf"])
 
     def _steal_calc_player(self):
         """
         function to calculate player's steal totals
         """
-        steals = (
-            self.df.groupby(["player2_id", "game_id", "game_date", "player2_team_id"])[
-                ["is_steal"]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        steals["player2_team_id"] = steals["player2_team_id"].astype(int)
-        steals.rename(
-            columns={
-                "player2_id": "player_id",
-                "player2_team_id": "team_id",
-                "is_steal": "stl",
-            },
-            inplace=True,
-        )
-        return steals
+        return self._player_stat_columns(["stl"])
 
     def _block_calc_player(self):
         """
         function to calculate player blocks and return a dataframe with players
         and blocked shots stats along with key columns to join to other dataframes
         """
-        blocks = self.df[self.df["event_type_de"] != "jump-ball"]
-        blocks = (
-            blocks.groupby(["player3_id", "game_id", "game_date", "player3_team_id"])[
-                ["is_block"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        blocks["player3_team_id"] = blocks["player3_team_id"].astype(int)
-        blocks.rename(
-            columns={
-                "player3_id": "player_id",
-                "player3_team_id": "team_id",
-                "is_block": "blk",
-            },
-            inplace=True,
-        )
+        return self._player_stat_columns(["blk"])
 
-        return blocks
-
-    def _plus_minus_calc_player(self):
-
-        self.df["home_plus"] = np.where(
-            self.df["event_team"] == self.df["home_team_abbrev"],
-            self.df["points_made"],
-            0,
-        )
-        self.df["home_minus"] = np.where(
-            self.df["event_team"] != self.df["home_team_abbrev"],
-            self.df["points_made"],
-            0,
-        )
-        self.df["away_plus"] = np.where(
-            self.df["event_team"] != self.df["home_team_abbrev"],
-            self.df["points_made"],
-            0,
-        )
-        self.df["away_minus"] = np.where(
-            self.df["event_team"] == self.df["home_team_abbrev"],
-            self.df["points_made"],
-            0,
-        )
-
-        no_ft_df = self.df[self.df["event_type_de"] != "free-throw"].copy()
-
-        home_player_1 = (
-            no_ft_df.groupby(
-                ["home_player_1_id", "game_id", "game_date", "home_team_id"]
-            )[["home_plus", "home_minus"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_1.rename(
-            columns={
-                "home_player_1_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_2 = (
-            no_ft_df.groupby(
-                ["home_player_2_id", "game_id", "game_date", "home_team_id"]
-            )[["home_plus", "home_minus"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_2.rename(
-            columns={
-                "home_player_2_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_3 = (
-            no_ft_df.groupby(
-                ["home_player_3_id", "game_id", "game_date", "home_team_id"]
-            )[["home_plus", "home_minus"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_3.rename(
-            columns={
-                "home_player_3_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_4 = (
-            no_ft_df.groupby(
-                ["home_player_4_id", "game_id", "game_date", "home_team_id"]
-            )[["home_plus", "home_minus"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_4.rename(
-            columns={
-                "home_player_4_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_5 = (
-            no_ft_df.groupby(
-                ["home_player_5_id", "game_id", "game_date", "home_team_id"]
-            )[["home_plus", "home_minus"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_5.rename(
-            columns={
-                "home_player_5_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-
-        away_player_1 = (
-            no_ft_df.groupby(
-                ["away_player_1_id", "game_id", "game_date", "away_team_id"]
-            )[["away_plus", "away_minus"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_1.rename(
-            columns={
-                "away_player_1_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_2 = (
-            no_ft_df.groupby(
-                ["away_player_2_id", "game_id", "game_date", "away_team_id"]
-            )[["away_plus", "away_minus"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_2.rename(
-            columns={
-                "away_player_2_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_3 = (
-            no_ft_df.groupby(
-                ["away_player_3_id", "game_id", "game_date", "away_team_id"]
-            )[["away_plus", "away_minus"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_3.rename(
-            columns={
-                "away_player_3_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_4 = (
-            no_ft_df.groupby(
-                ["away_player_4_id", "game_id", "game_date", "away_team_id"]
-            )[["away_plus", "away_minus"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_4.rename(
-            columns={
-                "away_player_4_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_5 = (
-            no_ft_df.groupby(
-                ["away_player_5_id", "game_id", "game_date", "away_team_id"]
-            )[["away_plus", "away_minus"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_5.rename(
-            columns={
-                "away_player_5_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-
-        home_plus_minus_total = pd.concat(
-            [home_player_1, home_player_2, home_player_3, home_player_4, home_player_5,]
-        )
-        away_plus_minus_total = pd.concat(
-            [away_player_1, away_player_2, away_player_3, away_player_4, away_player_5,]
-        )
-
-        home_plus_minus = (
-            home_plus_minus_total.groupby(
-                ["player_id", "game_id", "game_date", "team_id"]
-            )[["plus", "minus"]]
-            .sum()
-            .reset_index()
-        )
-
-        away_plus_minus = (
-            away_plus_minus_total.groupby(
-                ["player_id", "game_id", "game_date", "team_id"]
-            )[["plus", "minus"]]
-            .sum()
-            .reset_index()
-        )
+    @instrument.stage
+    def _on_court_long(self):
+        """
+        method to melt the ten home_player_N/away_player_N lineup slots into
+        one long table with a row for every player on the court at every event.
+        It is built once per game and shared by the plus minus, time on court,
+        and possession calculations so each of them can reduce over it with a
+        single groupby instead of one groupby per lineup slot
 
-        plus_minus = pd.concat([home_plus_minus, away_plus_minus])
+        Outputs:
+        on_court_df - dataframe with event_row, player_id, player_name, team_id,
+                      is_home, game_id, and game_date columns. The row for slot
+                      k (home_player_1 through away_player_5) of event row r
+                      is at position k * len(self.df) + r
+        """
+        if self._on_court is not None:
+            return self._on_court
 
-        # calculating plus minus for free throw events
-        foul_df = self.df[self.df["event_type_de"] == "foul"][
-            [
-                "period",
-                "seconds_elapsed",
-                "pctimestring",
-                "home_player_1_id",
-                "home_player_2_id",
-                "home_player_3_id",
-                "home_player_4_id",
-                "home_player_5_id",
-                "away_player_1_id",
-                "away_player_2_id",
-                "away_player_3_id",
-                "away_player_4_id",
-                "away_player_5_id",
-            ]
-        ].copy()
-
-        ft_df = self.df[self.df["event_type_de"] == "free-throw"][
-            [
-                "period",
-                "seconds_elapsed",
-                "pctimestring",
-                "game_id",
-                "game_date",
-                "home_team_id",
-                "away_team_id",
-                "home_plus",
-                "home_minus",
-                "away_plus",
-                "away_minus",
-            ]
+        rows = self.df.shape[0]
+        slots = [f"home_player_{i}" for i in range(1, 6)] + [
+            f"away_player_{i}" for i in range(1, 6)
         ]
+        is_home = np.repeat(np.array([True] * 5 + [False] * 5), rows)
+
+        self._on_court = pd.DataFrame(
+            {
+                "event_row": np.tile(np.arange(rows), 10),
+                "player_id": np.concatenate(
+                    [self.df[f"{slot}_id"].to_numpy() for slot in slots]
+                ),
+                "player_name": np.concatenate(
+                    [self.df[slot].to_numpy() for slot in slots]
+                ),
+                "team_id": np.where(
+                    is_home,
+                    np.tile(self.df["home_team_id"].to_numpy(), 10),
+                    np.tile(self.df["away_team_id"].to_numpy(), 10),
+                ),
+                "is_home": is_home,
+                "game_id": np.tile(self.df["game_id"].to_numpy(), 10),
+                "game_date": np.tile(self.df["game_date"].to_numpy(), 10),
+            }
+        )
+
+        return self._on_court
+
+    @instrument.stage
+    def _plus_minus_rows(self, rows=None):
+        """
+        method to credit the points of every event to the ten players on the
+        court for it. Free throw points are credited to the lineup that was on
+        the court when the foul was committed
 
-        ft_df = ft_df.merge(foul_df, on=["period", "seconds_elapsed", "pctimestring"])
-
-        home_player_1 = (
-            ft_df.groupby(["home_player_1_id", "game_id", "game_date", "home_team_id"])[
-                ["home_plus", "home_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        home_player_1.rename(
-            columns={
-                "home_player_1_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-
-        home_player_2 = (
-            ft_df.groupby(["home_player_2_id", "game_id", "game_date", "home_team_id"])[
-                ["home_plus", "home_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        home_player_2.rename(
-            columns={
-                "home_player_2_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_3 = (
-            ft_df.groupby(["home_player_3_id", "game_id", "game_date", "home_team_id"])[
-                ["home_plus", "home_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        home_player_3.rename(
-            columns={
-                "home_player_3_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_4 = (
-            ft_df.groupby(["home_player_4_id", "game_id", "game_date", "home_team_id"])[
-                ["home_plus", "home_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        home_player_4.rename(
-            columns={
-                "home_player_4_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-        home_player_5 = (
-            ft_df.groupby(["home_player_5_id", "game_id", "game_date", "home_team_id"])[
-                ["home_plus", "home_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        home_player_5.rename(
-            columns={
-                "home_player_5_id": "player_id",
-                "home_team_id": "team_id",
-                "home_plus": "plus",
-                "home_minus": "minus",
-            },
-            inplace=True,
-        )
-
-        away_player_1 = (
-            ft_df.groupby(["away_player_1_id", "game_id", "game_date", "away_team_id"])[
-                ["away_plus", "away_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        away_player_1.rename(
-            columns={
-                "away_player_1_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_2 = (
-            ft_df.groupby(["away_player_2_id", "game_id", "game_date", "away_team_id"])[
-                ["away_plus", "away_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        away_player_2.rename(
-            columns={
-                "away_player_2_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_3 = (
-            ft_df.groupby(["away_player_3_id", "game_id", "game_date", "away_team_id"])[
-                ["away_plus", "away_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        away_player_3.rename(
-            columns={
-                "away_player_3_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_4 = (
-            ft_df.groupby(["away_player_4_id", "game_id", "game_date", "away_team_id"])[
-                ["away_plus", "away_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        away_player_4.rename(
-            columns={
-                "away_player_4_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-        away_player_5 = (
-            ft_df.groupby(["away_player_5_id", "game_id", "game_date", "away_team_id"])[
-                ["away_plus", "away_minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        away_player_5.rename(
-            columns={
-                "away_player_5_id": "player_id",
-                "away_team_id": "team_id",
-                "away_plus": "plus",
-                "away_minus": "minus",
-            },
-            inplace=True,
-        )
-
-        home_ft_plus_minus_total = pd.concat(
-            [home_player_1, home_player_2, home_player_3, home_player_4, home_player_5,]
-        )
-        away_ft_plus_minus_total = pd.concat(
-            [away_player_1, away_player_2, away_player_3, away_player_4, away_player_5,]
-        )
+        Inputs:
+        rows      - boolean mask of the scoring events to credit, defaults to
+                    every event
 
-        home_plus_minus_ft = (
-            home_ft_plus_minus_total.groupby(
-                ["player_id", "game_id", "game_date", "team_id"]
-            )[["plus", "minus"]]
-            .sum()
-            .reset_index()
-        )
+        Outputs:
+        long_rows - numpy array of the _on_court_long rows credited
+        plus      - numpy array of the points scored for each of those rows
+        minus     - numpy array of the points scored against each of them
+        """
+        on_court = self._on_court_long()
+        event_count = self.df.shape[0]
+        if rows is None:
+            rows = np.ones(event_count, dtype=bool)
 
-        away_plus_minus_ft = (
-            away_ft_plus_minus_total.groupby(
-                ["player_id", "game_id", "game_date", "team_id"]
-            )[["plus", "minus"]]
-            .sum()
-            .reset_index()
-        )
+        points = self.df["points_made"].to_numpy()
+        home_scored = (self.df["event_team"] == self.df["home_team_abbrev"]).to_numpy()
+        is_home = on_court["is_home"].to_numpy()
 
-        ft_plus_minus = pd.concat([home_plus_minus_ft, away_plus_minus_ft])
+        no_ft_rows = np.flatnonzero(~self._event_mask("free-throw") & rows)
 
-        # combining free-throw and non free-throw plus minus dataframes into one
-        total_plus_minus = pd.concat([ft_plus_minus, plus_minus])
-        total_plus_minus = (
-            total_plus_minus.groupby(["player_id", "game_id", "game_date", "team_id"])[
-                ["plus", "minus"]
-            ]
-            .sum()
-            .reset_index()
-        )
-        total_plus_minus["plus_minus"] = (
-            total_plus_minus["plus"] - total_plus_minus["minus"]
-        )
+        # calculating plus minus for free throw events
+        match_cols = ["game_id", "period", "seconds_elapsed", "pctimestring"]
+        foul_df = self._columns(match_cols, self._event_mask("foul"))
+        foul_df["foul_row"] = np.flatnonzero(self._event_mask("foul"))
+        ft_df = self._columns(match_cols, self._event_mask("free-throw") & rows)
+        ft_df["ft_row"] = np.flatnonzero(self._event_mask("free-throw") & rows)
+
+        # each free throw is matched to the last foul at the same time before
+        # it so several fouls at one time, like a technical and a flagrant,
+        # don't credit its points to the court more than once
+        ft_df = pd.merge_asof(
+            ft_df,
+            foul_df,
+            left_on="ft_row",
+            right_on="foul_row",
+            by=match_cols,
+            direction="backward",
+        ).dropna(subset=["foul_row"])
+
+        lineup_rows = np.concatenate(
+            [ft_df["foul_row"].to_numpy(dtype=int), no_ft_rows]
+        )
+        point_rows = np.concatenate([ft_df["ft_row"].to_numpy(), no_ft_rows])
+
+        long_rows = (np.arange(10)[:, None] * event_count + lineup_rows).ravel()
+        point_rows = np.tile(point_rows, 10)
+        scored_for = home_scored[point_rows] == is_home[long_rows]
+
+        plus = np.where(scored_for, points[point_rows], 0)
+        minus = np.where(~scored_for, points[point_rows], 0)
+
+        return long_rows, plus, minus
 
-        return total_plus_minus
+    def _plus_minus_calc_player(self):
+        """
+        method to calculate each player's points scored for and against while
+        on the court. Free throw points are credited to the lineup that was on
+        the court when the foul was committed
+        """
+        return self._player_stat_columns(["plus", "minus", "plus_minus"])
 
     def _toc_calc_player(self):
         """
         this method calculates a players time in the game and converts it to
         a time string of MM:SS as well
         """
-
-        # home players time on court (toc) calculations
-        home_player_1 = (
-            self.df.groupby(
-                ["home_player_1_id", "game_id", "game_date", "home_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_1.rename(
-            columns={
-                "home_player_1_id": "player_id",
-                "home_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        home_player_2 = (
-            self.df.groupby(
-                ["home_player_2_id", "game_id", "game_date", "home_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_2.rename(
-            columns={
-                "home_player_2_id": "player_id",
-                "home_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        home_player_3 = (
-            self.df.groupby(
-                ["home_player_3_id", "game_id", "game_date", "home_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_3.rename(
-            columns={
-                "home_player_3_id": "player_id",
-                "home_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        home_player_4 = (
-            self.df.groupby(
-                ["home_player_4_id", "game_id", "game_date", "home_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_4.rename(
-            columns={
-                "home_player_4_id": "player_id",
-                "home_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        home_player_5 = (
-            self.df.groupby(
-                ["home_player_5_id", "game_id", "game_date", "home_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        home_player_5.rename(
-            columns={
-                "home_player_5_id": "player_id",
-                "home_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-
-        home_players_toc = pd.concat(
-            [home_player_1, home_player_2, home_player_3, home_player_4, home_player_5]
-        )
-        home_players_toc = (
-            home_players_toc.groupby(["player_id", "team_id", "game_id", "game_date"])[
-                ["toc"]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        home_players_toc["toc_string"] = pd.to_datetime(
-            home_players_toc["toc"], unit="s"
-        ).dt.strftime("%M:%S")
-
-        # away players time on court (toc) calculations
-        away_player_1 = (
-            self.df.groupby(
-                ["away_player_1_id", "game_id", "game_date", "away_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-
-        away_player_1.rename(
-            columns={
-                "away_player_1_id": "player_id",
-                "away_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        away_player_2 = (
-            self.df.groupby(
-                ["away_player_2_id", "game_id", "game_date", "away_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_2.rename(
-            columns={
-                "away_player_2_id": "player_id",
-                "away_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        away_player_3 = (
-            self.df.groupby(
-                ["away_player_3_id", "game_id", "game_date", "away_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_3.rename(
-            columns={
-                "away_player_3_id": "player_id",
-                "away_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        away_player_4 = (
-            self.df.groupby(
-                ["away_player_4_id", "game_id", "game_date", "away_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_4.rename(
-            columns={
-                "away_player_4_id": "player_id",
-                "away_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-        away_player_5 = (
-            self.df.groupby(
-                ["away_player_5_id", "game_id", "game_date", "away_team_id"]
-            )[["event_length"]]
-            .sum()
-            .reset_index()
-        )
-        away_player_5.rename(
-            columns={
-                "away_player_5_id": "player_id",
-                "away_team_id": "team_id",
-                "event_length": "toc",
-            },
-            inplace=True,
-        )
-
-        away_players_toc = pd.concat(
-            [away_player_1, away_player_2, away_player_3, away_player_4, away_player_5]
-        )
-        away_players_toc = (
-            away_players_toc.groupby(["player_id", "team_id", "game_id", "game_date"])[
-                ["toc"]
-            ]
-            .sum()
-            .reset_index()
-        )
-
-        away_players_toc["toc_string"] = pd.to_datetime(
-            away_players_toc["toc"], unit="s"
-        ).dt.strftime("%M:%S")
-
-        total_toc = pd.concat([home_players_toc, away_players_toc])
-
-        return total_toc
+        return self._player_stat_columns(["toc", "toc_string"])
 
     def _poss_calc_player(self):
         """
         function to calculate possessions each player participated in
         """
+        return self._player_stat_columns(["player_name", "possessions"])
 
-        # calculating player possesions
-        player1 = self.df[
-            [
-                "home_player_1",
-                "home_player_1_id",
-                "home_possession",
-                "game_id",
-                "home_team_id",
-            ]
-        ].rename(
-            columns={"home_player_1": "player_name", "home_player_1_id": "player_id"}
-        )
-        player2 = self.df[
-            [
-                "home_player_2",
-                "home_player_2_id",
-                "home_possession",
-                "game_id",
-                "home_team_id",
-            ]
-        ].rename(
-            columns={"home_player_2": "player_name", "home_player_2_id": "player_id"}
-        )
-        player3 = self.df[
-            [
-                "home_player_3",
-                "home_player_3_id",
-                "home_possession",
-                "game_id",
-                "home_team_id",
-            ]
-        ].rename(
-            columns={"home_player_3": "player_name", "home_player_3_id": "player_id"}
-        )
-        player4 = self.df[
-            [
-                "home_player_4",
-                "home_player_4_id",
-                "home_possession",
-                "game_id",
-                "home_team_id",
-            ]
-        ].rename(
-            columns={"home_player_4": "player_name", "home_player_4_id": "player_id"}
-        )
-        player5 = self.df[
-            [
-                "home_player_5",
-                "home_player_5_id",
-                "home_possession",
-                "game_id",
-                "home_team_id",
-            ]
-        ].rename(
-            columns={"home_player_5": "player_name", "home_player_5_id": "player_id"}
-        )
-        home_possession_df = pd.concat([player1, player2, player3, player4, player5])
-        home_possession_df = (
-            home_possession_df.groupby(
-                ["player_id", "player_name", "game_id", "home_team_id"]
-            )["home_possession"]
-            .sum()
-            .reset_index()
-            .sort_values("home_possession")
-        )
-        player1 = self.df[
-            [
-                "away_player_1",
-                "away_player_1_id",
-                "away_possession",
-                "game_id",
-                "away_team_id",
-            ]
-        ].rename(
-            columns={"away_player_1": "player_name", "away_player_1_id": "player_id"}
-        )
-        player2 = self.df[
-            [
-                "away_player_2",
-                "away_player_2_id",
-                "away_possession",
-                "game_id",
-                "away_team_id",
-            ]
-        ].rename(
-            columns={"away_player_2": "player_name", "away_player_2_id": "player_id"}
-        )
-        player3 = self.df[
-            [
-                "away_player_3",
-                "away_player_3_id",
-                "away_possession",
-                "game_id",
-                "away_team_id",
-            ]
-        ].rename(
-            columns={"away_player_3": "player_name", "away_player_3_id": "player_id"}
-        )
-        player4 = self.df[
-            [
-                "away_player_4",
-                "away_player_4_id",
-                "away_possession",
-                "game_id",
-                "away_team_id",
-            ]
-        ].rename(
-            columns={"away_player_4": "player_name", "away_player_4_id": "player_id"}
-        )
-        player5 = self.df[
-            [
-                "away_player_5",
-                "away_player_5_id",
-                "away_possession",
-                "game_id",
-                "away_team_id",
-            ]
-        ].rename(
-            columns={"away_player_5": "player_name", "away_player_5_id": "player_id"}
-        )
-        away_possession_df = pd.concat([player1, player2, player3, player4, player5])
-        away_possession_df = (
-            away_possession_df.groupby(
-                ["player_id", "player_name", "game_id", "away_team_id"]
-            )["away_possession"]
-            .sum()
-            .reset_index()
-            .sort_values("away_possession")
-        )
+    def _team_stat_columns(self, columns):
+        """
+        method to select a few columns of teambygamestats with the keys to
+        join them to other team stats. The single stat team methods below are
+        these selections so they're calculated by the same _team_stat_totals
+        pass as teambygamestats
 
-        home_possession_df = home_possession_df.rename(
-            columns={"home_team_id": "team_id", "home_possession": "possessions"}
-        )
-        away_possession_df = away_possession_df.rename(
-            columns={"away_team_id": "team_id", "away_possession": "possessions"}
-        )
-        possession_df = pd.concat([home_possession_df, away_possession_df])
+        Inputs:
+        columns  - list of teambygamestats columns to select, the
+                   TEAM_BOX_STATS among them are the only ones calculated
+
+        Outputs:
+        stats_df - dataframe of team_id and game_id along with the selected
+                   columns
+        """
+        stats = [col for col in columns if col in TEAM_BOX_STATS]
 
-        return possession_df
+        return self.teambygamestats(stats=stats)[["team_id", "game_id"] + columns]
 
     def _poss_calc_team(self):
         """
         method to calculate team possession numbers
         """
-
-        row1 = [
-            self.df.home_team_id.unique()[0],
-            self.df.game_id.unique()[0],
-            self.df.home_team_abbrev.unique()[0],
-            self.df["home_possession"].sum(),
-        ]
-        row2 = [
-            self.df.away_team_id.unique()[0],
-            self.df.game_id.unique()[0],
-            self.df.away_team_abbrev.unique()[0],
-            self.df["away_possession"].sum(),
-        ]
-        team_possession_df = pd.DataFrame(
-            [row1, row2], columns=["team_id", "game_id", "team_abbrev", "possessions"]
-        )
-
-        return team_possession_df
+        return self._team_stat_columns(["team_abbrev", "possessions"])
 
     def _point_calc_team(self):
         """
         method to calculate team field goals, free throws, and three points
         made
         """
-        self.df["fg_attempted"] = np.where(
-            self.df["event_type_de"].isin(["missed_shot", "shot"]), True, False
-        )
-        self.df["ft_attempted"] = np.where(
-            self.df["event_type_de"] == "free-throw", True, False
-        )
-        self.df["fg_made"] = np.where(
-            (self.df["event_type_de"].isin(["shot"])) & (self.df["points_made"] > 0),
-            True,
-            False,
-        )
-        self.df["tp_made"] = np.where(self.df["points_made"] == 3, True, False)
-        self.df["ft_made"] = np.where(
-            (self.df["event_type_de"] == "free-throw") & (self.df["points_made"] == 1),
-            True,
-            False,
-        )
-        teams_df = (
-            self.df.groupby(["player1_team_id", "game_id"])[
-                [
-                    "points_made",
-                    "is_three",
-                    "fg_attempted",
-                    "ft_attempted",
-                    "fg_made",
-                    "tp_made",
-                    "ft_made",
-                ]
-            ]
-            .sum()
-            .reset_index()
+        return self._team_stat_columns(
+            ["points_for", "tpa", "fga", "fta", "fgm", "tpm", "ftm"]
         )
-        teams_df["player1_team_id"] = teams_df["player1_team_id"].astype(int)
-        teams_df.rename(
-            columns={
-                "player1_team_id": "team_id",
-                "points_made": "points_for",
-                "is_three": "tpa",
-                "fg_made": "fgm",
-                "fg_attempted": "fga",
-                "ft_made": "ftm",
-                "ft_attempted": "fta",
-                "tp_made": "tpm",
-            },
-            inplace=True,
-        )
-
-        return teams_df
 
     def _assist_calc_team(self):
         """
         method to sum assists made for each team
         """
-        self.df["is_assist"] = np.where(
-            (self.df["event_type_de"] == "shot") & (self.df["player2_id"] != 0),
-            True,
-            False,
-        )
-        assists_df = (
-            self.df.groupby(["player1_team_id", "game_id"])[["is_assist"]]
-            .sum()
-            .reset_index()
-        )
-        assists_df.rename(
-            columns={"is_assist": "ast", "player1_team_id": "team_id",}, inplace=True,
-        )
-
-        return assists_df
+        return self._team_stat_columns(["ast"])
 
     def _rebound_calc_team(self):
         """
         method to calculate team offensive and deffensive rebound totals
         """
-        rebounds_df = (
-            self.df.groupby(["player1_team_id", "game_id"])[
-                ["is_d_rebound", "is_o_rebound",]
-            ]
-            .sum()
-            .reset_index()
-        )
-        rebounds_df["player1_team_id"] = rebounds_df["player1_team_id"].astype(int)
-        rebounds_df.rename(
-            columns={
-                "player1_team_id": "team_id",
-                "is_d_rebound": "dreb",
-                "is_o_rebound": "oreb",
-            },
-            inplace=True,
-        )
-
-        return rebounds_df
+        return self._team_stat_columns(["dreb", "oreb"])
 
     def _turnover_calc_team(self):
-        turnovers_df = (
-            self.df.groupby(["player1_team_id", "game_id"])[["is_turnover"]]
-            .sum()
-            .reset_index()
-        )
-        turnovers_df["player1_team_id"] = turnovers_df["player1_team_id"].astype(int)
-        turnovers_df.rename(
-            columns={"player1_team_id": "team_id", "is_turnover": "tov",}, inplace=True,
-        )
-
-        return turnovers_df
+        """
+        method to calculate team turnover totals
+        """
+        return self._team_stat_columns(["tov"])
 
     def _foul_calc_team(self):
         """
         method to calculate team personal fouls taken in a game
         """
+        return self._team_stat_columns(["pf", "fouls_drawn"])
 
-        fouls = self.df[
-            (self.df["event_type_de"] == "foul")
-            & (
-                self.df["eventmsgactiontype"].isin(
-                    [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 14, 15, 26, 27, 28]
-                )
-            )
-        ]
-        fouls = (
-            fouls.groupby(["game_id", "player1_team_id"])["eventnum"]
-            .count()
-            .reset_index()
-        )
-        fouls["player1_team_id"] = fouls["player1_team_id"].astype(int)
-        fouls.rename(
-            columns={"player1_team_id": "team_id", "eventnum": "pf",}, inplace=True,
-        )
-
-        fouls = fouls.merge(fouls, on="game_id", suffixes=["", "_opponent"])
+    def _steal_calc_team(self):
+        """
+        method to calculate team steals in a game
+        """
+        return self._team_stat_columns(["stl"])
 
-        fouls = fouls[fouls["team_id"] != fouls["team_id_opponent"]]
-        fouls.rename(
-            columns={"pf_opponent": "fouls_drawn",}, inplace=True,
-        )
+    def _block_calc_team(self):
+        """
+        method to calculate team blocks
+        """
+        return self._team_stat_columns(["blk", "shots_blocked"])
 
-        return fouls[["team_id", "game_id", "pf", "fouls_drawn"]]
+    def _plus_minus_team(self):
+        """
+        method to calculate team score differential
+        """
+        return self._team_stat_columns(["points_against", "plus_minus"])
 
-    def _steal_calc_team(self):
+    @_memoize
+    @instrument.stage
+    def rapm_possessions(self):
         """
-        method to calculate team steals in a game
+        method to extract out all the rapm possessions to be able to run a RAPM
+        regression on later. Each row is one possession with the five players
+        on offense and defense and the points scored at the second the
+        possession ended
         """
+        home_event = self.df["event_team"] == self.df["home_team_abbrev"]
+        away_event = self.df["event_team"] == self.df["away_team_abbrev"]
+
+        # a possession ends on a shot, free throw or turnover by the offense or
+        # a rebound by the defense
+        off_event = self._event_mask("shot", "free-throw", "turnover")
+        rebound = self._event_mask("rebound")
+        home_off = (off_event & home_event) | (rebound & away_event)
+        home_def = (off_event & away_event) | (rebound & home_event)
+
+        poss_end = (
+            (self.possessions["home_possession"] == 1)
+            | (self.possessions["away_possession"] == 1)
+        ) & (home_off | home_def)
+        poss_rows = np.flatnonzero(poss_end)
+        home_off = home_off.to_numpy()[poss_rows]
 
-        steals_df = (
-            self.df.groupby(["player2_team_id", "game_id"])[["is_steal"]]
-            .sum()
-            .reset_index()
-        )
-        steals_df["player2_team_id"] = steals_df["player2_team_id"].astype(int)
-        steals_df.rename(
-            columns={"player2_team_id": "team_id", "is_steal": "stl",}, inplace=True,
-        )
+        points_by_second = (
+            self.df.groupby(["game_id", "seconds_elapsed"])["points_made"]
+            .transform("sum")
+            .to_numpy()
+        )
+
+        poss_dict = {}
+        for i in range(1, 6):
+            for suffix in ["", "_id"]:
+                home_slot = self.df[f"home_player_{i}{suffix}"].to_numpy()[poss_rows]
+                away_slot = self.df[f"away_player_{i}{suffix}"].to_numpy()[poss_rows]
+                poss_dict[f"off_player_{i}{suffix}"] = np.where(
+                    home_off, home_slot, away_slot
+                )
+                poss_dict[f"def_player_{i}{suffix}"] = np.where(
+                    home_off, away_slot, home_slot
+                )
+        poss_dict["points_made"] = points_by_second[poss_rows]
+        poss_dict["event_team_abbrev"] = self.df["event_team"].to_numpy()[poss_rows]
+        for col in [
+            "home_team_abbrev",
+            "away_team_abbrev",
+            "home_team_id",
+            "away_team_id",
+            "game_id",
+            "game_date",
+            "season",
+        ]:
+            poss_dict[col] = self.df[col].to_numpy()[poss_rows]
+
+        poss_df = pd.DataFrame(poss_dict)
+
+        return poss_df[sorted(poss_df.columns)]
+
+    @instrument.stage
+    def _player_stat_events(self, rows=None, stats=None):
+        """
+        method to stack every counting stat credited to a player into one long
+        table. Each row is one player's share of one stat for one event: the
+        shooting, rebounding, turnover, and foul stats of player1, the assists
+        and steals of player2, the blocks of player3, and the time on court,
+        possessions, and points for and against of the ten players on the
+        court. Zero valued rows are left out
 
-        return steals_df
+        Inputs:
+        rows      - boolean mask of the events to count, defaults to every
+                    event
+        stats     - set of the stats to stack, defaults to every stat. toc is
+                    always stacked
 
-    def _block_calc_team(self):
+        Outputs:
+        events_df - dataframe with player_id, team_id, game_id, stat, and
+                    value columns
         """
-        method to calculate team blocks
+        on_court = self._on_court_long()
+        if rows is None:
+            rows = np.ones(self.df.shape[0], dtype=bool)
+        event_rows = on_court["event_row"].to_numpy()
+        shot_made = (self.df["shot_made"] == 1).to_numpy()
+        is_three = (self.df["is_three"] == 1).to_numpy()
+        fouls = self._personal_fouls()
+
+        player1 = ("player1_id", "player1_team_id")
+        player2 = ("player2_id", "player2_team_id")
+        player3 = ("player3_id", "player3_team_id")
+        event_stats = [
+            (player1, "fgm", shot_made & self._event_mask("shot")),
+            (player1, "fga", self._event_mask("shot", "missed_shot")),
+            (player1, "tpm", shot_made & is_three),
+            (player1, "tpa", is_three),
+            (player1, "ftm", shot_made & self._event_mask("free-throw")),
+            (player1, "fta", self._event_mask("free-throw")),
+            (player1, "points", self.df["points_made"].to_numpy()),
+            (player1, "oreb", self.df["is_o_rebound"].to_numpy()),
+            (player1, "dreb", self.df["is_d_rebound"].to_numpy()),
+            (player1, "tov", self.df["is_turnover"].to_numpy()),
+            (player1, "pf", fouls),
+            (player2, "ast", shot_made & self._event_mask("shot")),
+            (player2, "stl", self.df["is_steal"].to_numpy()),
+            (
+                player3,
+                "blk",
+                self.df["is_block"].to_numpy() & ~self._event_mask("jump-ball"),
+            ),
+        ]
+        game_ids = self.df["game_id"].to_numpy()
+
+        # rebounds are credited to the player even when the event has no team
+        # so those get the team the player was on the court for in the game
+        player_teams = on_court.drop_duplicates(["player_id", "game_id"]).set_index(
+            ["player_id", "game_id"]
+        )["team_id"]
+
+        if stats is not None:
+            event_stats = [event for event in event_stats if event[1] in stats]
+
+        player_ids, team_ids, games, stat_codes, values = [], [], [], [], []
+        for (player_col, team_col), stat, stat_values in event_stats:
+            stat_rows = np.flatnonzero((stat_values != 0) & rows)
+            stat_players = self.df[player_col].to_numpy()[stat_rows]
+            stat_teams = self.df[team_col].to_numpy()[stat_rows]
+            if stat in ["oreb", "dreb"]:
+                stat_teams = np.where(
+                    np.isnan(stat_teams),
+                    player_teams.reindex(
+                        pd.MultiIndex.from_arrays([stat_players, game_ids[stat_rows]])
+                    ).to_numpy(),
+                    stat_teams,
+                )
+            player_ids.append(stat_players)
+            team_ids.append(stat_teams)
+            games.append(game_ids[stat_rows])
+            stat_codes.append(
+                np.full(stat_rows.shape[0], PLAYER_EVENT_STATS.index(stat), np.int8)
+            )
+            values.append(stat_values[stat_rows])
+
+        court_rows = np.flatnonzero(rows[event_rows])
+        event_rows = event_rows[court_rows]
+        court_stats = [
+            ("toc", court_rows, self.df["event_length"].to_numpy()[event_rows])
+        ]
+        if stats is None or "possessions" in stats:
+            court_stats.append(
+                (
+                    "possessions",
+                    court_rows,
+                    np.where(
+                        on_court["is_home"].to_numpy()[court_rows],
+                        self.possessions["home_possession"].to_numpy()[event_rows],
+                        self.possessions["away_possession"].to_numpy()[event_rows],
+                    ),
+                )
+            )
+        # the free throw lineup matching is the slowest part so it's skipped
+        # when neither plus nor minus is asked for
+        if stats is None or "plus" in stats or "minus" in stats:
+            long_rows, plus, minus = self._plus_minus_rows(rows)
+            court_stats += [("plus", long_rows, plus), ("minus", long_rows, minus)]
+        for stat, rows, stat_values in court_stats:
+            player_ids.append(on_court["player_id"].to_numpy()[rows])
+            team_ids.append(on_court["team_id"].to_numpy()[rows])
+            games.append(on_court["game_id"].to_numpy()[rows])
+            stat_codes.append(
+                np.full(rows.shape[0], PLAYER_EVENT_STATS.index(stat), np.int8)
+            )
+            values.append(stat_values)
+
+        return pd.DataFrame(
+            {
+                "player_id": np.concatenate(player_ids),
+                "team_id": np.concatenate(team_ids),
+                "game_id": np.concatenate(games),
+                "stat": pd.Categorical.from_codes(
+                    np.concatenate(stat_codes), categories=PLAYER_EVENT_STATS
+                ),
+                "value": np.concatenate(values).astype(float),
+            }
+        )
+
+    @instrument.stage
+    def _player_stat_sums(self, rows=None, stats=None):
         """
-        blocks_df = (
-            self.df.groupby(["player3_team_id", "game_id"])[["is_block"]]
+        method to sum the stacked _player_stat_events table into one row per
+        player, team, and game with a column for every stat
+
+        Inputs:
+        rows      - boolean mask of the events to count, defaults to every
+                    event
+        stats     - set of the stats to sum, defaults to every stat. toc is
+                    always summed
+
+        Outputs:
+        stat_sums - dataframe indexed by player_id, team_id, and game_id with
+                    the toc, possessions, and PLAYER_COUNT_STATS columns
+        """
+        columns = [
+            col
+            for col in PLAYER_EVENT_STATS
+            if stats is None or col in stats or col == "toc"
+        ]
+
+        return (
+            self._player_stat_events(rows, stats)
+            .groupby(["player_id", "team_id", "game_id", "stat"], observed=True)[
+                "value"
+            ]
             .sum()
-            .reset_index()
+            .unstack("stat", fill_value=0)
+            .reindex(columns=columns, fill_value=0)
         )
-        blocks_df["player3_team_id"] = blocks_df["player3_team_id"].astype(int)
-        blocks_df.rename(
-            columns={"player3_team_id": "team_id", "is_block": "blk",}, inplace=True,
+
+    @_memoize
+    @instrument.stage
+    def _player_names(self):
+        """
+        method to get the name of every player on the court indexed by
+        player_id, team_id, and game_id
+        """
+        return (
+            self._on_court_long()
+            .groupby(["player_id", "team_id", "game_id"])["player_name"]
+            .first()
         )
 
-        blocks_df = blocks_df.merge(blocks_df, on="game_id", suffixes=["", "_opponent"])
+    @staticmethod
+    @instrument.stage
+    def _player_box_score(games, stat_sums, player_names, stats=None):
+        """
+        function to fill in the names, game info, and opponents of summed
+        player stats and put them in the playerbygamestats column order
+
+        Inputs:
+        games        - game info table from _game_info
+        stat_sums    - dataframe of player stats from _player_stat_sums
+        player_names - series of player names from _player_names
+        stats        - list of the stats to return, defaults to every stat
 
-        blocks_df = blocks_df[blocks_df["team_id"] != blocks_df["team_id_opponent"]]
-        blocks_df.rename(
-            columns={"blk_opponent": "shots_blocked",}, inplace=True,
+        Outputs:
+        pbg          - dataframe of player box scores
+        """
+        keys = ["player_id", "team_id", "game_id"]
+
+        pbg = stat_sums.reset_index()
+        pbg.columns.name = None
+        for col in keys + PLAYER_COUNT_STATS + ["possessions"]:
+            if col in pbg.columns:
+                pbg[col] = pbg[col].astype(int)
+        if "plus" in pbg.columns and "minus" in pbg.columns:
+            pbg["plus_minus"] = pbg["plus"] - pbg["minus"]
+        pbg["toc_string"] = pd.to_datetime(pbg["toc"], unit="s").dt.strftime("%M:%S")
+
+        pbg["player_name"] = player_names.reindex(
+            pd.MultiIndex.from_frame(pbg[keys])
+        ).to_numpy()
+
+        games = games.loc[pbg["game_id"]]
+        is_home = (pbg["team_id"].to_numpy() == games["home_team_id"]).to_numpy()
+        pbg["game_date"] = games["game_date"].to_numpy()
+        pbg["is_home"] = np.where(is_home, 1, 0)
+        pbg["team_abbrev"] = np.where(
+            is_home, games["home_team_abbrev"], games["away_team_abbrev"]
         )
+        pbg["opponent"] = np.where(
+            is_home, games["away_team_id"], games["home_team_id"]
+        ).astype(int)
+        pbg["opponent_abbrev"] = np.where(
+            is_home, games["away_team_abbrev"], games["home_team_abbrev"]
+        )
+        pbg["season"] = games["season"].to_numpy().astype(int)
+
+        columns = (
+            keys
+            + ["game_date", "toc", "toc_string"]
+            + PLAYER_PLAY_STATS
+            + ["plus", "minus", "plus_minus", "player_name", "possessions"]
+            + ["is_home", "team_abbrev", "opponent", "opponent_abbrev", "season"]
+        )
+        if stats is not None:
+            columns = [
+                col
+                for col in columns
+                if col not in PLAYER_BOX_STATS or col in stats or col == "toc"
+            ]
+        pbg = pbg[columns]
+        # players credited with a stat in a game they never played in, like a
+        # technical foul from the bench, aren't part of the box score
+        pbg = pbg[pbg["toc"] > 0]
 
-        return blocks_df[["team_id", "game_id", "blk", "shots_blocked"]]
+        return pbg
 
-    def _plus_minus_team(self):
+    @_memoize
+    @instrument.stage
+    def playerbygamestats(self, stats=None):
         """
-        method to calculate team score differential
+        this function combines all playerbygamestats and returns a dataframe
+        containing them. Every counting stat is summed out of the stacked
+        _player_stat_events table with one groupby. stats is a list of the
+        PLAYER_BOX_STATS to return, i.e. ["toc", "plus_minus"] for lineup
+        work, and only those stats and the ones they're calculated from are
+        calculated. toc and the player and game info are always returned
         """
-        plus_minus_df = (
-            self.df.groupby(["player1_team_id", "game_id"])[["points_made",]]
-            .sum()
-            .reset_index()
-        )
-        plus_minus_df["player1_team_id"] = plus_minus_df["player1_team_id"].astype(int)
-        plus_minus_df.rename(
-            columns={"player1_team_id": "team_id", "points_made": "points_for",},
-            inplace=True,
-        )
-        plus_minus_df = plus_minus_df.merge(
-            plus_minus_df, on="game_id", suffixes=["", "_opponent"]
+        needed = _stat_dependencies(stats, PLAYER_BOX_STATS, PLAYER_DERIVED_STATS)
+
+        return self._player_box_score(
+            self.games,
+            self._player_stat_sums(stats=needed),
+            self._player_names(),
+            stats,
         )
 
-        plus_minus_df = plus_minus_df[
-            plus_minus_df["team_id"] != plus_minus_df["team_id_opponent"]
+    @instrument.stage
+    def _team_stat_totals(self, rows=None, stats=None):
+        """
+        method to sum every team counting stat for the home and away team of
+        every game in one pass. Each event is assigned to the home or away row
+        of its game by the team of the player credited with the stat and all
+        of the stats are summed into those rows with np.bincount
+
+        Inputs:
+        rows   - boolean mask of the events to count, defaults to every event
+        stats  - set of the stats to sum, defaults to every stat
+
+        Outputs:
+        totals - numpy array of shape (games, 2, stats) with the home team's
+                 totals in the first row of each game in the order of
+                 self.games
+        stats  - list of the stat names in the last axis of totals
+        """
+        game_count = self.games.shape[0]
+        if rows is None:
+            rows = np.ones(self.df.shape[0], dtype=bool)
+        game_rows = self.games.index.get_indexer(self.df["game_id"])
+        home_team_id = self.games["home_team_id"].to_numpy()[game_rows]
+        away_team_id = self.games["away_team_id"].to_numpy()[game_rows]
+
+        points = self.df["points_made"].to_numpy()
+        fouls = self._personal_fouls()
+        team_stats = [
+            ("player1_team_id", "points_for", points),
+            ("player1_team_id", "tpa", self.df["is_three"].to_numpy()),
+            ("player1_team_id", "fga", self._event_mask("missed_shot", "shot")),
+            ("player1_team_id", "fta", self._event_mask("free-throw")),
+            ("player1_team_id", "fgm", self._event_mask("shot") & (points > 0)),
+            ("player1_team_id", "tpm", points == 3),
+            ("player1_team_id", "ftm", self._event_mask("free-throw") & (points == 1)),
+            ("player3_team_id", "blk", self.df["is_block"].to_numpy()),
+            (
+                "player1_team_id",
+                "ast",
+                self._event_mask("shot") & (self.df["player2_id"] != 0).to_numpy(),
+            ),
+            ("player1_team_id", "dreb", self.df["is_d_rebound"].to_numpy()),
+            ("player1_team_id", "oreb", self.df["is_o_rebound"].to_numpy()),
+            ("player1_team_id", "tov", self.df["is_turnover"].to_numpy()),
+            ("player1_team_id", "pf", fouls),
+            ("player2_team_id", "stl", self.df["is_steal"].to_numpy()),
         ]
+        if stats is not None:
+            team_stats = [stat for stat in team_stats if stat[1] in stats]
+        count_possessions = stats is None or "possessions" in stats
+
+        # the home/away row of each event for each team column, events whose
+        # team is neither team in the game aren't counted
+        team_rows = {}
+        for team_col in set(team_col for team_col, _, _ in team_stats):
+            team = self.df[team_col].to_numpy()
+            team_rows[team_col] = np.where(
+                team == home_team_id,
+                game_rows * 2,
+                np.where(team == away_team_id, game_rows * 2 + 1, -1),
+            )
 
-        plus_minus_df["plus_minus"] = (
-            plus_minus_df["points_for"] - plus_minus_df["points_for_opponent"]
-        )
-        plus_minus_df.rename(
-            columns={"points_for_opponent": "points_against",}, inplace=True,
-        )
+        totals = np.zeros((game_count * 2, len(team_stats) + count_possessions))
+        for i, (team_col, stat, values) in enumerate(team_stats):
+            stat_rows = team_rows[team_col]
+            counted = (stat_rows >= 0) & rows
+            totals[:, i] = np.bincount(
+                stat_rows[counted],
+                weights=values[counted].astype(float),
+                minlength=game_count * 2,
+            )
+        stats = [stat for _, stat, _ in team_stats]
+        if count_possessions:
+            totals[:, -1] = np.bincount(
+                np.concatenate([game_rows * 2, game_rows * 2 + 1]),
+                weights=np.concatenate(
+                    [
+                        self.possessions["home_possession"].to_numpy() * rows,
+                        self.possessions["away_possession"].to_numpy() * rows,
+                    ]
+                ),
+                minlength=game_count * 2,
+            )
+            stats.append("possessions")
 
-        return plus_minus_df[["team_id", "game_id", "points_against", "plus_minus"]]
+        return totals.reshape(game_count, 2, len(stats)), stats
 
     @staticmethod
-    def parse_possessions(poss_list):
+    @instrument.stage
+    def _team_box_score(games, totals, stats, game_length, requested=None):
         """
-        a function to parse each possession and create one row for offense team
-        and defense team
+        function to turn the home and away team totals of every game into the
+        teambygamestats box score. The opponent stats are the same rows
+        reversed
 
         Inputs:
-        poss_list   - list of dataframes each one representing one possession
+        games       - game info table from _game_info
+        totals      - numpy array of team totals from _team_stat_totals in
+                      the order of games
+        stats       - list of the stat names in the last axis of totals
+        game_length - series of the seconds played in each game indexed by
+                      game_id
+        requested   - list of the stats to return, defaults to every stat
 
         Outputs:
-        parsed_list  - list of dataframes where each list inside represents the players on
-                       off and def and points score for each possession
-        """
-        parsed_list = []
-
-        for df in poss_list:
-            if df.loc[df.index[-1], "event_type_de"] in ["rebound", "turnover"]:
-                if df.loc[df.index[-1], "event_type_de"] == "turnover":
-                    if (
-                        df.loc[df.index[-1], "event_team"]
-                        == df.loc[df.index[-1], "home_team_abbrev"]
-                    ):
-                        row_df = pd.concat(
-                            [
-                                df.loc[
-                                    df.index[-1], "home_player_1":"away_player_5_id"
-                                ],
-                                df.loc[
-                                    df.index[-1],
-                                    [
-                                        "points_made_y",
-                                        "home_team_abbrev",
-                                        "event_team",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                ],
-                            ]
-                        )
-
-                        parsed_list.extend(
-                            [
-                                pd.DataFrame(
-                                    [list(row_df)],
-                                    columns=[
-                                        "off_player_1",
-                                        "off_player_1_id",
-                                        "off_player_2",
-                                        "off_player_2_id",
-                                        "off_player_3",
-                                        "off_player_3_id",
-                                        "off_player_4",
-                                        "off_player_4_id",
-                                        "off_player_5",
-                                        "off_player_5_id",
-                                        "def_player_1",
-                                        "def_player_1_id",
-                                        "def_player_2",
-                                        "def_player_2_id",
-                                        "def_player_3",
-                                        "def_player_3_id",
-                                        "def_player_4",
-                                        "def_player_4_id",
-                                        "def_player_5",
-                                        "def_player_5_id",
-                                        "points_made",
-                                        "home_team_abbrev",
-                                        "event_team_abbrev",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                )
-                            ]
-                        )
-                    elif (
-                        df.loc[df.index[-1], "event_team"]
-                        == df.loc[df.index[-1], "away_team_abbrev"]
-                    ):
-                        row_df = pd.concat(
-                            [
-                                df.loc[
-                                    df.index[-1], "home_player_1":"away_player_5_id"
-                                ],
-                                df.loc[
-                                    df.index[-1],
-                                    [
-                                        "points_made_y",
-                                        "home_team_abbrev",
-                                        "event_team",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                ],
-                            ]
-                        )
-
-                        parsed_list.extend(
-                            [
-                                pd.DataFrame(
-                                    [list(row_df)],
-                                    columns=[
-                                        "def_player_1",
-                                        "def_player_1_id",
-                                        "def_player_2",
-                                        "def_player_2_id",
-                                        "def_player_3",
-                                        "def_player_3_id",
-                                        "def_player_4",
-                                        "def_player_4_id",
-                                        "def_player_5",
-                                        "def_player_5_id",
-                                        "off_player_1",
-                                        "off_player_1_id",
-                                        "off_player_2",
-                                        "off_player_2_id",
-                                        "off_player_3",
-                                        "off_player_3_id",
-                                        "off_player_4",
-                                        "off_player_4_id",
-                                        "off_player_5",
-                                        "off_player_5_id",
-                                        "points_made",
-                                        "home_team_abbrev",
-                                        "event_team_abbrev",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                )
-                            ]
-                        )
-                if df.loc[df.index[-1], "event_type_de"] == "rebound":
-                    if (
-                        df.loc[df.index[-1], "event_team"]
-                        == df.loc[df.index[-1], "away_team_abbrev"]
-                    ):
-                        row_df = pd.concat(
-                            [
-                                df.loc[
-                                    df.index[-1], "home_player_1":"away_player_5_id"
-                                ],
-                                df.loc[
-                                    df.index[-1],
-                                    [
-                                        "points_made_y",
-                                        "home_team_abbrev",
-                                        "event_team",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                ],
-                            ]
-                        )
-
-                        parsed_list.extend(
-                            [
-                                pd.DataFrame(
-                                    [list(row_df)],
-                                    columns=[
-                                        "off_player_1",
-                                        "off_player_1_id",
-                                        "off_player_2",
-                                        "off_player_2_id",
-                                        "off_player_3",
-                                        "off_player_3_id",
-                                        "off_player_4",
-                                        "off_player_4_id",
-                                        "off_player_5",
-                                        "off_player_5_id",
-                                        "def_player_1",
-                                        "def_player_1_id",
-                                        "def_player_2",
-                                        "def_player_2_id",
-                                        "def_player_3",
-                                        "def_player_3_id",
-                                        "def_player_4",
-                                        "def_player_4_id",
-                                        "def_player_5",
-                                        "def_player_5_id",
-                                        "points_made",
-                                        "home_team_abbrev",
-                                        "event_team_abbrev",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                )
-                            ]
-                        )
-
-                    elif (
-                        df.loc[df.index[-1], "event_team"]
-                        == df.loc[df.index[-1], "home_team_abbrev"]
-                    ):
-                        row_df = pd.concat(
-                            [
-                                df.loc[
-                                    df.index[-1], "home_player_1":"away_player_5_id"
-                                ],
-                                df.loc[
-                                    df.index[-1],
-                                    [
-                                        "points_made_y",
-                                        "home_team_abbrev",
-                                        "event_team",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                ],
-                            ]
-                        )
-
-                        parsed_list.extend(
-                            [
-                                pd.DataFrame(
-                                    [list(row_df)],
-                                    columns=[
-                                        "def_player_1",
-                                        "def_player_1_id",
-                                        "def_player_2",
-                                        "def_player_2_id",
-                                        "def_player_3",
-                                        "def_player_3_id",
-                                        "def_player_4",
-                                        "def_player_4_id",
-                                        "def_player_5",
-                                        "def_player_5_id",
-                                        "off_player_1",
-                                        "off_player_1_id",
-                                        "off_player_2",
-                                        "off_player_2_id",
-                                        "off_player_3",
-                                        "off_player_3_id",
-                                        "off_player_4",
-                                        "off_player_4_id",
-                                        "off_player_5",
-                                        "off_player_5_id",
-                                        "points_made",
-                                        "home_team_abbrev",
-                                        "event_team_abbrev",
-                                        "away_team_abbrev",
-                                        "home_team_id",
-                                        "away_team_id",
-                                        "game_id",
-                                        "game_date",
-                                        "season",
-                                    ],
-                                )
-                            ]
-                        )
-
-            elif df.loc[df.index[-1], "event_type_de"] in ["shot", "free-throw"]:
-                if (
-                    df.loc[df.index[-1], "event_team"]
-                    == df.loc[df.index[-1], "home_team_abbrev"]
-                ):
-                    row_df = pd.concat(
-                        [
-                            df.loc[df.index[-1], "home_player_1":"away_player_5_id"],
-                            df.loc[
-                                df.index[-1],
-                                [
-                                    "points_made_y",
-                                    "home_team_abbrev",
-                                    "event_team",
-                                    "away_team_abbrev",
-                                    "home_team_id",
-                                    "away_team_id",
-                                    "game_id",
-                                    "game_date",
-                                    "season",
-                                ],
-                            ],
-                        ]
-                    )
-
-                    parsed_list.extend(
-                        [
-                            pd.DataFrame(
-                                [list(row_df)],
-                                columns=[
-                                    "off_player_1",
-                                    "off_player_1_id",
-                                    "off_player_2",
-                                    "off_player_2_id",
-                                    "off_player_3",
-                                    "off_player_3_id",
-                                    "off_player_4",
-                                    "off_player_4_id",
-                                    "off_player_5",
-                                    "off_player_5_id",
-                                    "def_player_1",
-                                    "def_player_1_id",
-                                    "def_player_2",
-                                    "def_player_2_id",
-                                    "def_player_3",
-                                    "def_player_3_id",
-                                    "def_player_4",
-                                    "def_player_4_id",
-                                    "def_player_5",
-                                    "def_player_5_id",
-                                    "points_made",
-                                    "home_team_abbrev",
-                                    "event_team_abbrev",
-                                    "away_team_abbrev",
-                                    "home_team_id",
-                                    "away_team_id",
-                                    "game_id",
-                                    "game_date",
-                                    "season",
-                                ],
-                            )
-                        ]
-                    )
-                elif (
-                    df.loc[df.index[-1], "event_team"]
-                    == df.loc[df.index[-1], "away_team_abbrev"]
-                ):
-                    row_df = pd.concat(
-                        [
-                            df.loc[df.index[-1], "home_player_1":"away_player_5_id"],
-                            df.loc[
-                                df.index[-1],
-                                [
-                                    "points_made_y",
-                                    "home_team_abbrev",
-                                    "event_team",
-                                    "away_team_abbrev",
-                                    "home_team_id",
-                                    "away_team_id",
-                                    "game_id",
-                                    "game_date",
-                                    "season",
-                                ],
-                            ],
-                        ]
-                    )
-
-                    parsed_list.extend(
-                        [
-                            pd.DataFrame(
-                                [list(row_df)],
-                                columns=[
-                                    "def_player_1",
-                                    "def_player_1_id",
-                                    "def_player_2",
-                                    "def_player_2_id",
-                                    "def_player_3",
-                                    "def_player_3_id",
-                                    "def_player_4",
-                                    "def_player_4_id",
-                                    "def_player_5",
-                                    "def_player_5_id",
-                                    "off_player_1",
-                                    "off_player_1_id",
-                                    "off_player_2",
-                                    "off_player_2_id",
-                                    "off_player_3",
-                                    "off_player_3_id",
-                                    "off_player_4",
-                                    "off_player_4_id",
-                                    "off_player_5",
-                                    "off_player_5_id",
-                                    "points_made",
-                                    "home_team_abbrev",
-                                    "event_team_abbrev",
-                                    "away_team_abbrev",
-                                    "home_team_id",
-                                    "away_team_id",
-                                    "game_id",
-                                    "game_date",
-                                    "season",
-                                ],
-                            )
-                        ]
-                    )
-
-        return parsed_list
+        tbg         - dataframe of team box scores
+        """
+        opponent_totals = totals[:, ::-1, :]
+        totals = totals.reshape(-1, len(stats)).astype(int)
+        opponent_totals = opponent_totals.reshape(-1, len(stats)).astype(int)
+
+        def home_away(home_col, away_col):
+            """
+            interleaves the home and away values of a column of games
+            into the two team rows of each game
+            """
+            return np.column_stack([games[home_col], games[away_col]]).ravel()
+
+        tbg = pd.DataFrame(totals, columns=stats)
+        if "blk" in stats:
+            tbg["shots_blocked"] = opponent_totals[:, stats.index("blk")]
+        if "pf" in stats:
+            tbg["fouls_drawn"] = opponent_totals[:, stats.index("pf")]
+        if "points_for" in stats:
+            tbg["points_against"] = opponent_totals[:, stats.index("points_for")]
+            tbg["plus_minus"] = tbg["points_for"] - tbg["points_against"]
+            tbg["is_win"] = np.where(tbg["points_for"] > tbg["points_against"], 1, 0)
+
+        game_length = game_length.loc[games.index].repeat(2)
+        tbg["team_id"] = home_away("home_team_id", "away_team_id").astype(int)
+        tbg["game_id"] = games.index.repeat(2).astype(int)
+        tbg["team_abbrev"] = home_away("home_team_abbrev", "away_team_abbrev")
+        tbg["game_date"] = games["game_date"].repeat(2).to_numpy()
+        tbg["season"] = games["season"].repeat(2).to_numpy().astype(int)
+        tbg["toc"] = game_length.to_numpy()
+        tbg["toc_string"] = (
+            (game_length // 60).astype(str) + ":" + (game_length % 60).astype(str) + "0"
+        ).to_numpy()
+        tbg["is_home"] = np.tile([1, 0], games.shape[0])
+        tbg["opponent"] = home_away("away_team_id", "home_team_id").astype(int)
+        tbg["opponent_abbrev"] = home_away("away_team_abbrev", "home_team_abbrev")
+
+        columns = (
+            ["team_id", "game_id", "points_for", "tpa", "fga", "fta", "fgm", "tpm"]
+            + ["ftm", "blk", "shots_blocked", "ast", "dreb", "oreb", "tov", "pf"]
+            + ["fouls_drawn", "stl", "points_against", "plus_minus", "team_abbrev"]
+            + ["possessions", "game_date", "season", "toc", "toc_string"]
+            + ["is_home", "is_win", "opponent", "opponent_abbrev"]
+        )
+        if requested is not None:
+            columns = [
+                col for col in columns if col not in TEAM_BOX_STATS or col in requested
+            ]
+        tbg = tbg[columns]
 
-    def rapm_possessions(self):
+        return tbg.sort_values(["team_id", "game_id"]).reset_index(drop=True)
+
+    @_memoize
+    @instrument.stage
+    def teambygamestats(self, stats=None):
         """
-        method to extract out all the rapm possessions to be able to run a RAPM
-        regression on later
+        main team stats calc hook. Every counting stat comes out of the home
+        and away rows of _team_stat_totals and the opponent stats are the
+        same rows reversed. stats is a list of the TEAM_BOX_STATS to return
+        and only those stats and the ones they're calculated from are
+        calculated. toc and the team and game info are always returned
         """
+        needed = _stat_dependencies(stats, TEAM_BOX_STATS, TEAM_DERIVED_STATS)
+        totals, total_stats = self._team_stat_totals(stats=needed)
+        game_length = self.df.groupby("game_id")["seconds_elapsed"].max()
 
-        pbp_df = self.df.copy()
-        points_by_second = (
-            pbp_df.groupby(["game_id", "seconds_elapsed"])["points_made"]
-            .sum()
-            .reset_index()
-        )
-        pbp_df = pbp_df.merge(points_by_second, on=["game_id", "seconds_elapsed"])
+        return self._team_box_score(self.games, totals, total_stats, game_length, stats)
 
-        poss_index = pbp_df[
-            (self.df.home_possession == 1) | (self.df.away_possession == 1)
-        ].index
-        shift_dfs = []
-        past_index = 0
 
-        for i in poss_index:
-            shift_dfs.extend([pbp_df.iloc[past_index + 1 : i + 1, :].reset_index()])
-            past_index = i
+class SeasonPbP(PbP):
+    """
+    This class represents many games of NBA play by play concatenated into one
+    dataframe, for example a whole season of nba_scraper output. It has all
+    the same methods as PbP but computes possessions and the player and team
+    box scores for every game in one vectorized pass grouped by game_id
+    instead of building one PbP object per game. The single game attributes
+    like home_team and game_date are left off; the game level info for every
+    game is in the games attribute instead
+    """
 
-        poss_df = pd.concat(self.parse_possessions(shift_dfs), sort=True)
+    def _game_attributes(self):
+        """
+        method to leave off the single game attributes of PbP
+        """
 
-        return poss_df
 
-    def playerbygamestats(self):
+class LivePbP:
+    """
+    This class keeps the player and team box scores of one or more games up
+    to date while they are being played. Each call to add_events takes only
+    the play by play events scraped since the last call and adds their stats
+    to running player and team totals so every poll does work proportional
+    to the new events instead of recalculating the whole game.
+
+    Every per event calculation only looks backwards in the game: possessions
+    look at the event before a rebound and free throw plus minus looks for
+    the last foul at the same time on the clock. So each batch of new events
+    is calculated as a SeasonPbP together with the trailing events of each
+    game that share that game's last clock time, and only the stats of the
+    new events are added to the totals
+    """
+
+    def __init__(self, pbp_df=None):
+        self.games = None
+        self.events = 0
+        self._context = None
+        self._player_sums = None
+        self._names = None
+        self._team_totals = {}
+        self._team_stats = None
+        self._game_length = None
+
+        if pbp_df is not None:
+            self.add_events(pbp_df)
+
+    def _context_rows(self, season):
         """
-        this function combines all playerbygamestats and returns a dataframe
-        containing them
-        """
-        points = self._point_calc_player()
-        blocks = self._block_calc_player()
-        assists = self._assist_calc_player()
-        rebounds = self._rebound_calc_player()
-        turnovers = self._turnover_calc_player()
-        fouls = self._foul_calc_player()
-        steals = self._steal_calc_player()
-        plus_minus = self._plus_minus_calc_player()
-        toc = self._toc_calc_player()
-        poss = self._poss_calc_player()
-
-        pbg = toc.merge(
-            points, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(
-            blocks, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(
-            assists, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(rebounds, how="left", on=["player_id", "game_date", "game_id"])
-        pbg = pbg.merge(
-            turnovers, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(
-            fouls, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(
-            steals, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(
-            plus_minus, how="left", on=["player_id", "team_id", "game_date", "game_id"]
-        )
-        pbg = pbg.merge(poss, how="left", on=["player_id", "team_id", "game_id"])
-
-        pbg["blk"] = pbg["blk"].fillna(0).astype(int)
-        pbg["ast"] = pbg["ast"].fillna(0).astype(int)
-        pbg["dreb"] = pbg["dreb"].fillna(0).astype(int)
-        pbg["oreb"] = pbg["oreb"].fillna(0).astype(int)
-        pbg["tov"] = pbg["tov"].fillna(0).astype(int)
-        pbg["pf"] = pbg["pf"].fillna(0).astype(int)
-        pbg["stl"] = pbg["stl"].fillna(0).astype(int)
-        pbg["fgm"] = pbg["fgm"].fillna(0).astype(int)
-        pbg["fga"] = pbg["fga"].fillna(0).astype(int)
-        pbg["tpm"] = pbg["tpm"].fillna(0).astype(int)
-        pbg["tpa"] = pbg["tpa"].fillna(0).astype(int)
-        pbg["ftm"] = pbg["ftm"].fillna(0).astype(int)
-        pbg["fta"] = pbg["fta"].fillna(0).astype(int)
-        pbg["is_home"] = np.where(pbg["team_id"] == self.home_team_id, 1, 0)
-        pbg["team_abbrev"] = np.where(
-            self.home_team_id == pbg["team_id"], self.home_team, self.away_team
-        )
-        pbg["opponent"] = np.where(
-            pbg["team_id"] == self.home_team_id, self.away_team_id, self.home_team_id
-        )
-        pbg["opponent_abbrev"] = np.where(
-            pbg["team_id"] == self.home_team_id, self.away_team, self.home_team
-        )
-        pbg["season"] = self.season
-        pbg["player_id"] = pbg["player_id"].astype(int)
-        pbg = pbg[pbg["toc"] > 0]
+        method to find the trailing events of each game in a batch that are
+        at the game's last clock time. These are the only earlier events that
+        the stats of later events can depend on
 
-        return pbg
+        Inputs:
+        season  - SeasonPbP of the latest batch
 
-    def teambygamestats(self):
-        """
-        main team stats calc hook
-        """
-
-        points = self._point_calc_team()
-        blocks = self._block_calc_team()
-        assists = self._assist_calc_team()
-        rebounds = self._rebound_calc_team()
-        turnovers = self._turnover_calc_team()
-        fouls = self._foul_calc_team()
-        steals = self._steal_calc_team()
-        plus_minus = self._plus_minus_team()
-        poss = self._poss_calc_team()
-
-        tbg = points.merge(blocks, how="left", on=["team_id", "game_id"])
-
-        tbg = tbg.merge(assists, how="left", on=["team_id", "game_id"])
-        tbg = tbg.merge(rebounds, how="left", on=["team_id", "game_id"])
-        tbg = tbg.merge(turnovers, how="left", on=["team_id", "game_id"])
-        tbg = tbg.merge(fouls, how="left", on=["team_id", "game_id"])
-        tbg = tbg.merge(steals, how="left", on=["team_id", "game_id"])
-        tbg = tbg.merge(plus_minus, how="left", on=["team_id", "game_id"])
-        tbg = tbg.merge(poss, how="left", on=["team_id", "game_id"])
-        tbg["game_date"] = self.df["game_date"].unique()[0]
-        tbg["season"] = self.df["season"].unique()[0]
-        tbg["toc"] = self.df["seconds_elapsed"].max()
-        tbg[
-            "toc_string"
-        ] = f"{math.floor(self.df['seconds_elapsed'].max()/60)}:{self.df['seconds_elapsed'].max()%60}0"
-        tbg["is_home"] = np.where(
-            tbg["team_id"] == self.df["home_team_id"].unique()[0], 1, 0
-        )
-        tbg["is_win"] = np.where(tbg["points_for"] > tbg["points_against"], 1, 0)
-
-        tbg["blk"] = tbg["blk"].fillna(0).astype(int)
-        tbg["ast"] = tbg["ast"].fillna(0).astype(int)
-        tbg["dreb"] = tbg["dreb"].fillna(0).astype(int)
-        tbg["oreb"] = tbg["oreb"].fillna(0).astype(int)
-        tbg["tov"] = tbg["tov"].fillna(0).astype(int)
-        tbg["pf"] = tbg["pf"].fillna(0).astype(int)
-        tbg["stl"] = tbg["stl"].fillna(0).astype(int)
-        tbg["fgm"] = tbg["fgm"].fillna(0).astype(int)
-        tbg["fga"] = tbg["fga"].fillna(0).astype(int)
-        tbg["tpm"] = tbg["tpm"].fillna(0).astype(int)
-        tbg["tpa"] = tbg["tpa"].fillna(0).astype(int)
-        tbg["ftm"] = tbg["ftm"].fillna(0).astype(int)
-        tbg["fta"] = tbg["fta"].fillna(0).astype(int)
-        tbg["opponent"] = np.where(
-            tbg["team_id"] == self.home_team_id, self.away_team_id, self.home_team_id
-        )
-        tbg["opponent_abbrev"] = np.where(
-            tbg["team_id"] == self.home_team_id, self.away_team, self.home_team
-        )
+        Outputs:
+        is_last - boolean numpy array of the batch rows to keep as context
+        """
+        df = season.df
+        is_last = np.ones(df.shape[0], dtype=bool)
+        for col in ["period", "seconds_elapsed", "pctimestring"]:
+            last = df.groupby("game_id")[col].transform("last")
+            is_last &= (df[col] == last).to_numpy()
 
-        return tbg
+        return is_last
+
+    def add_events(self, pbp_df):
+        """
+        method to add newly scraped play by play events to the running box
+        scores. Events for several games can be passed at once
+
+        Inputs:
+        pbp_df - nba_scraper play by play dataframe of only the events since
+                 the last call, in event order within each game
+        """
+        if pbp_df.shape[0] == 0:
+            return
+
+        new_events = pbp_df.shape[0]
+        # only the columns the calculations use so each small batch isn't
+        # spending its time converting the rest of the scraper's columns
+        pbp_df = pbp_df[PBP_COLUMNS].assign(is_new=True)
+        if self._context is not None:
+            pbp_df = pd.concat(
+                [self._context.assign(is_new=False), pbp_df], ignore_index=True
+            )
+        # keeps each game's context events in front of its new events
+        pbp_df = pbp_df.sort_values("game_id", kind="stable").reset_index(drop=True)
+        is_new = pbp_df.pop("is_new").to_numpy(dtype=bool)
+
+        batch = SeasonPbP(pbp_df)
+        player_sums = batch._player_stat_sums(is_new)
+        team_totals, self._team_stats = batch._team_stat_totals(is_new)
+        game_length = batch.df.groupby("game_id")["seconds_elapsed"].max()
+
+        if self._player_sums is None:
+            self._player_sums = player_sums
+            self._names = batch._player_names()
+            self.games = batch.games
+            self._game_length = game_length
+        else:
+            self._player_sums = self._player_sums.add(player_sums, fill_value=0)
+            self._names = self._names.combine_first(batch._player_names())
+            new_games = ~batch.games.index.isin(self.games.index)
+            self.games = pd.concat([self.games, batch.games[new_games]])
+            self._game_length = (
+                pd.concat([self._game_length, game_length]).groupby(level=0).max()
+            )
+
+        for game_id, totals in zip(batch.games.index, team_totals):
+            if game_id in self._team_totals:
+                self._team_totals[game_id] = self._team_totals[game_id] + totals
+            else:
+                self._team_totals[game_id] = totals
+
+        self._context = pbp_df[self._context_rows(batch)]
+        self.events += new_events
+
+    def playerbygamestats(self, stats=None):
+        """
+        method to return the current player box scores of every game in the
+        same format as PbP.playerbygamestats. stats is a list of the
+        PLAYER_BOX_STATS to return, every stat is still kept up to date
+        """
+        _stat_dependencies(stats, PLAYER_BOX_STATS, PLAYER_DERIVED_STATS)
+
+        return PbP._player_box_score(self.games, self._player_sums, self._names, stats)
+
+    def teambygamestats(self, stats=None):
+        """
+        method to return the current team box scores of every game in the
+        same format as PbP.teambygamestats. stats is a list of the
+        TEAM_BOX_STATS to return, every stat is still kept up to date
+        """
+        _stat_dependencies(stats, TEAM_BOX_STATS, TEAM_DERIVED_STATS)
+        totals = np.stack([self._team_totals[game_id] for game_id in self.games.index])
+
+        return PbP._team_box_score(
+            self.games, totals, self._team_stats, self._game_length, stats
+        )
@@ -1,6 +1,156 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import RidgeCV
+from . import instrument
+from .rapm import IncrementalRidge, RidgePathCV
+from .store import _pyarrow
+
+# counting stats summed for each player by player_advanced_stats
+PLAYER_STATS = [
+    "toc",
+    "fgm",
+    "fga",
+    "tpm",
+    "tpa",
+    "ftm",
+    "fta",
+    "blk",
+    "ast",
+    "oreb",
+    "dreb",
+    "tov",
+    "pf",
+    "stl",
+    "plus",
+    "minus",
+    "plus_minus",
+    "possessions",
+    "points",
+]
+
+
+# the ten lineup columns of PbP.rapm_possessions() and their id columns
+RAPM_PLAYER_COLUMNS = [
+    f"{side}_player_{i}" for side in ["off", "def"] for i in range(1, 6)
+]
+RAPM_PLAYER_ID_COLUMNS = [f"{col}_id" for col in RAPM_PLAYER_COLUMNS]
+
+
+class PlayerIndex:
+    """
+    This class maps the player ids of RAPM possessions to their column in the
+    RAPM regression and to their names. Players are added in one vectorized
+    pass over the ten lineup columns of PbP.rapm_possessions() and keep their
+    position as more possessions are added, so one index can be built once
+    and shared by every fit, i.e. each season of a multi season RAPM. It can
+    be saved with to_parquet and loaded back with read_parquet so later runs
+    only add the players of new seasons to it
+    """
+
+    def __init__(self, rapm_shifts=None):
+        self.player_ids = np.zeros(0, dtype=np.int64)
+        self.player_names = np.zeros(0, dtype=object)
+        self._index = pd.Index(self.player_ids)
+
+        if rapm_shifts is not None:
+            self.add_players(rapm_shifts)
+
+    def __len__(self):
+        return self.player_ids.shape[0]
+
+    @classmethod
+    def from_frame(cls, index_df):
+        """
+        method to create the class from the dataframe returned by to_frame
+
+        Inputs:
+        index_df - dataframe of player_id and player_name in column order
+        """
+        player_index = cls()
+        player_index.player_ids = index_df["player_id"].to_numpy(dtype=np.int64)
+        player_index.player_names = index_df["player_name"].to_numpy(dtype=object)
+        player_index._index = pd.Index(player_index.player_ids)
+
+        return player_index
+
+    def to_frame(self):
+        """
+        method to return the index as a dataframe of player_id and
+        player_name with one row per player in the order of their columns
+        """
+        return pd.DataFrame(
+            {"player_id": self.player_ids, "player_name": self.player_names}
+        )
+
+    @classmethod
+    def read_parquet(cls, path):
+        """
+        method to load an index saved with to_parquet (requires pyarrow)
+
+        Inputs:
+        path - path of the parquet file
+        """
+        _pyarrow()
+        return cls.from_frame(pd.read_parquet(path))
+
+    def to_parquet(self, path):
+        """
+        method to save the index to a parquet file (requires pyarrow)
+
+        Inputs:
+        path - path of the parquet file to write
+        """
+        _pyarrow()
+        self.to_frame().to_parquet(path, index=False)
+
+    def add_players(self, rapm_shifts):
+        """
+        method to add every player in rapm_shifts that isn't in the index yet
+        after the players already in it. A player's name is the first one
+        they have in rapm_shifts. Only the possessions passed are scanned, so
+        to grow an index over several seasons pass each season's possessions
+        once as they come in instead of every season again
+
+        Inputs:
+        rapm_shifts - dataframe of possessions from PbP.rapm_possessions()
+
+        Outputs:
+        player_ids  - sorted numpy array of every player id in rapm_shifts
+        """
+        ids = rapm_shifts[RAPM_PLAYER_ID_COLUMNS].to_numpy(dtype=np.int64).ravel()
+        # hashing out the first appearance of each id is cheaper than sorting
+        # every id like np.unique, only the ids left over are sorted
+        first_ids = pd.Series(ids).drop_duplicates()
+        order = np.argsort(first_ids.to_numpy(), kind="stable")
+        player_ids = first_ids.to_numpy()[order]
+
+        is_new = self._index.get_indexer(player_ids) == -1
+        if is_new.any():
+            # the names are only looked up for the players that are new
+            first_rows = first_ids.index.to_numpy()[order][is_new]
+            names = rapm_shifts[RAPM_PLAYER_COLUMNS].to_numpy()[
+                first_rows // len(RAPM_PLAYER_COLUMNS),
+                first_rows % len(RAPM_PLAYER_COLUMNS),
+            ]
+            self.player_ids = np.concatenate([self.player_ids, player_ids[is_new]])
+            self.player_names = np.concatenate([self.player_names, names])
+            self._index = pd.Index(self.player_ids)
+
+        return player_ids
+
+    def positions(self, player_ids):
+        """
+        method to look up the position of player ids in the index
+
+        Inputs:
+        player_ids - numpy array of player ids of any shape
+
+        Outputs:
+        positions  - numpy array of the same shape of each player's position,
+                     -1 for players not in the index
+        """
+        player_ids = np.asarray(player_ids)
+
+        return self._index.get_indexer(player_ids.ravel()).reshape(player_ids.shape)
 
 
 class PlayerTotals:
@@ -9,56 +159,124 @@ class PlayerTotals:
     dataframes. The dataframes have to be created by PbP.playerbygamestats()
     or else the methods won't work. I've grouped these stat calculations in a
     seperate class because they work best with larger sample sizes
+
+    Totals are kept as running sums per player so games can be added with
+    add_game or taken out with remove_game as the season goes on without
+    regrouping every game already in the totals. The rows of each game are
+    kept apart and only concatenated when pbg is read, so adding a game
+    doesn't copy the rest of the season either
     """
 
-    def __init__(self, pbg_list):
-        self.pbg = pd.concat(pbg_list)
+    def __init__(self, pbg_list=()):
+        pbg_list = list(pbg_list)
+        self.pbg = pd.concat(pbg_list) if pbg_list else pd.DataFrame()
 
-    def player_advanced_stats(self):
+    @property
+    def pbg(self):
+        """
+        every player by game row in the totals as one dataframe in the order
+        the games were added. Setting it rebuilds the totals from the new rows
+        """
+        if self._pbg is None:
+            self._pbg = (
+                pd.concat(list(self._games.values())) if self._games else pd.DataFrame()
+            )
+        return self._pbg
 
-        stats = [
-            "toc",
-            "fgm",
-            "fga",
-            "tpm",
-            "tpa",
-            "ftm",
-            "fta",
-            "blk",
-            "ast",
-            "oreb",
-            "dreb",
-            "tov",
-            "pf",
-            "stl",
-            "plus",
-            "minus",
-            "plus_minus",
-            "possessions",
-            "points",
-        ]
-        grouped_df = (
-            self.pbg.groupby(["player_id", "player_name"])[stats].sum().reset_index()
-        )
-        # equivalent of select distinct
-        team_df = self.pbg[
-            ["player_id", "player_name", "team_abbrev"]
-        ].drop_duplicates()
-
-        team_df = (
-            self.pbg.groupby(["player_id", "player_name"])
-            .agg({"team_abbrev": lambda x: "/".join(x.unique())})
-            .reset_index()
+    @pbg.setter
+    def pbg(self, pbg_df):
+        # the playerbygamestats rows of each game keyed by game_id, and all of
+        # them concatenated the last time pbg was read
+        self._games = {}
+        self._pbg = None
+        self._totals = pd.DataFrame(
+            columns=PLAYER_STATS + ["gp"],
+            index=pd.MultiIndex.from_arrays(
+                [[], []], names=["player_id", "player_name"]
+            ),
+            dtype=float,
         )
+        self._teams = {}
+        self._seasons = {}
+
+        if pbg_df.shape[0] > 0:
+            self.add_game(pbg_df)
+
+    def _fold(self, pbg_df, sign):
+        """
+        method to add the stats of playerbygamestats rows to the running
+        totals, or subtract them with a sign of -1. Each call regroups only
+        the rows passed so a whole season is folded in with one groupby
+
+        Inputs:
+        pbg_df - dataframe from PbP.playerbygamestats()
+        sign   - 1 to add the rows, -1 to subtract them
+        """
+        keys = ["player_id", "player_name"]
+        game_totals = pbg_df.groupby(keys)[PLAYER_STATS].sum()
+        game_totals["gp"] = pbg_df.groupby(keys)["game_id"].count()
+        self._totals = self._totals.add(sign * game_totals, fill_value=0)
+        if sign < 0:
+            self._totals = self._totals[self._totals["gp"] > 0]
+
+        # teams are kept in the order each player first played for them
+        team_games = pbg_df.groupby(keys + ["team_abbrev"], sort=False).size()
+        for (player_id, player_name, team), games in team_games.items():
+            teams = self._teams.setdefault((player_id, player_name), {})
+            teams[team] = teams.get(team, 0) + sign * games
+            if teams[team] == 0:
+                del teams[team]
+            if not teams:
+                del self._teams[(player_id, player_name)]
+        for season, rows in pbg_df["season"].value_counts().items():
+            self._seasons[season] = self._seasons.get(season, 0) + sign * rows
+            if self._seasons[season] == 0:
+                del self._seasons[season]
+
+    def add_game(self, pbg_df):
+        """
+        method to add the player stats of one or more games to the running
+        totals. Adding a game that is already in the totals replaces it
+
+        Inputs:
+        pbg_df - dataframe from PbP.playerbygamestats()
+        """
+        replaced = []
+        for game_id, game_df in pbg_df.groupby("game_id", sort=False):
+            if game_id in self._games:
+                replaced.append(self._games.pop(game_id))
+            self._games[game_id] = game_df
+        if replaced:
+            self._fold(pd.concat(replaced), -1)
+
+        self._fold(pbg_df, 1)
+        self._pbg = None
 
-        gp_df = (
-            self.pbg.groupby(["player_id", "player_name"])["game_id"]
-            .count()
-            .reset_index()
-            .rename(columns={"game_id": "gp"})
+    def remove_game(self, game_id):
+        """
+        method to take the player stats of a game back out of the running
+        totals
+
+        Inputs:
+        game_id - game_id of a game added with add_game
+        """
+        self._fold(self._games.pop(game_id), -1)
+        self._pbg = None
+
+    def player_advanced_stats(self):
+        """
+        method to calculate each player's totals and rate stats from the
+        running totals of every game added so far
+        """
+        grouped_df = self._totals.sort_index()
+        # the running sums are floats since new players are aligned in as NaN
+        grouped_df = grouped_df.astype(
+            {col: int for col in grouped_df.columns if col != "toc"}
         )
-        grouped_df = grouped_df.merge(gp_df, on=["player_id", "player_name"])
-        grouped_df = grouped_df.merge(team_df, on=["player_id", "player_name"])
+        grouped_df["team_abbrev"] = [
+            "/".join(self._teams[player]) for player in grouped_df.index
+        ]
+        grouped_df = grouped_df.reset_index()
         grouped_df["off_rating"] = (grouped_df["plus"] * 100) / grouped_df[
             "possessions"
         ]
@@ -103,202 +321,140 @@ class PlayerTotals:
             1,
         )
 
-        grouped_df["min_season"] = self.pbg["season"].min()
-        grouped_df["max_season"] = self.pbg["season"].max()
+        grouped_df["min_season"] = min(self._seasons, default=np.nan)
+        grouped_df["max_season"] = max(self._seasons, default=np.nan)
 
         return grouped_df
 
     @staticmethod
-    def rapm_matrix_map(row_in, players):
-        p1 = row_in[0]
-        p2 = row_in[1]
-        p3 = row_in[2]
-        p4 = row_in[3]
-        p5 = row_in[4]
-        p6 = row_in[5]
-        p7 = row_in[6]
-        p8 = row_in[7]
-        p9 = row_in[8]
-        p10 = row_in[9]
-
-        rowOut = np.zeros([(len(players) * 2) + 1])
-
-        rowOut[players.index(p1)] = 1
-        rowOut[players.index(p2)] = 1
-        rowOut[players.index(p3)] = 1
-        rowOut[players.index(p4)] = 1
-        rowOut[players.index(p5)] = 1
-
-        rowOut[players.index(p6) + len(players)] = -1
-        rowOut[players.index(p7) + len(players)] = -1
-        rowOut[players.index(p8) + len(players)] = -1
-        rowOut[players.index(p9) + len(players)] = -1
-        rowOut[players.index(p10) + len(players)] = -1
-
-        rowOut[len(players) + 1] = row_in[10]
-
-        return rowOut
+    @instrument.stage
+    def _rapm_matrix_creation(rapm_shifts, player_index):
+        """
+        function to create the sparse train_x matrix and train_y array for
+        input into a Ridge regression. Each row has a 1 in the offensive column
+        of the five offensive players, a -1 in the defensive column of the five
+        defensive players and the is_home flag in the last column
 
-    @staticmethod
-    def player_rapm_results(rapm_shifts):
+        Inputs:
+        rapm_shifts  - dataframe of possessions from PbP.rapm_possessions()
+        player_index - PlayerIndex with every player in rapm_shifts
+
+        Outputs:
+        train_x      - scipy csr matrix of shape (possessions, 2 * players + 1)
+                       with the columns of each player at their position in
+                       player_index
+        train_y      - numpy array of points per 100 possessions
         """
-        funciton to produce RAPM coefficients for players in the
-        rapm shifts passed to the function
+        from scipy import sparse
+
+        players = len(player_index)
+        off_ids = rapm_shifts[[f"off_player_{i}_id" for i in range(1, 6)]].to_numpy()
+        def_ids = rapm_shifts[[f"def_player_{i}_id" for i in range(1, 6)]].to_numpy()
+        is_home = rapm_shifts["is_home"].to_numpy()
+        samples = rapm_shifts.shape[0]
+
+        off_cols = player_index.positions(off_ids)
+        def_cols = player_index.positions(def_ids) + players
+        home_cols = np.full((samples, 1), 2 * players)
+
+        cols = np.concatenate([off_cols, def_cols, home_cols], axis=1)
+        data = np.concatenate(
+            [
+                np.ones(off_cols.shape),
+                np.full(def_cols.shape, -1.0),
+                is_home.reshape(samples, 1),
+            ],
+            axis=1,
+        )
+        rows = np.repeat(np.arange(samples), cols.shape[1])
+
+        train_x = sparse.csr_matrix(
+            (data.ravel(), (rows, cols.ravel())), shape=(samples, (2 * players) + 1)
+        )
+        train_x.eliminate_zeros()
+        train_y = rapm_shifts[["points_per_100_poss"]].to_numpy()
+
+        return train_x, train_y
+
+    @staticmethod
+    @instrument.stage
+    def _rapm_stints(rapm_shifts):
         """
+        function to collapse RAPM possessions into weighted stint rows. A stint
+        is a run of possessions in a game with the same ten players on the
+        court and all of its possessions with the same five players on
+        offense and the same is_home flag become one row. Those possessions
+        are identical rows of the regression so fitting the stint rows with
+        their possession counts as sample weights gives the same solution
 
-        def lambda_to_alpha(lambda_value, samples):
-            return (lambda_value * samples) / 2.0
+        Inputs:
+        rapm_shifts - dataframe of possessions from PbP.rapm_possessions() with
+                      the is_home and possessions columns player_rapm_results
+                      adds
 
-        def player_details(rapm_shifts):
-            """
-            function to get player_id, player_name kvp in a dataframe
-            to join to rapm output to get names for player_ids
-            """
-            off_player_1 = rapm_shifts[
-                ["off_player_1_id", "off_player_1"]
-            ].drop_duplicates()
-            off_player_2 = rapm_shifts[
-                ["off_player_2_id", "off_player_2"]
-            ].drop_duplicates()
-            off_player_3 = rapm_shifts[
-                ["off_player_3_id", "off_player_3"]
-            ].drop_duplicates()
-            off_player_4 = rapm_shifts[
-                ["off_player_4_id", "off_player_4"]
-            ].drop_duplicates()
-            off_player_5 = rapm_shifts[
-                ["off_player_5_id", "off_player_5"]
-            ].drop_duplicates()
-            off_player_1 = off_player_1.rename(
-                columns={"off_player_1_id": "player_id", "off_player_1": "player_name"}
-            )
-            off_player_2 = off_player_2.rename(
-                columns={"off_player_2_id": "player_id", "off_player_2": "player_name"}
-            )
-            off_player_3 = off_player_3.rename(
-                columns={"off_player_3_id": "player_id", "off_player_3": "player_name"}
-            )
-            off_player_4 = off_player_4.rename(
-                columns={"off_player_4_id": "player_id", "off_player_4": "player_name"}
-            )
-            off_player_5 = off_player_5.rename(
-                columns={"off_player_5_id": "player_id", "off_player_5": "player_name"}
-            )
-            def_player_1 = rapm_shifts[
-                ["def_player_1_id", "def_player_1"]
-            ].drop_duplicates()
-            def_player_2 = rapm_shifts[
-                ["def_player_2_id", "def_player_2"]
-            ].drop_duplicates()
-            def_player_3 = rapm_shifts[
-                ["def_player_3_id", "def_player_3"]
-            ].drop_duplicates()
-            def_player_4 = rapm_shifts[
-                ["def_player_4_id", "def_player_4"]
-            ].drop_duplicates()
-            def_player_5 = rapm_shifts[
-                ["def_player_5_id", "def_player_5"]
-            ].drop_duplicates()
-            def_player_1 = def_player_1.rename(
-                columns={"def_player_1_id": "player_id", "def_player_1": "player_name"}
-            )
-            def_player_2 = def_player_2.rename(
-                columns={"def_player_2_id": "player_id", "def_player_2": "player_name"}
-            )
-            def_player_3 = def_player_3.rename(
-                columns={"def_player_3_id": "player_id", "def_player_3": "player_name"}
-            )
-            def_player_4 = def_player_4.rename(
-                columns={"def_player_4_id": "player_id", "def_player_4": "player_name"}
-            )
-            def_player_5 = def_player_5.rename(
-                columns={"def_player_5_id": "player_id", "def_player_5": "player_name"}
-            )
-            players = pd.concat(
-                [
-                    off_player_1,
-                    off_player_2,
-                    off_player_3,
-                    off_player_4,
-                    off_player_5,
-                    def_player_1,
-                    def_player_2,
-                    def_player_3,
-                    def_player_4,
-                    def_player_5,
-                ]
-            )
-            players = players.drop_duplicates()
-
-            return players
-
-        players = list(
-            set(
-                list(rapm_shifts["off_player_1_id"].unique())
-                + list(rapm_shifts["off_player_2_id"].unique())
-                + list(rapm_shifts["off_player_3_id"].unique())
-                + list(rapm_shifts["off_player_4_id"].unique())
-                + list(rapm_shifts["off_player_5_id"].unique())
-                + list(rapm_shifts["def_player_1_id"].unique())
-                + list(rapm_shifts["def_player_2_id"].unique())
-                + list(rapm_shifts["def_player_3_id"].unique())
-                + list(rapm_shifts["def_player_4_id"].unique())
-                + list(rapm_shifts["def_player_5_id"].unique())
-            )
+        Outputs:
+        stints_df   - dataframe with one row per stint and offense holding the
+                      first possession's columns, the summed points_made and
+                      possessions, and points_per_100_poss
+        """
+        off_ids = np.sort(
+            rapm_shifts[[f"off_player_{i}_id" for i in range(1, 6)]].to_numpy(), axis=1
+        )
+        def_ids = np.sort(
+            rapm_shifts[[f"def_player_{i}_id" for i in range(1, 6)]].to_numpy(), axis=1
         )
+        lineups = np.sort(np.concatenate([off_ids, def_ids], axis=1), axis=1)
+        game_ids = rapm_shifts["game_id"].to_numpy()
 
-        players.sort()
+        new_stint = np.ones(rapm_shifts.shape[0], dtype=bool)
+        new_stint[1:] = (lineups[1:] != lineups[:-1]).any(axis=1) | (
+            game_ids[1:] != game_ids[:-1]
+        )
+        stint_keys = [np.cumsum(new_stint), rapm_shifts["is_home"].to_numpy()]
+        stint_keys += list(off_ids.T)
 
-        player_df = player_details(rapm_shifts)
-        rapm_shifts["points_per_100_poss"] = rapm_shifts["points_made"] * 100
-        rapm_shifts["possessions"] = 1
-        rapm_shifts["is_home"] = np.where(
-            rapm_shifts["home_team_abbrev"] == rapm_shifts["event_team_abbrev"], 1, 0
+        rapm_shifts = rapm_shifts.reset_index(drop=True)
+        grouped = rapm_shifts.groupby(stint_keys, sort=False)
+        first_rows = grouped.cumcount().to_numpy() == 0
+        stints_df = rapm_shifts[first_rows].reset_index(drop=True)
+        stints_df["points_made"] = grouped["points_made"].sum().to_numpy()
+        stints_df["possessions"] = grouped["possessions"].sum().to_numpy()
+        stints_df["points_per_100_poss"] = (
+            stints_df["points_made"] * 100 / stints_df["possessions"]
         )
-        train_x = rapm_shifts[
-            [
-                "off_player_1_id",
-                "off_player_2_id",
-                "off_player_3_id",
-                "off_player_4_id",
-                "off_player_5_id",
-                "def_player_1_id",
-                "def_player_2_id",
-                "def_player_3_id",
-                "def_player_4_id",
-                "def_player_5_id",
-                "is_home",
-            ]
-        ].to_numpy()
 
-        train_x = np.apply_along_axis(PlayerTotals.rapm_matrix_map, 1, train_x, players)
-        train_y = rapm_shifts[["points_per_100_poss"]].to_numpy()
-        possessions = rapm_shifts["possessions"]
+        return stints_df
 
-        lambdas_rapm = [0.01, 0.025, 0.05, .075, 0.1]
-        alphas = [lambda_to_alpha(l, train_x.shape[0]) for l in lambdas_rapm]
-        clf = RidgeCV(alphas=alphas, cv=5, fit_intercept=True, normalize=False)
-        model = clf.fit(train_x, train_y, sample_weight=possessions)
-        player_arr = np.transpose(np.array(players).reshape(1, len(players)))
+    @staticmethod
+    @instrument.stage
+    def _rapm_results(player_index, coef_off, coef_def, intercept, seasons, players):
+        """
+        function to build the player_rapm_results dataframe of each player's
+        offensive, defensive, and total RAPM and their ranks out of the
+        regression's coefficients
 
-        # extract our coefficients into the offensive and defensive parts
-        coef_offensive_array = np.transpose(model.coef_[:, 0 : len(players)])
-        coef_defensive_array = np.transpose(model.coef_[:, len(players) : -1])
+        Inputs:
+        player_index - PlayerIndex of the regression's columns
+        coef_off     - numpy array of the offensive coefficient of each player
+                       in player_index
+        coef_def     - numpy array of the defensive coefficient of each player
+                       in player_index
+        intercept    - intercept of the regression
+        seasons      - seasons of the possessions in the regression
+        players      - sorted numpy array of the player ids to return
 
-        # concatenate the offensive and defensive values with the playey ids into a mx3 matrix
-        player_id_with_coef = np.concatenate(
-            [player_arr, coef_offensive_array, coef_defensive_array], axis=1
-        )
-        # build a dataframe from our matrix
-        players_coef = pd.DataFrame(player_id_with_coef)
-        intercept = model.intercept_
+        Outputs:
+        results_df   - dataframe of RAPM results
+        """
         name = "rapm"
-        # apply new column names
-        players_coef.columns = [
-            "player_id",
-            f"{name}_off",
-            f"{name}_def",
-        ]
+        positions = player_index.positions(players)
+        players_coef = pd.DataFrame(
+            {
+                "player_id": players,
+                f"{name}_off": coef_off[positions],
+                f"{name}_def": coef_def[positions],
+            }
+        )
         # Add the offesnive and defensive components together (we should really be weighing this to the number of offensive and defensive possession played as they are often not equal).
         players_coef[name] = players_coef[f"{name}_off"] + players_coef[f"{name}_def"]
 
@@ -312,13 +468,130 @@ class PlayerTotals:
         )
 
         # add the intercept for reference
-        players_coef[f"{name}_intercept"] = intercept[0]
+        players_coef[f"{name}_intercept"] = intercept
 
-        results_df = players_coef.merge(
-            player_df[["player_id", "player_name"]], on="player_id"
-        )
-        results_df = np.round(results_df, decimals=2)
-        results_df["min_season"] = rapm_shifts["season"].min()
-        results_df["max_season"] = rapm_shifts["season"].max()
+        players_coef["player_name"] = player_index.player_names[positions]
+        results_df = np.round(players_coef, decimals=2)
+        results_df["min_season"] = np.min(seasons)
+        results_df["max_season"] = np.max(seasons)
 
         return results_df
+
+    @staticmethod
+    @instrument.stage
+    def player_rapm_results(
+        rapm_shifts, lambdas_rapm=None, collapse_stints=False, player_index=None
+    ):
+        """
+        funciton to produce RAPM coefficients for players in the
+        rapm shifts passed to the function. lambdas_rapm is the list of
+        lambdas to cross validate over and defaults to
+        [0.01, 0.025, 0.05, 0.075, 0.1]. collapse_stints fits the regression
+        on the weighted stint rows of _rapm_stints instead of one row per
+        possession. player_index is a PlayerIndex to reuse across fits, any
+        new players in rapm_shifts are added to it
+        """
+
+        def lambda_to_alpha(lambda_value, samples):
+            return (lambda_value * samples) / 2.0
+
+        if player_index is None:
+            player_index = PlayerIndex()
+        players = player_index.add_players(rapm_shifts)
+
+        rapm_shifts["points_per_100_poss"] = rapm_shifts["points_made"] * 100
+        rapm_shifts["possessions"] = 1
+        rapm_shifts["is_home"] = np.where(
+            rapm_shifts["home_team_abbrev"] == rapm_shifts["event_team_abbrev"], 1, 0
+        )
+        if collapse_stints:
+            rapm_shifts = PlayerTotals._rapm_stints(rapm_shifts)
+        train_x, train_y = PlayerTotals._rapm_matrix_creation(rapm_shifts, player_index)
+        possessions = rapm_shifts["possessions"]
+
+        if lambdas_rapm is None:
+            lambdas_rapm = [0.01, 0.025, 0.05, .075, 0.1]
+        alphas = [lambda_to_alpha(l, possessions.sum()) for l in lambdas_rapm]
+        clf = RidgePathCV(alphas=alphas, cv=5, fit_intercept=True)
+        model = clf.fit(train_x, train_y, sample_weight=possessions)
+        # extract our coefficients into the offensive and defensive parts
+        return PlayerTotals._rapm_results(
+            player_index,
+            model.coef_[0, 0 : len(player_index)],
+            model.coef_[0, len(player_index) : -1],
+            model.intercept_[0],
+            rapm_shifts["season"],
+            players,
+        )
+
+
+class PlayerRapm:
+    """
+    This class is a persistent player RAPM regression for keeping a season's
+    RAPM up to date as games are played. Instead of rebuilding the regression
+    out of every possession like PlayerTotals.player_rapm_results it keeps
+    the regression's gram matrix as a running sum, so adding a night of games
+    only costs the new possessions plus an O(players^2) warm started solve.
+
+    The lambda is fixed instead of cross validated each time, i.e. the one
+    player_rapm_results picked for the season so far. With the same lambda
+    the results are the same as player_rapm_results on every possession added
+    """
+
+    def __init__(self, lambda_rapm=0.05, player_index=None):
+        self.lambda_rapm = lambda_rapm
+        self.samples = 0
+        # player k of the index has offensive and defensive columns 2k + 1
+        # and 2k + 2 in the regression and is_home is column 0
+        self.player_index = PlayerIndex() if player_index is None else player_index
+        self._players = np.zeros(0, dtype=np.int64)
+        self._model = IncrementalRidge()
+        self._seasons = []
+
+    @instrument.stage
+    def add_possessions(self, rapm_shifts):
+        """
+        method to add possessions to the regression
+
+        Inputs:
+        rapm_shifts - dataframe of possessions from PbP.rapm_possessions()
+        """
+        players = self.player_index.add_players(rapm_shifts)
+        self._players = np.union1d(self._players, players)
+
+        rapm_shifts = rapm_shifts.assign(
+            points_per_100_poss=rapm_shifts["points_made"] * 100,
+            is_home=np.where(
+                rapm_shifts["home_team_abbrev"] == rapm_shifts["event_team_abbrev"],
+                1,
+                0,
+            ),
+        )
+        train_x, train_y = PlayerTotals._rapm_matrix_creation(
+            rapm_shifts, self.player_index
+        )
+        positions = np.arange(len(self.player_index))
+        columns = np.concatenate([2 * positions + 1, 2 * positions + 2, [0]])
+        self._model.add(train_x, train_y, columns=columns)
+
+        self.samples += rapm_shifts.shape[0]
+        self._seasons.extend(rapm_shifts["season"].unique())
+
+    @instrument.stage
+    def player_rapm_results(self):
+        """
+        method to solve the regression for every possession added so far and
+        return the results in the same format as
+        PlayerTotals.player_rapm_results
+        """
+        alpha = (self.lambda_rapm * self.samples) / 2.0
+        self._model.solve(alpha)
+
+        return PlayerTotals._rapm_results(
+            self.player_index,
+            self._model.coef_[1::2],
+            self._model.coef_[2::2],
+            self._model.intercept_,
+            self._seasons,
+            self._players,
+        )
@@ -0,0 +1,286 @@
+import warnings
+import numpy as np
+from . import instrument
+
+# scipy is imported in the functions that use it so workers that only import
+# nba_parser for the box score calculations never load it
+
+
+class RidgePathCV:
+    """
+    This class is the ridge regression solver used by the RAPM calculations
+    in PlayerTotals and TeamTotals. Instead of refitting the whole problem for
+    every fold and every alpha like sklearn's RidgeCV it builds the weighted
+    gram matrix X^T W X once, eigendecomposes it, and reads the solution for
+    every alpha off of that one decomposition. Cross validation is done on the
+    per fold gram matrices as well so the rows of X are only touched once.
+
+    The objective is the same one as sklearn's Ridge with sample weights:
+
+        sum(w * (y - X @ coef - intercept) ** 2) + alpha * sum(coef ** 2)
+
+    and the alpha with the lowest total weighted squared error across the
+    validation folds is kept
+    """
+
+    def __init__(self, alphas, cv=5, fit_intercept=True):
+        self.alphas = np.asarray(alphas, dtype=float)
+        self.cv = cv
+        self.fit_intercept = fit_intercept
+
+    @staticmethod
+    def _weighted_gram(train_x, train_y, sample_weight):
+        """
+        function to calculate the weighted sufficient statistics of a sample
+
+        Inputs:
+        train_x       - dense numpy array or scipy sparse matrix
+        train_y       - 1d numpy array of the target
+        sample_weight - 1d numpy array of the sample weights
+
+        Outputs:
+        gram          - dict of X^T W X, X^T w, sum(w), X^T W y, w^T y, and
+                        y^T W y
+        """
+        from scipy import sparse
+
+        if sparse.issparse(train_x):
+            weighted_x = sparse.diags(sample_weight) @ train_x
+            xx = (train_x.T @ weighted_x).toarray()
+            x = np.asarray(weighted_x.sum(axis=0)).ravel()
+        else:
+            weighted_x = train_x * sample_weight[:, None]
+            xx = train_x.T @ weighted_x
+            x = weighted_x.sum(axis=0)
+
+        return {
+            "xx": xx,
+            "x": x,
+            "w": sample_weight.sum(),
+            "xy": np.asarray(weighted_x.T @ train_y).ravel(),
+            "y": sample_weight @ train_y,
+            "yy": sample_weight @ (train_y ** 2),
+        }
+
+    def _solve_path(self, gram):
+        """
+        function to solve the ridge regression for every alpha from a single
+        eigendecomposition of the centered gram matrix
+
+        Outputs:
+        coefs      - numpy array of shape (features, alphas)
+        intercepts - numpy array of shape (alphas,)
+        """
+        xx, xy = gram["xx"], gram["xy"]
+        if self.fit_intercept:
+            x_mean = gram["x"] / gram["w"]
+            y_mean = gram["y"] / gram["w"]
+            xx = xx - gram["w"] * np.outer(x_mean, x_mean)
+            xy = xy - gram["w"] * x_mean * y_mean
+
+        eigenvalues, eigenvectors = np.linalg.eigh(xx)
+        projected = eigenvectors.T @ xy
+        coefs = eigenvectors @ (
+            projected[:, None] / (eigenvalues[:, None] + self.alphas[None, :])
+        )
+
+        if self.fit_intercept:
+            intercepts = y_mean - x_mean @ coefs
+        else:
+            intercepts = np.zeros(len(self.alphas))
+
+        return coefs, intercepts
+
+    @staticmethod
+    def _path_sse(gram, coefs, intercepts):
+        """
+        function to calculate the weighted sum of squared errors of every
+        solution on the path using only a sample's gram statistics
+        """
+        return (
+            gram["yy"]
+            - 2 * (coefs.T @ gram["xy"] + intercepts * gram["y"])
+            + np.einsum("ij,ij->j", coefs, gram["xx"] @ coefs)
+            + 2 * intercepts * (gram["x"] @ coefs)
+            + (intercepts ** 2) * gram["w"]
+        )
+
+    @instrument.stage
+    def fit(self, train_x, train_y, sample_weight=None):
+        """
+        function to pick the best alpha with k-fold cross validation and fit
+        the ridge regression on the full sample with it. Folds are consecutive
+        blocks of rows the same as sklearn's KFold without shuffling
+        """
+        from scipy import sparse
+
+        target = np.asarray(train_y, dtype=float)
+        train_y = target.ravel()
+        if sample_weight is None:
+            sample_weight = np.ones(train_y.shape[0])
+        sample_weight = np.asarray(sample_weight, dtype=float)
+        if sparse.issparse(train_x):
+            train_x = sparse.csr_matrix(train_x)
+
+        folds = [
+            self._weighted_gram(train_x[rows], train_y[rows], sample_weight[rows])
+            for rows in np.array_split(np.arange(train_y.shape[0]), self.cv)
+        ]
+        total = {key: sum(fold[key] for fold in folds) for key in folds[0]}
+
+        self.cv_errors_ = np.zeros(len(self.alphas))
+        for fold in folds:
+            train_gram = {key: total[key] - fold[key] for key in total}
+            coefs, intercepts = self._solve_path(train_gram)
+            self.cv_errors_ += self._path_sse(fold, coefs, intercepts)
+
+        best = np.argmin(self.cv_errors_)
+        self.alpha_ = self.alphas[best]
+
+        coefs, intercepts = self._solve_path(total)
+        # match sklearn's output shapes for a column vector target
+        if target.ndim == 2:
+            self.coef_ = coefs[:, best].reshape(1, -1)
+            self.intercept_ = intercepts[best : best + 1]
+        else:
+            self.coef_ = coefs[:, best]
+            self.intercept_ = intercepts[best]
+
+        return self
+
+
+class IncrementalRidge:
+    """
+    This class is a ridge regression that keeps the weighted gram matrix
+    X^T W X, X^T W y, and the rest of the sufficient statistics RidgePathCV
+    uses as running sums so new rows can be added without touching the rows
+    already added. New features can be added along with new rows, the rows
+    already added are zero in them. The regression is solved with conjugate
+    gradient warm started from the last solution, so refitting after adding
+    a small batch of rows takes a few O(features^2) iterations instead of a
+    full decomposition of the gram matrix.
+
+    It solves the same objective as RidgePathCV for a single alpha
+    """
+
+    def __init__(self, fit_intercept=True, tol=1e-10, max_iter=None):
+        self.fit_intercept = fit_intercept
+        self.tol = tol
+        self.max_iter = max_iter
+        self.gram = {
+            "xx": np.zeros((0, 0)),
+            "x": np.zeros(0),
+            "w": 0.0,
+            "xy": np.zeros(0),
+            "y": 0.0,
+            "yy": 0.0,
+        }
+        self.coef_ = np.zeros(0)
+        self.intercept_ = 0.0
+        self.n_iter_ = 0
+        self.converged_ = True
+
+    def _grow(self, features):
+        """
+        function to pad the gram statistics and the coefficients with zeros
+        out to the number of features passed
+        """
+        added = features - self.coef_.shape[0]
+        if added <= 0:
+            return
+
+        self.gram["xx"] = np.pad(self.gram["xx"], (0, added))
+        for key in ["x", "xy"]:
+            self.gram[key] = np.pad(self.gram[key], (0, added))
+        self.coef_ = np.pad(self.coef_, (0, added))
+
+    def add(self, train_x, train_y, sample_weight=None, columns=None):
+        """
+        function to add rows to the running gram statistics
+
+        Inputs:
+        train_x       - dense numpy array or scipy sparse matrix of the rows
+        train_y       - numpy array of the target
+        sample_weight - 1d numpy array of the sample weights, defaults to 1
+        columns       - numpy array of the unique feature each column of
+                        train_x is, defaults to the first train_x.shape[1]
+                        features. Features past the current ones are added
+        """
+        from scipy import sparse
+
+        train_y = np.asarray(train_y, dtype=float).ravel()
+        if sample_weight is None:
+            sample_weight = np.ones(train_y.shape[0])
+        sample_weight = np.asarray(sample_weight, dtype=float)
+        if columns is None:
+            columns = np.arange(train_x.shape[1])
+        if sparse.issparse(train_x):
+            train_x = sparse.csr_matrix(train_x)
+
+        self._grow(columns.max() + 1)
+        batch = RidgePathCV._weighted_gram(train_x, train_y, sample_weight)
+        self.gram["xx"][np.ix_(columns, columns)] += batch["xx"]
+        self.gram["x"][columns] += batch["x"]
+        self.gram["xy"][columns] += batch["xy"]
+        for key in ["w", "y", "yy"]:
+            self.gram[key] += batch[key]
+
+        return self
+
+    @instrument.stage
+    def solve(self, alpha):
+        """
+        function to solve the ridge regression for alpha from the running gram
+        statistics with conjugate gradient starting from the last solution
+
+        Inputs:
+        alpha - the ridge penalty, the same as RidgePathCV's alphas
+        """
+        if self.fit_intercept and self.gram["w"] <= 0:
+            raise ValueError(
+                "no weighted rows to fit the intercept on, add rows before solving"
+            )
+
+        xx, xy = self.gram["xx"], self.gram["xy"]
+        if self.fit_intercept:
+            x_mean = self.gram["x"] / self.gram["w"]
+            y_mean = self.gram["y"] / self.gram["w"]
+            xx = xx - self.gram["w"] * np.outer(x_mean, x_mean)
+            xy = xy - self.gram["w"] * x_mean * y_mean
+        else:
+            xx = xx.copy()
+        xx[np.diag_indices_from(xx)] += alpha
+
+        max_iter = self.max_iter or xx.shape[0]
+        coef = self.coef_
+        residual = xy - xx @ coef
+        direction = residual
+        residual_norm = residual @ residual
+        stop_norm = (self.tol ** 2) * (xy @ xy)
+        self.n_iter_ = 0
+        while residual_norm > stop_norm and self.n_iter_ < max_iter:
+            step_direction = xx @ direction
+            step = residual_norm / (direction @ step_direction)
+            coef = coef + step * direction
+            residual = residual - step * step_direction
+            next_norm = residual @ residual
+            direction = residual + (next_norm / residual_norm) * direction
+            residual_norm = next_norm
+            self.n_iter_ += 1
+
+        # conjugate gradient hit max_iter before the residual got under tol
+        self.converged_ = bool(residual_norm <= stop_norm)
+        if not self.converged_:
+            warnings.warn(
+                f"conjugate gradient stopped after {self.n_iter_} iterations "
+                "without converging, raise max_iter or loosen tol",
+                RuntimeWarning,
+            )
+
+        self.coef_ = coef
+        if self.fit_intercept:
+            self.intercept_ = y_mean - x_mean @ coef
+        else:
+            self.intercept_ = 0.0
+
+        return self
@@ -0,0 +1,58 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pandas as pd
+from .pbp import SeasonPbP
+
+
+def _chunk_stats(games):
+    """
+    function run in each worker process to calculate the player and team box
+    scores for one chunk of games
+
+    Inputs:
+    games - list of nba_scraper csv file paths or play by play dataframes
+
+    Outputs:
+    pbg   - dataframe of PbP.playerbygamestats() for every game in the chunk
+    tbg   - dataframe of PbP.teambygamestats() for every game in the chunk
+    """
+    game_dfs = [
+        game if isinstance(game, pd.DataFrame) else pd.read_csv(game) for game in games
+    ]
+    season = SeasonPbP(pd.concat(game_dfs, ignore_index=True))
+
+    return season.playerbygamestats(), season.teambygamestats()
+
+
+def season_bygamestats(games, workers=None, chunksize=1):
+    """
+    function to calculate playerbygamestats and teambygamestats for a list of
+    games spread out over a pool of worker processes. Each worker builds a
+    SeasonPbP out of chunksize games at a time so larger chunks trade less
+    process overhead for more memory per worker
+
+    Inputs:
+    games     - list of nba_scraper csv file paths or play by play dataframes
+    workers   - number of worker processes, defaults to the number of cpus.
+                Passing 1 runs every chunk in the calling process
+    chunksize - number of games each worker calculates at once
+
+    Outputs:
+    pbg       - dataframe of player stats for every game ready for PlayerTotals
+    tbg       - dataframe of team stats for every game ready for TeamTotals
+    """
+    games = list(games)
+    chunks = [games[i : i + chunksize] for i in range(0, len(games), chunksize)]
+    if workers is None:
+        workers = os.cpu_count()
+
+    if workers == 1:
+        results = [_chunk_stats(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_chunk_stats, chunks))
+
+    pbg = pd.concat([result[0] for result in results], ignore_index=True)
+    tbg = pd.concat([result[1] for result in results], ignore_index=True)
+
+    return pbg, tbg
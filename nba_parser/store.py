@@ -0,0 +1,260 @@
+import pandas as pd
+
+# every team abbreviation column shares one categorical dtype so they can be
+# compared against each other the same as the string columns they replace
+TEAM_ABBREV_COLUMNS = [
+    "home_team_abbrev",
+    "away_team_abbrev",
+    "event_team",
+    "player1_team_abbreviation",
+    "player2_team_abbreviation",
+    "player3_team_abbreviation",
+]
+CATEGORY_COLUMNS = ["event_type_de", "shot_type", "foul_type"] + [
+    f"{team}_player_{i}" for team in ["home", "away"] for i in range(1, 6)
+]
+INT32_COLUMNS = (
+    [
+        "game_id",
+        "eventnum",
+        "season",
+        "home_team_id",
+        "away_team_id",
+        "player1_id",
+        "player2_id",
+        "player3_id",
+    ]
+    + [f"home_player_{i}_id" for i in range(1, 6)]
+    + [f"away_player_{i}_id" for i in range(1, 6)]
+)
+BOOL_COLUMNS = [
+    "is_three",
+    "is_block",
+    "is_o_rebound",
+    "is_d_rebound",
+    "is_turnover",
+    "is_steal",
+]
+# shot_made is only filled in on shot events so it needs to hold NaN
+FLOAT32_COLUMNS = ["shot_made"]
+
+
+def _pyarrow():
+    """
+    function to import pyarrow which is only needed for the game store
+    """
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError as err:
+        raise ImportError(
+            "the nba_parser game store requires pyarrow, install it with "
+            "pip install nba_parser[store]"
+        ) from err
+
+    return pyarrow
+
+
+def _partitioning(pa):
+    """
+    function to return the hive season/game_id partitioning of the store
+    """
+    return pa.dataset.partitioning(
+        pa.schema([("season", pa.int32()), ("game_id", pa.int32())]), flavor="hive"
+    )
+
+
+def team_abbrev_dtype(pbp_df):
+    """
+    function to build one categorical dtype out of every team abbreviation in
+    the team abbreviation columns of a play by play dataframe
+    """
+    abbrevs = set()
+    # one column at a time so pandas doesn't consolidate the dataframe's blocks
+    for col in [col for col in TEAM_ABBREV_COLUMNS if col in pbp_df.columns]:
+        if pbp_df[col].dtype == "category":
+            abbrevs.update(pbp_df[col].cat.categories)
+        else:
+            abbrevs.update(pbp_df[col].dropna().unique())
+    abbrevs = sorted(abbrev for abbrev in abbrevs if isinstance(abbrev, str))
+
+    return pd.CategoricalDtype(abbrevs)
+
+
+def typed_pbp(pbp_df):
+    """
+    function to convert nba_scraper play by play into the typed schema of the
+    game store: categorical team abbreviations, event types and player names,
+    int32 ids, boolean event flags and a parsed game_date. Columns already in
+    the schema aren't converted again, and read only columns like the memory
+    mapped ones from load_arrow are shared with pbp_df instead of copied
+
+    Inputs:
+    pbp_df  - play by play dataframe from nba_scraper or one of its csv files
+
+    Outputs:
+    typed_df - copy of pbp_df with compact dtypes
+    """
+    typed_df = pbp_df.copy(deep=False)
+    converted = set()
+
+    team_dtype = team_abbrev_dtype(typed_df)
+    dtypes = {col: team_dtype for col in TEAM_ABBREV_COLUMNS}
+    dtypes.update({col: "int32" for col in INT32_COLUMNS})
+    dtypes.update({col: "bool" for col in BOOL_COLUMNS})
+    dtypes.update({col: "float32" for col in FLOAT32_COLUMNS})
+    for col, dtype in dtypes.items():
+        if col in typed_df.columns and typed_df[col].dtype != dtype:
+            typed_df[col] = typed_df[col].astype(dtype)
+            converted.add(col)
+    for col in CATEGORY_COLUMNS:
+        if col in typed_df.columns and typed_df[col].dtype != "category":
+            typed_df[col] = typed_df[col].astype("category")
+            converted.add(col)
+
+    if typed_df["game_date"].dtypes == "O":
+        typed_df["game_date"] = pd.to_datetime(typed_df["game_date"])
+        converted.add("game_date")
+    if "scoremargin" in typed_df.columns:
+        typed_df["scoremargin"] = typed_df["scoremargin"].astype(str)
+        converted.add("scoremargin")
+
+    # the columns that weren't converted still share their arrays with
+    # pbp_df, so changing pbp_df in place would change the typed play by play
+    # behind the back of anything cached from it
+    for col in typed_df.columns:
+        column = typed_df[col]
+        if col not in converted and (
+            column.dtype == "category" or column.to_numpy().flags.writeable
+        ):
+            typed_df[col] = column.copy()
+
+    return typed_df
+
+
+def write_games(games, path):
+    """
+    function to convert nba_scraper play by play into the columnar game store.
+    Games are written as parquet files partitioned by season and game_id so
+    writing a game that is already in the store replaces it
+
+    Inputs:
+    games - list of nba_scraper csv file paths or play by play dataframes
+    path  - root directory of the game store
+    """
+    pa = _pyarrow()
+
+    for game in games:
+        if not isinstance(game, pd.DataFrame):
+            game = pd.read_csv(game)
+        table = pa.Table.from_pandas(typed_pbp(game), preserve_index=False)
+        pa.dataset.write_dataset(
+            table,
+            path,
+            format="parquet",
+            partitioning=_partitioning(pa),
+            existing_data_behavior="delete_matching",
+        )
+
+
+def load_games(path, game_ids=None, seasons=None, columns=None):
+    """
+    function to read play by play out of the game store. Only the requested
+    columns and the partitions matching game_ids and seasons are read
+
+    Inputs:
+    path     - root directory of the game store
+    game_ids - list of game ids to read, defaults to every game
+    seasons  - list of seasons to read, defaults to every season
+    columns  - list of columns to read, defaults to every column
+
+    Outputs:
+    pbp_df   - play by play dataframe in the typed store schema with the rows
+               of each game together in event order
+    """
+    pa = _pyarrow()
+
+    dataset = pa.dataset.dataset(path, format="parquet", partitioning=_partitioning(pa))
+    row_filter = None
+    if game_ids is not None:
+        row_filter = pa.dataset.field("game_id").isin(list(game_ids))
+    if seasons is not None:
+        season_filter = pa.dataset.field("season").isin(list(seasons))
+        row_filter = season_filter if row_filter is None else row_filter & season_filter
+
+    pbp_df = dataset.to_table(columns=columns, filter=row_filter).to_pandas()
+    if "game_id" in pbp_df.columns:
+        pbp_df = pbp_df.sort_values("game_id", kind="stable")
+    pbp_df = pbp_df.reset_index(drop=True)
+
+    # each column's categories come back from its own parquet dictionaries
+    team_dtype = team_abbrev_dtype(pbp_df)
+    for col in TEAM_ABBREV_COLUMNS:
+        if col in pbp_df.columns:
+            pbp_df[col] = pbp_df[col].astype(team_dtype)
+
+    return pbp_df
+
+
+def write_feather(games, path):
+    """
+    function to write nba_scraper play by play for many games, for example a
+    whole season, into one uncompressed Feather (Arrow IPC) file in the typed
+    store schema. Leaving it uncompressed lets load_arrow memory map it so
+    every process reading the file shares the OS page cache
+
+    Inputs:
+    games - list of nba_scraper csv file paths or play by play dataframes
+    path  - path of the feather file to write
+    """
+    pa = _pyarrow()
+    import pyarrow.feather
+
+    game_dfs = [
+        game if isinstance(game, pd.DataFrame) else pd.read_csv(game) for game in games
+    ]
+    typed_df = typed_pbp(pd.concat(game_dfs, ignore_index=True))
+    pa.feather.write_feather(typed_df, str(path), compression="uncompressed")
+
+
+def load_arrow(source, game_ids=None, columns=None):
+    """
+    function to turn an Arrow table or Feather file into play by play without
+    making a full pandas copy of it. Feather files are memory mapped and only
+    the requested columns and games are converted. Numeric columns without
+    nulls are handed to pandas as read only views of the Arrow buffers
+
+    Inputs:
+    source   - pyarrow Table or path to a Feather file from write_feather
+    game_ids - list of game ids to read, defaults to every game
+    columns  - list of columns to read, defaults to every column
+
+    Outputs:
+    pbp_df   - play by play dataframe in the typed store schema
+    """
+    pa = _pyarrow()
+    import pyarrow.compute
+
+    if isinstance(source, pa.Table):
+        table = source
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(source))).read_all()
+
+    if columns is not None:
+        table = table.select(columns)
+    if game_ids is not None:
+        game_id_type = table.schema.field("game_id").type
+        table = table.filter(
+            pa.compute.is_in(
+                table["game_id"], value_set=pa.array(game_ids, type=game_id_type)
+            )
+        )
+
+    pbp_df = table.to_pandas(split_blocks=True)
+
+    team_dtype = team_abbrev_dtype(pbp_df)
+    for col in TEAM_ABBREV_COLUMNS:
+        if col in pbp_df.columns and pbp_df[col].dtype != team_dtype:
+            pbp_df[col] = pbp_df[col].astype(team_dtype)
+
+    return pbp_df
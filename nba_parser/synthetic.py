@@ -0,0 +1,980 @@
+"""
+seeded synthetic play by play in nba_scraper's schema for load testing. A
+full 1230 game season takes about 7 seconds on one core and about 1.1 GB
+as a dataframe: around 4 seconds simulating the games one event at a time,
+which can't be vectorized since every possession depends on the score,
+fouls and lineups the ones before it left, and around 3 seconds building
+the description and name columns. Drawing the random numbers is only a
+small part of the simulation so they aren't drawn ahead in numpy batches.
+Generate fewer games with n_games for quick runs
+"""
+from bisect import bisect
+import random
+from datetime import date, timedelta
+from itertools import accumulate
+import numpy as np
+import pandas as pd
+
+# the thirty teams synthetic games are played between as team id,
+# abbreviation, city and nickname
+TEAMS = [
+    (1610612737, "ATL", "Atlanta", "Hawks"),
+    (1610612738, "BOS", "Boston", "Celtics"),
+    (1610612739, "CLE", "Cleveland", "Cavaliers"),
+    (1610612740, "NOP", "New Orleans", "Pelicans"),
+    (1610612741, "CHI", "Chicago", "Bulls"),
+    (1610612742, "DAL", "Dallas", "Mavericks"),
+    (1610612743, "DEN", "Denver", "Nuggets"),
+    (1610612744, "GSW", "Golden State", "Warriors"),
+    (1610612745, "HOU", "Houston", "Rockets"),
+    (1610612746, "LAC", "LA", "Clippers"),
+    (1610612747, "LAL", "Los Angeles", "Lakers"),
+    (1610612748, "MIA", "Miami", "Heat"),
+    (1610612749, "MIL", "Milwaukee", "Bucks"),
+    (1610612750, "MIN", "Minnesota", "Timberwolves"),
+    (1610612751, "BKN", "Brooklyn", "Nets"),
+    (1610612752, "NYK", "New York", "Knicks"),
+    (1610612753, "ORL", "Orlando", "Magic"),
+    (1610612754, "IND", "Indiana", "Pacers"),
+    (1610612755, "PHI", "Philadelphia", "76ers"),
+    (1610612756, "PHX", "Phoenix", "Suns"),
+    (1610612757, "POR", "Portland", "Trail Blazers"),
+    (1610612758, "SAC", "Sacramento", "Kings"),
+    (1610612759, "SAS", "San Antonio", "Spurs"),
+    (1610612760, "OKC", "Oklahoma City", "Thunder"),
+    (1610612761, "TOR", "Toronto", "Raptors"),
+    (1610612762, "UTA", "Utah", "Jazz"),
+    (1610612763, "MEM", "Memphis", "Grizzlies"),
+    (1610612764, "WAS", "Washington", "Wizards"),
+    (1610612765, "DET", "Detroit", "Pistons"),
+    (1610612766, "CHA", "Charlotte", "Hornets"),
+]
+# the first and last names synthetic players are named from
+FIRST_NAMES = """
+Aaron Andre Brandon Chris Darius Derrick Eric Gary Isaiah Jalen Jamal Jordan
+Justin Kevin Kyle Marcus Mike Nick Paul Terry Tony Trey Tyler Zach
+""".split()
+LAST_NAMES = """
+Allen Brown Carter Davis Evans Fisher Green Harris Irving Jackson Johnson King
+Lewis Miller Moore Nelson Parker Robinson Smith Thomas Turner Walker White Young
+""".split()
+# nba_scraper's play by play columns in the order it outputs them
+COLUMNS = (
+    [
+        "game_id",
+        "eventnum",
+        "eventmsgtype",
+        "eventmsgactiontype",
+        "period",
+        "wctimestring",
+        "pctimestring",
+        "homedescription",
+        "neutraldescription",
+        "visitordescription",
+        "score",
+        "scoremargin",
+    ]
+    + [
+        f"{col}{i}{suffix}"
+        for i in range(1, 4)
+        for col, suffix in [
+            ("person", "type"),
+            ("player", "_id"),
+            ("player", "_name"),
+            ("player", "_team_id"),
+            ("player", "_team_city"),
+            ("player", "_team_nickname"),
+            ("player", "_team_abbreviation"),
+        ]
+    ]
+    + [
+        "video_available_flag",
+        "home_team_abbrev",
+        "away_team_abbrev",
+        "home_team_id",
+        "away_team_id",
+        "game_date",
+        "season",
+        "event_team",
+        "event_type_de",
+        "shot_type_de",
+        "shot_made",
+        "is_block",
+        "shot_type",
+        "seconds_elapsed",
+        "event_length",
+        "is_three",
+        "points_made",
+        "is_o_rebound",
+        "is_d_rebound",
+        "is_turnover",
+        "is_steal",
+        "foul_type",
+        "is_putback",
+    ]
+    + [f"home_player_{i}{suffix}" for i in range(1, 6) for suffix in ["", "_id"]]
+    + [f"away_player_{i}{suffix}" for i in range(1, 6) for suffix in ["", "_id"]]
+)
+
+# event types, which are nba_scraper's eventmsgtype codes
+SHOT, MISS, FREE_THROW, REBOUND, TURNOVER, FOUL = 1, 2, 3, 4, 5, 6
+SUBSTITUTION, TIMEOUT, JUMP_BALL, PERIOD_START, PERIOD_END = 8, 9, 10, 12, 13
+EVENT_TYPE_DE = {
+    SHOT: "shot",
+    MISS: "missed_shot",
+    FREE_THROW: "free-throw",
+    REBOUND: "rebound",
+    TURNOVER: "turnover",
+    FOUL: "foul",
+    SUBSTITUTION: "substitution",
+    TIMEOUT: "team-timeout",
+    JUMP_BALL: "jump-ball",
+    PERIOD_START: "period-start",
+    PERIOD_END: "period-end",
+}
+# eventmsgactiontype of the nth free throw of a trip of m free throws
+FREE_THROW_ACTIONS = {(1, 1): 10, (1, 2): 11, (2, 2): 12, (1, 3): 13, (2, 3): 14}
+FREE_THROW_ACTIONS[(3, 3)] = 15
+FREE_THROW_ATTEMPTS = {action: key for key, action in FREE_THROW_ACTIONS.items()}
+SHOT_TYPES = {1: "Jump Shot", 5: "Layup Shot", 7: "Dunk Shot"}
+FOUL_TYPES = {1: "personal", 2: "shooting", 4: "offensive"}
+FOUL_CODES = {1: "P.FOUL", 2: "S.FOUL", 4: "OFF.Foul"}
+TURNOVER_TYPES = {1: "Bad Pass", 4: "Traveling", 37: "Offensive Foul", 45: "Lost Ball"}
+
+# rates per possession and per shot the games are simulated with, picked to
+# land near a modern NBA season's box score averages
+TURNOVER_RATE = 0.13
+STEAL_RATE = 0.5
+OFFENSIVE_FOUL_RATE = 0.12
+NON_SHOOTING_FOUL_RATE = 0.1
+SHOOTING_FOUL_RATE = {False: 0.12, True: 0.02}
+AND_ONE_RATE = 0.2
+ASSIST_RATE = 0.6
+BLOCK_RATE = 0.09
+OFFENSIVE_REBOUND_RATE = 0.23
+FREE_THROW_OFFENSIVE_REBOUND_RATE = 0.12
+TIMEOUT_RATE = 0.05
+BONUS_FOULS = 5
+
+# the columns of each simulated event before they are expanded to the full
+# nba_scraper schema. side is 0 when the home team is the event team, 1 when
+# it's the away team and -1 for neither. extra is the rebound type (1 for
+# offensive, 2 for defensive) of rebounds, 1 on putback shots, and the side
+# the ball is tipped to on jump balls
+EVENT_FIELDS = [
+    "period",
+    "seconds_elapsed",
+    "eventmsgtype",
+    "eventmsgactiontype",
+    "side",
+    "player1_id",
+    "player2_id",
+    "player3_id",
+    "shot_made",
+    "is_three",
+    "points_made",
+    "extra",
+    "lineup",
+]
+# ten player ids on the court, home players first, of every lineup
+LINEUP_FIELDS = [f"home_player_{i}_id" for i in range(1, 6)]
+LINEUP_FIELDS += [f"away_player_{i}_id" for i in range(1, 6)]
+
+
+def _rosters(rng):
+    """
+    function to create a thirteen man roster for every team. Each roster is
+    ordered as five starters, five rotation players and three players at the
+    end of the bench, with the ratings of the starters and rotation players
+    cycling through guards, wings and bigs
+
+    Inputs:
+    rng     - numpy random Generator
+
+    Outputs:
+    rosters - list of dicts of the players' ids, names and ratings, one dict
+              of lists per team in the order of TEAMS
+    players - dataframe of player_id and player_name for every player
+    """
+    roster_size = 13
+    player_count = len(TEAMS) * roster_size
+    player_ids = rng.choice(np.arange(201000, 1630000), player_count, replace=False)
+    names = rng.choice(len(FIRST_NAMES) * len(LAST_NAMES), player_count, replace=False)
+    first = [FIRST_NAMES[name // len(LAST_NAMES)] for name in names]
+    last = [LAST_NAMES[name % len(LAST_NAMES)] for name in names]
+
+    # position of each roster spot, 0 guard, 1 wing, 2 big
+    positions = np.array([0, 0, 1, 2, 2, 0, 1, 2, 0, 1, 0, 1, 2])
+    minutes = np.array([34, 32, 33, 31, 30, 24, 20, 17, 12, 7, 0, 0, 0])
+    usage = np.array([1.6, 1.2, 1.1, 1.0, 0.9, 1.0, 0.9, 0.8, 0.8, 0.7, 0.6, 0.6, 0.6])
+    three_rate = np.array([0.45, 0.42, 0.1])[positions]
+    fg2 = np.array([0.49, 0.51, 0.57])[positions]
+    fg3 = np.array([0.37, 0.36, 0.31])[positions]
+    ft = np.array([0.82, 0.79, 0.7])[positions]
+    rebounding = np.array([0.6, 0.9, 1.8])[positions]
+    fouling = np.array([0.9, 1.0, 1.15])[positions]
+
+    rosters = []
+    for team in range(len(TEAMS)):
+        spots = slice(team * roster_size, (team + 1) * roster_size)
+        noise = rng.normal(size=(6, roster_size))
+        team_minutes = np.clip(minutes + 2 * noise[0], 0, 40)
+        rosters.append(
+            {
+                "team_id": TEAMS[team][0],
+                "ids": player_ids[spots].tolist(),
+                "last": last[spots],
+                "minutes": team_minutes.tolist(),
+                # seconds a player stays in the game before he's subbed out
+                "stint": (300 + 8 * team_minutes).tolist(),
+                "usage": np.clip(usage + 0.15 * noise[1], 0.3, None).tolist(),
+                "three_rate": np.clip(three_rate + 0.08 * noise[2], 0, 1).tolist(),
+                "fg2": (fg2 + 0.03 * noise[3]).tolist(),
+                "fg3": (fg3 + 0.03 * noise[4]).tolist(),
+                "ft": np.clip(ft + 0.06 * noise[5], 0, 0.95).tolist(),
+                "rebounding": rebounding.tolist(),
+                "fouling": fouling.tolist(),
+                # how much the player lowers the opponent's field goal
+                # percentage while on the court
+                "defense": rng.normal(0, 0.008, roster_size).tolist(),
+            }
+        )
+
+    players = pd.DataFrame(
+        {
+            "player_id": player_ids,
+            "player_name": [f"{f} {l}" for f, l in zip(first, last)],
+        }
+    )
+
+    return rosters, players
+
+
+class _GameSimulator:
+    """
+    This class simulates a single game possession by possession into a list
+    of event tuples with the fields in EVENT_FIELDS. Lineups are kept as
+    roster positions of the players on the court for each team and every
+    lineup the game used is kept in self.lineups so the events only need to
+    store the lineup's index
+    """
+
+    def __init__(self, rand, home, away):
+        self.rand = rand
+        self.teams = (home, away)
+        self.events = []
+        self.lineups = []
+        self.on_court = [list(range(5)), list(range(5))]
+        self.elapsed = 0
+        self.period = 0
+        self.period_end = 0
+        self.score = [0, 0]
+        self.team_fouls = [0, 0]
+        self.fouls = [[0] * 13, [0] * 13]
+        self.played = [[0] * 13, [0] * 13]
+        self.entered = [[0] * 13, [0] * 13]
+        self._new_lineup()
+
+    def _new_lineup(self):
+        """
+        method to store the players currently on the court as a new lineup
+        and update the defensive rating, the cumulative pick weights, and the
+        time the first stint runs out of each side
+        """
+        self.lineups.append(
+            tuple(self.teams[0]["ids"][p] for p in self.on_court[0])
+            + tuple(self.teams[1]["ids"][p] for p in self.on_court[1])
+        )
+        self.defense = [
+            sum(self.teams[side]["defense"][p] for p in self.on_court[side])
+            for side in range(2)
+        ]
+        self.weights = [
+            {
+                rating: list(
+                    accumulate(self.teams[side][rating][p] for p in self.on_court[side])
+                )
+                for rating in ["usage", "rebounding", "fouling"]
+            }
+            for side in range(2)
+        ]
+        self.sub_due = [
+            min(
+                self.entered[side][p] + self.teams[side]["stint"][p]
+                for p in self.on_court[side]
+            )
+            for side in range(2)
+        ]
+
+    def _add(
+        self, event_type, action, side, p1=0, p2=0, p3=0, made=-1, three=0, extra=0
+    ):
+        """
+        method to add an event at the current time with the current lineup
+        """
+        points = 0
+        if made == 1:
+            points = 1 if event_type == FREE_THROW else 2 + three
+            self.score[side] += points
+        self.events.append(
+            (
+                self.period,
+                self.elapsed,
+                event_type,
+                action,
+                side,
+                p1,
+                p2,
+                p3,
+                made,
+                three,
+                points,
+                extra,
+                len(self.lineups) - 1,
+            )
+        )
+
+    def _tick(self, seconds):
+        """
+        method to run the clock forward without going past the end of the
+        period
+        """
+        self.elapsed = min(self.elapsed + seconds, self.period_end)
+
+    def _pick(self, side, rating):
+        """
+        method to pick one of a side's players on the court weighted by one
+        of their ratings
+
+        Outputs:
+        spot - roster position of the player picked
+        """
+        weights = self.weights[side][rating]
+        return self.on_court[side][bisect(weights, self.rand.random() * weights[-1])]
+
+    def _player(self, side, spot):
+        """
+        method to return the player id of a side's roster position
+        """
+        return self.teams[side]["ids"][spot]
+
+    def _other(self, side, spot):
+        """
+        method to pick a random player on the court for side other than spot
+        """
+        return self.rand.choice([p for p in self.on_court[side] if p != spot])
+
+    def _set_lineup(self, side, lineup):
+        """
+        method to change a side's players on the court without substitution
+        events, which is how nba_scraper shows lineups changing between
+        periods
+        """
+        for spot in self.on_court[side]:
+            self.played[side][spot] += self.elapsed - self.entered[side][spot]
+        self.on_court[side] = list(lineup)
+        for spot in lineup:
+            self.entered[side][spot] = self.elapsed
+
+    def _substitutions(self, sides=(0, 1)):
+        """
+        method to make the substitutions of both teams at a dead ball. A
+        player comes out once his stint runs long or he gets in foul trouble
+        and is replaced by the bench player furthest behind his target
+        minutes
+        """
+        game_share = self.elapsed / 2880
+        for side in sides:
+            if self.elapsed < self.sub_due[side]:
+                continue
+            team = self.teams[side]
+            for spot in list(self.on_court[side]):
+                stint = self.elapsed - self.entered[side][spot]
+                in_trouble = self._foul_trouble(side, spot)
+                if stint < team["stint"][spot] and not in_trouble:
+                    continue
+
+                bench = [
+                    p
+                    for p in range(13)
+                    if p not in self.on_court[side] and not self._foul_trouble(side, p)
+                ]
+                if not bench:
+                    continue
+                behind = [
+                    team["minutes"][p] * 60 * game_share - self.played[side][p]
+                    for p in bench
+                ]
+                best = max(range(len(bench)), key=behind.__getitem__)
+                if behind[best] <= 0 and not in_trouble:
+                    continue
+
+                incoming = bench[best]
+                self.played[side][spot] += stint
+                self.entered[side][incoming] = self.elapsed
+                self.on_court[side][self.on_court[side].index(spot)] = incoming
+                self._new_lineup()
+                self._add(
+                    SUBSTITUTION,
+                    0,
+                    side,
+                    self._player(side, spot),
+                    self._player(side, incoming),
+                )
+
+    def _dead_ball(self):
+        """
+        method to give either team a chance to call a timeout and make their
+        substitutions while the ball is dead
+        """
+        if self.rand.random() < TIMEOUT_RATE:
+            side = self.rand.randrange(2)
+            self._add(TIMEOUT, 1, side, self.teams[side]["team_id"])
+        self._substitutions()
+
+    def _foul_trouble(self, side, spot):
+        """
+        method to check if a player has more fouls than coaches usually let
+        a player have on the court, one in the first period, two in the
+        second, three in the third and four after that. A player with six
+        fouls has fouled out
+        """
+        return self.fouls[side][spot] > min(self.period, 4)
+
+    def _personal_foul(self, side, spot):
+        """
+        method to charge a player with a foul and have him subbed out at the
+        next dead ball once he is in foul trouble
+        """
+        self.fouls[side][spot] += 1
+        if self._foul_trouble(side, spot):
+            self.sub_due[side] = 0
+
+    def _foul(self, side, action, fouled_side, fouled):
+        """
+        method to add a foul by a random player of side on the fouled player
+        """
+        fouler = self._pick(side, "fouling")
+        self._personal_foul(side, fouler)
+        if action != 4:
+            self.team_fouls[side] += 1
+        self._add(
+            FOUL,
+            action,
+            side,
+            self._player(side, fouler),
+            self._player(fouled_side, fouled),
+        )
+        if self.fouls[side][fouler] >= 6:
+            self._substitutions([side])
+
+    def _free_throws(self, side, shooter, attempts):
+        """
+        method to add a trip of free throws
+
+        Outputs:
+        side - the side with the ball after the free throws
+        """
+        team = self.teams[side]
+        made = 0
+        for attempt in range(1, attempts + 1):
+            made = int(self.rand.random() < team["ft"][shooter])
+            self._add(
+                FREE_THROW,
+                FREE_THROW_ACTIONS[(attempt, attempts)],
+                side,
+                self._player(side, shooter),
+                made=made,
+            )
+        if made:
+            self._dead_ball()
+            return 1 - side
+
+        return self._rebound(side, FREE_THROW_OFFENSIVE_REBOUND_RATE)
+
+    def _rebound(self, side, offensive_rate):
+        """
+        method to add the rebound of a missed shot or free throw by side
+
+        Outputs:
+        side - the side with the ball after the rebound
+        """
+        self._tick(self.rand.randint(0, 3))
+        if self.rand.random() >= offensive_rate:
+            side = 1 - side
+            kind = 2
+        else:
+            kind = 1
+        rebounder = self._pick(side, "rebounding")
+        self._add(REBOUND, 0, side, self._player(side, rebounder), extra=kind)
+
+        return side
+
+    def _turnover(self, side):
+        """
+        method to add a turnover by side, which is a steal, an offensive foul
+        or a dead ball turnover
+        """
+        other = 1 - side
+        ball_handler = self._pick(side, "usage")
+        roll = self.rand.random()
+        if roll < STEAL_RATE:
+            stealer = self._pick(other, "usage")
+            self._add(
+                TURNOVER,
+                1,
+                side,
+                self._player(side, ball_handler),
+                self._player(other, stealer),
+            )
+            return other
+
+        if roll < STEAL_RATE + OFFENSIVE_FOUL_RATE:
+            defender = self.rand.choice(self.on_court[other])
+            self._personal_foul(side, ball_handler)
+            self._add(
+                FOUL,
+                4,
+                side,
+                self._player(side, ball_handler),
+                self._player(other, defender),
+            )
+            action = 37
+        else:
+            action = self.rand.choice([4, 45])
+        self._add(TURNOVER, action, side, self._player(side, ball_handler))
+        self._dead_ball()
+
+        return other
+
+    def _shot(self, side, putback):
+        """
+        method to add a field goal attempt by side along with any foul, free
+        throws and rebound that follow it
+
+        Outputs:
+        side - the side with the ball after the shot
+        """
+        team = self.teams[side]
+        other = 1 - side
+        shooter = self._pick(side, "usage")
+        three = int(not putback and self.rand.random() < team["three_rate"][shooter])
+        percentage = team["fg3"][shooter] if three else team["fg2"][shooter]
+        fouled = self.rand.random() < SHOOTING_FOUL_RATE[bool(three)]
+        if fouled:
+            made = int(self.rand.random() < AND_ONE_RATE)
+        else:
+            made = int(self.rand.random() < percentage - self.defense[other])
+        if three:
+            action = 1
+        else:
+            action = self.rand.choice([1, 1, 5, 5, 7] if putback else [1, 1, 1, 5, 7])
+
+        if fouled and not made:
+            self._foul(other, 2, side, shooter)
+            return self._free_throws(side, shooter, 3 if three else 2)
+
+        if made:
+            assist = 0
+            if self.rand.random() < ASSIST_RATE:
+                assist = self._player(side, self._other(side, shooter))
+            self._add(
+                SHOT,
+                action,
+                side,
+                self._player(side, shooter),
+                assist,
+                made=1,
+                three=three,
+                extra=int(putback),
+            )
+            if fouled:
+                self._foul(other, 2, side, shooter)
+                return self._free_throws(side, shooter, 1)
+            return other
+
+        blocker = 0
+        if not three and self.rand.random() < BLOCK_RATE:
+            blocker = self._player(other, self._pick(other, "rebounding"))
+        self._add(
+            MISS,
+            action,
+            side,
+            self._player(side, shooter),
+            p3=blocker,
+            made=0,
+            three=three,
+            extra=int(putback),
+        )
+
+        return self._rebound(side, OFFENSIVE_REBOUND_RATE)
+
+    def _possession(self, side):
+        """
+        method to play out one possession by side. The possession keeps going
+        through offensive rebounds and non shooting fouls before the bonus
+
+        Outputs:
+        side - the side with the ball next
+        """
+        other = 1 - side
+        self._tick(int(self.rand.triangular(3, 24, 14)))
+        while self.elapsed < self.period_end:
+            roll = self.rand.random()
+            if roll < TURNOVER_RATE:
+                return self._turnover(side)
+
+            if roll < TURNOVER_RATE + NON_SHOOTING_FOUL_RATE:
+                fouled = self._pick(side, "usage")
+                self._foul(other, 1, side, fouled)
+                if self.team_fouls[other] >= BONUS_FOULS:
+                    return self._free_throws(side, fouled, 2)
+                self._dead_ball()
+                self._tick(self.rand.randint(2, 10))
+                continue
+
+            next_side = self._shot(side, putback=False)
+            while next_side == side and self.elapsed < self.period_end:
+                # offensive rebound
+                self._tick(self.rand.randint(0, 8))
+                next_side = self._shot(side, putback=True)
+            return next_side
+
+        return side
+
+    def play(self):
+        """
+        method to simulate the whole game including any overtime periods
+
+        Outputs:
+        events - numpy array of the game's events with the EVENT_FIELDS
+                 columns
+        """
+        side = 0
+        while self.period < 4 or self.score[0] == self.score[1]:
+            self.period += 1
+            length = 720 if self.period <= 4 else 300
+            self.period_end = self.elapsed + length
+            self.team_fouls = [0, 0]
+            if self.period in [1, 3] or self.period > 4:
+                for team_side in range(2):
+                    available = [p for p in range(13) if self.fouls[team_side][p] < 6]
+                    self._set_lineup(team_side, available[:5])
+            else:
+                for team_side in range(2):
+                    self._set_lineup(team_side, self.on_court[team_side])
+            self._new_lineup()
+
+            self._add(PERIOD_START, 0, -1)
+            if self.period == 1 or self.period > 4:
+                side = self.rand.randrange(2)
+                self._add(
+                    JUMP_BALL,
+                    0,
+                    0,
+                    self._player(0, self.on_court[0][4]),
+                    self._player(1, self.on_court[1][4]),
+                    self._player(side, self.rand.choice(self.on_court[side])),
+                    extra=side,
+                )
+            elif self.period in [2, 3]:
+                side = 1 - side
+
+            while self.elapsed < self.period_end:
+                side = self._possession(side)
+            self._add(PERIOD_END, 0, -1)
+
+        return np.array(self.events, dtype=np.int64)
+
+
+def _clock_string(seconds):
+    """
+    function to format seconds left in a period as nba_scraper's MM:SS
+    pctimestring
+    """
+    clock = np.array([f"{s // 60}:{s % 60:02d}" for s in range(721)], dtype=object)
+    return clock[seconds]
+
+
+def _descriptions(events, names):
+    """
+    function to write the play by play text of each event the way the NBA
+    writes it
+
+    Inputs:
+    events - dataframe of the events with the EVENT_FIELDS columns
+    names  - dict of player id to last name
+
+    Outputs:
+    main   - list of the description of the event team's event
+    other  - list of the description of the steal or block by the other team
+             on the same event, or None
+    """
+    main, other = [], []
+    rows = zip(
+        events["eventmsgtype"].tolist(),
+        events["eventmsgactiontype"].tolist(),
+        events["player1_id"].tolist(),
+        events["player2_id"].tolist(),
+        events["player3_id"].tolist(),
+        events["shot_made"].tolist(),
+        events["is_three"].tolist(),
+        events["distance"].tolist(),
+    )
+    for event_type, action, p1, p2, p3, made, three, distance in rows:
+        text, other_text = None, None
+        if event_type in [SHOT, MISS]:
+            shot = f"{distance}' {'3PT ' if three else ''}{SHOT_TYPES[action]}"
+            text = f"{names[p1]} {shot}"
+            if event_type == MISS:
+                text = f"MISS {text}"
+                if p3:
+                    other_text = f"{names[p3]} BLOCK"
+            elif p2:
+                text = f"{text} ({names[p2]} AST)"
+        elif event_type == FREE_THROW:
+            attempt, attempts = FREE_THROW_ATTEMPTS[action]
+            text = f"{names[p1]} Free Throw {attempt} of {attempts}"
+            if not made:
+                text = f"MISS {text}"
+        elif event_type == REBOUND:
+            text = f"{names[p1]} REBOUND"
+        elif event_type == TURNOVER:
+            text = f"{names[p1]} {TURNOVER_TYPES[action]} Turnover"
+            if p2:
+                other_text = f"{names[p2]} STEAL"
+        elif event_type == FOUL:
+            text = f"{names[p1]} {FOUL_CODES[action]}"
+        elif event_type == SUBSTITUTION:
+            text = f"SUB: {names[p2]} FOR {names[p1]}"
+        elif event_type == TIMEOUT:
+            text = "Timeout: Regular"
+        elif event_type == JUMP_BALL:
+            text = f"Jump Ball {names[p1]} vs. {names[p2]}: Tip to {names[p3]}"
+        main.append(text)
+        other.append(other_text)
+
+    return main, other
+
+
+def _play_by_play(events, lineups, schedule, rosters, players, rng):
+    """
+    function to expand the simulated events of every game into nba_scraper's
+    play by play schema
+
+    Inputs:
+    events   - dataframe of the events of every game with the EVENT_FIELDS
+               columns plus game, the game's row in schedule
+    lineups  - numpy array of the ten player ids on the court for each event
+    schedule - dataframe of each game's game_id, teams, and game_date
+    rosters  - list of team rosters from _rosters
+    players  - dataframe of every player's id and name
+    rng      - numpy random Generator
+
+    Outputs:
+    pbp_df   - play by play dataframe with the COLUMNS columns
+    """
+    teams = pd.DataFrame(TEAMS, columns=["team_id", "abbrev", "city", "nickname"])
+    game = events["game"].to_numpy()
+    side = events["side"].to_numpy()
+    event_type = events["eventmsgtype"].to_numpy()
+    is_shot = np.isin(event_type, [SHOT, MISS])
+    names = dict(zip(players["player_id"], players["player_name"]))
+    last_names = {
+        player_id: team["last"][spot]
+        for team in rosters
+        for spot, player_id in enumerate(team["ids"])
+    }
+    last_names[0] = None
+
+    # team index into TEAMS of each side of each event
+    home = schedule["home"].to_numpy()[game]
+    away = schedule["away"].to_numpy()[game]
+
+    def side_team(sides):
+        team = np.where(sides == 0, home, away)
+        return np.where(sides >= 0, team, -1)
+
+    pbp = {"game_id": schedule["game_id"].to_numpy()[game]}
+    pbp["eventnum"] = events.groupby("game").cumcount().to_numpy() + 1
+    pbp["eventmsgtype"] = event_type
+    pbp["eventmsgactiontype"] = events["eventmsgactiontype"].to_numpy()
+    pbp["period"] = events["period"].to_numpy()
+    pbp["wctimestring"] = None
+
+    elapsed = events["seconds_elapsed"].to_numpy()
+    period_end = np.where(pbp["period"] <= 4, pbp["period"] * 720, 0)
+    period_end = np.where(
+        pbp["period"] > 4, 2880 + (pbp["period"] - 4) * 300, period_end
+    )
+    pbp["pctimestring"] = _clock_string(period_end - elapsed)
+
+    events["distance"] = np.where(
+        events["is_three"] == 1,
+        rng.integers(23, 29, len(events)),
+        np.where(
+            events["eventmsgactiontype"] == 1,
+            rng.integers(5, 22, len(events)),
+            rng.integers(0, 4, len(events)),
+        ),
+    )
+    main, other = _descriptions(events, last_names)
+    main, other = np.array(main, dtype=object), np.array(other, dtype=object)
+    pbp["homedescription"] = np.where(side == 1, other, main)
+    pbp["neutraldescription"] = np.nan
+    pbp["visitordescription"] = np.where(side == 1, main, other)
+    pbp["homedescription"][side == -1] = None
+    pbp["visitordescription"][side == -1] = None
+
+    points = events["points_made"].to_numpy()
+    home_score = pd.Series(np.where(side == 0, points, 0)).groupby(game).cumsum()
+    away_score = pd.Series(np.where(side == 1, points, 0)).groupby(game).cumsum()
+    scored = np.flatnonzero((points > 0) | (event_type == PERIOD_END))
+    scores = list(zip(away_score.to_numpy()[scored], home_score.to_numpy()[scored]))
+    pbp["score"] = np.full(len(events), None)
+    pbp["score"][scored] = [f"{away} - {home}" for away, home in scores]
+    pbp["scoremargin"] = np.full(len(events), None)
+    pbp["scoremargin"][scored] = [
+        str(home - away) if home != away else "TIE" for away, home in scores
+    ]
+
+    # the side of the team of player2 and player3, which are the other team
+    # for fouls, steals, blocks and the second player of a jump ball
+    player2_side = np.where(
+        np.isin(event_type, [FOUL, TURNOVER, JUMP_BALL]) & (side >= 0), 1 - side, side
+    )
+    player3_side = np.where(
+        event_type == JUMP_BALL, events["extra"].to_numpy(), 1 - side
+    )
+    for i, player_side in [(1, side), (2, player2_side), (3, player3_side)]:
+        player_id = events[f"player{i}_id"].to_numpy()
+        is_player = (player_id != 0) & (event_type != TIMEOUT)
+        team = np.where(is_player, side_team(player_side), -1)
+        # 4 and 5 are home and away players, 2 and 3 home and away teams
+        pbp[f"person{i}type"] = np.where(
+            is_player, 4 + player_side, np.where(player_id != 0, 2 + player_side, 0)
+        )
+        pbp[f"player{i}_id"] = player_id
+        pbp[f"player{i}_name"] = pd.Series(player_id).map(names).to_numpy()
+        pbp[f"player{i}_team_id"] = np.where(
+            team >= 0, teams["team_id"].to_numpy()[team], np.nan
+        )
+        for col in ["city", "nickname", "abbrev"]:
+            pbp[f"player{i}_team_{col}"] = np.where(
+                team >= 0, teams[col].to_numpy()[team], None
+            )
+        pbp[f"player{i}_team_abbreviation"] = pbp.pop(f"player{i}_team_abbrev")
+    pbp["person1type"] = pbp["person1type"].astype(float)
+
+    pbp["video_available_flag"] = np.ones(len(events), dtype=int)
+    pbp["home_team_abbrev"] = teams["abbrev"].to_numpy()[home]
+    pbp["away_team_abbrev"] = teams["abbrev"].to_numpy()[away]
+    pbp["home_team_id"] = teams["team_id"].to_numpy()[home]
+    pbp["away_team_id"] = teams["team_id"].to_numpy()[away]
+    pbp["game_date"] = schedule["game_date"].to_numpy()[game]
+    pbp["season"] = schedule["season"].to_numpy()[game]
+    event_team = side_team(side)
+    pbp["event_team"] = np.where(
+        event_team >= 0, teams["abbrev"].to_numpy()[event_team], None
+    )
+    pbp["event_type_de"] = pd.Series(event_type).map(EVENT_TYPE_DE).to_numpy()
+    pbp["shot_type_de"] = np.nan
+    made = events["shot_made"].to_numpy()
+    pbp["shot_made"] = np.where(made >= 0, made, np.nan)
+    pbp["is_block"] = (event_type == MISS) & (events["player3_id"].to_numpy() != 0)
+    pbp["is_block"] = pbp["is_block"].astype(int)
+    pbp["shot_type"] = np.where(
+        is_shot,
+        pd.Series(pbp["eventmsgactiontype"]).map(SHOT_TYPES).to_numpy(),
+        None,
+    )
+    pbp["seconds_elapsed"] = elapsed
+    pbp["event_length"] = pd.Series(elapsed).groupby(game).diff().to_numpy()
+    pbp["is_three"] = events["is_three"].to_numpy()
+    pbp["points_made"] = points
+    rebound_type = np.where(event_type == REBOUND, events["extra"].to_numpy(), 0)
+    pbp["is_o_rebound"] = (rebound_type == 1).astype(int)
+    pbp["is_d_rebound"] = (rebound_type == 2).astype(int)
+    pbp["is_turnover"] = (event_type == TURNOVER).astype(int)
+    pbp["is_steal"] = pbp["is_turnover"] & (events["player2_id"].to_numpy() != 0)
+    pbp["foul_type"] = np.where(
+        event_type == FOUL,
+        pd.Series(pbp["eventmsgactiontype"]).map(FOUL_TYPES).to_numpy(),
+        None,
+    )
+    pbp["is_putback"] = (is_shot & (events["extra"].to_numpy() == 1)).astype(int)
+
+    for i, col in enumerate(LINEUP_FIELDS):
+        pbp[col] = lineups[:, i]
+        pbp[col[: -len("_id")]] = pd.Series(lineups[:, i]).map(names).to_numpy()
+
+    return pd.DataFrame({col: pbp[col] for col in COLUMNS})
+
+
+def _schedule(rng, n_games, season):
+    """
+    function to schedule n_games between the thirty teams. Games are played
+    in days of fifteen games in which every team plays once, two days apart
+    starting in late October
+    """
+    days = -(-n_games // 15)
+    matchups = np.concatenate([rng.permutation(len(TEAMS)) for _ in range(days)])
+    matchups = matchups[: 2 * n_games].reshape(-1, 2)
+    start = date(season - 1, 10, 22)
+
+    return pd.DataFrame(
+        {
+            "game_id": [
+                int(f"2{(season - 1) % 100:02d}{game:05d}")
+                for game in range(1, n_games + 1)
+            ],
+            "home": matchups[:, 0],
+            "away": matchups[:, 1],
+            "game_date": [
+                str(start + timedelta(days=2 * (game // 15))) for game in range(n_games)
+            ],
+            "season": season,
+        }
+    )
+
+
+def generate_season(n_games=1230, season=2020, seed=0):
+    """
+    function to generate play by play for n_games synthetic games in the
+    schema nba_scraper outputs. Games are simulated possession by possession
+    between thirty teams of thirteen players with shooting, turnover,
+    rebounding, and foul rates near a modern NBA season's. Lineups change
+    through substitution events at dead balls and the players' ratings, so
+    RAPM regressions have real player effects to find. The same seed and
+    season always produce the same games, and every season generated with
+    one seed has the same players so they can be concatenated into several
+    seasons of one league
+
+    Inputs:
+    n_games  - number of games to generate, a full season is 1230
+    season   - season of the games, used in the game ids and dates the same
+               way the NBA does
+    seed     - seed of the random number generators
+
+    Outputs:
+    pbp_df   - play by play dataframe of every game ready to pass to SeasonPbP,
+               or to PbP one game_id at a time
+    """
+    rosters, players = _rosters(np.random.default_rng(seed))
+    rng = np.random.default_rng([seed, season])
+    rand = random.Random(f"{seed}-{season}")
+    schedule = _schedule(rng, n_games, season)
+
+    game_events, game_lineups = [], []
+    for game, (home, away) in enumerate(zip(schedule["home"], schedule["away"])):
+        simulator = _GameSimulator(rand, rosters[home], rosters[away])
+        events = simulator.play()
+        lineups = np.array(simulator.lineups, dtype=np.int64)
+        game_events.append(np.column_stack([np.full(len(events), game), events]))
+        game_lineups.append(lineups[events[:, -1]])
+
+    events = pd.DataFrame(np.concatenate(game_events), columns=["game"] + EVENT_FIELDS)
+
+    return _play_by_play(
+        events, np.concatenate(game_lineups), schedule, rosters, players, rng
+    )
@@ -1,6 +1,28 @@
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import RidgeCV
+from . import instrument
+from .rapm import RidgePathCV
+
+
+# counting stats summed for each team by team_advanced_stats and the stats of
+# the other team in each game summed into the _opponent columns
+TEAM_STATS = [
+    "fgm",
+    "tpm",
+    "fga",
+    "points_for",
+    "points_against",
+    "plus_minus",
+    "tpa",
+    "fta",
+    "tov",
+    "dreb",
+    "oreb",
+    "ftm",
+    "ast",
+    "blk",
+]
+OPPONENT_STATS = ["dreb", "oreb", "fgm", "fga", "tpm", "tpa", "fta", "ftm", "tov"]
 
 
 class TeamTotals:
@@ -9,54 +31,154 @@ class TeamTotals:
     dataframes. The dataframes have to be created by PbP.teambygamestats()
     or else the methods won't work. I've grouped these stat calculations in a
     seperate class because they work best with larger sample sizes
+
+    Totals are kept as running sums of each team's own and opponent stats so
+    games can be added with add_game or taken out with remove_game without
+    regrouping every game already in the totals. The rows of each game are
+    kept apart and only concatenated when tbg is read, so adding a game
+    doesn't copy the rest of the season either
     """
 
-    def __init__(self, tbg_list):
-        self.tbg = pd.concat(tbg_list)
+    def __init__(self, tbg_list=()):
+        tbg_list = list(tbg_list)
+        self.tbg = pd.concat(tbg_list) if tbg_list else pd.DataFrame()
 
-    def team_advanced_stats(self):
+    @property
+    def tbg(self):
+        """
+        every team by game row added as one dataframe in the order the games
+        were added, including the rows of games still waiting on the other
+        team's row. Setting it rebuilds the totals from the new rows
+        """
+        if self._tbg is None:
+            self._tbg = (
+                pd.concat(list(self._games.values())) if self._games else pd.DataFrame()
+            )
+        return self._tbg
 
-        teams_df = self.tbg.merge(self.tbg, on="game_id", suffixes=["", "_opponent"])
-        teams_df = teams_df[teams_df.team_id != teams_df.team_id_opponent]
-        team_advanced_stats = (
-            teams_df.groupby(["team_id", "team_abbrev"])[
-                [
-                    "fgm",
-                    "tpm",
-                    "fga",
-                    "points_for",
-                    "points_against",
-                    "plus_minus",
-                    "tpa",
-                    "fta",
-                    "tov",
-                    "dreb",
-                    "oreb",
-                    "ftm",
-                    "ast",
-                    "blk",
-                    "dreb_opponent",
-                    "oreb_opponent",
-                    "fgm_opponent",
-                    "fga_opponent",
-                    "tpm_opponent",
-                    "tpa_opponent",
-                    "fta_opponent",
-                    "ftm_opponent",
-                    "tov_opponent",
-                    "possessions",
-                    "possessions_opponent",
-                ]
-            ]
-            .sum()
-            .reset_index()
+    @tbg.setter
+    def tbg(self, tbg_df):
+        # the teambygamestats rows of each game keyed by game_id, and all of
+        # them concatenated the last time tbg was read
+        self._games = {}
+        self._tbg = None
+        self._totals = pd.DataFrame(
+            columns=self._total_columns(),
+            index=pd.MultiIndex.from_arrays([[], []], names=["team_id", "team_abbrev"]),
+            dtype=float,
         )
-        gp_df = (
-            self.tbg.groupby(["team_id"])["game_id"]
-            .count()
-            .reset_index()
-            .rename(columns={"game_id": "gp"})
+        self._gp = pd.Series(dtype=float)
+        self._seasons = {}
+
+        if tbg_df.shape[0] > 0:
+            self.add_game(tbg_df)
+
+    @staticmethod
+    def _total_columns():
+        """
+        function to return the columns of the running totals in the order
+        team_advanced_stats returns them
+        """
+        return (
+            TEAM_STATS
+            + [f"{stat}_opponent" for stat in OPPONENT_STATS]
+            + ["possessions", "possessions_opponent"]
         )
+
+    @staticmethod
+    def _game_totals(tbg_df):
+        """
+        function to sum the own and opponent stats of each team in the
+        teambygamestats rows of any number of games. The opponent stats of
+        each row are the other row of its game, which is the game's total
+        minus the row's own stats, so every game has to have both teams' rows
+        """
+        opponent_cols = OPPONENT_STATS + ["possessions"]
+        game_sums = tbg_df.groupby("game_id")[opponent_cols].transform("sum")
+
+        totals_df = tbg_df[["team_id", "team_abbrev"] + TEAM_STATS + ["possessions"]]
+        totals_df = totals_df.assign(
+            **{
+                f"{stat}_opponent": (game_sums[stat] - tbg_df[stat]).to_numpy()
+                for stat in opponent_cols
+            }
+        )
+
+        return totals_df.groupby(["team_id", "team_abbrev"])[
+            TeamTotals._total_columns()
+        ].sum()
+
+    def _fold(self, tbg_df, sign):
+        """
+        method to add the stats of teambygamestats rows to the running
+        totals, or subtract them with a sign of -1. Only the games with both
+        teams' rows are counted in the stats, games played, and seasons
+
+        Inputs:
+        tbg_df - dataframe from PbP.teambygamestats()
+        sign   - 1 to add the rows, -1 to subtract them
+        """
+        game_rows = tbg_df.groupby("game_id")["team_id"].transform("size")
+        tbg_df = tbg_df[(game_rows == 2).to_numpy()]
+
+        self._totals = self._totals.add(sign * self._game_totals(tbg_df), fill_value=0)
+        self._gp = self._gp.add(sign * tbg_df["team_id"].value_counts(), fill_value=0)
+        if sign < 0:
+            self._gp = self._gp[self._gp > 0]
+            self._totals = self._totals[
+                self._totals.index.get_level_values("team_id").isin(self._gp.index)
+            ]
+        for season, rows in tbg_df["season"].value_counts().items():
+            self._seasons[season] = self._seasons.get(season, 0) + sign * rows
+            if self._seasons[season] == 0:
+                del self._seasons[season]
+
+    def add_game(self, tbg_df):
+        """
+        method to add the team stats of one or more games to the running
+        totals. Adding a team's row of a game that is already in the totals
+        replaces that row, so the two rows of a game can be added one at a
+        time. A game is only counted once both of its rows are added
+
+        Inputs:
+        tbg_df - dataframe from PbP.teambygamestats()
+        """
+        replaced, added = [], []
+        for game_id, game_df in tbg_df.groupby("game_id", sort=False):
+            if game_id in self._games:
+                old_df = self._games.pop(game_id)
+                replaced.append(old_df)
+                game_df = pd.concat(
+                    [old_df[~old_df["team_id"].isin(game_df["team_id"])], game_df]
+                )
+            self._games[game_id] = game_df
+            added.append(game_df)
+        if replaced:
+            self._fold(pd.concat(replaced), -1)
+            self._fold(pd.concat(added), 1)
+        else:
+            self._fold(tbg_df, 1)
+        self._tbg = None
+
+    def remove_game(self, game_id):
+        """
+        method to take the team stats of a game back out of the running
+        totals
+
+        Inputs:
+        game_id - game_id of a game added with add_game
+        """
+        self._fold(self._games.pop(game_id), -1)
+        self._tbg = None
+
+    def team_advanced_stats(self):
+        """
+        method to calculate each team's totals and advanced stats from the
+        running totals of every game added so far
+        """
+        # the running sums are floats since new teams are aligned in as NaN
+        team_advanced_stats = self._totals.sort_index().astype(int).reset_index()
+        gp_df = self._gp.astype(int).rename_axis("team_id").rename("gp").reset_index()
         team_advanced_stats = team_advanced_stats.merge(gp_df, on="team_id")
         team_advanced_stats["efg_percentage"] = (
             team_advanced_stats["fgm"] + (0.5 * team_advanced_stats["tpm"])
@@ -97,8 +219,8 @@ class TeamTotals:
             / team_advanced_stats["possessions"]
             * 100
         )
-        team_advanced_stats["min_season"] = self.tbg["season"].min()
-        team_advanced_stats["max_season"] = self.tbg["season"].max()
+        team_advanced_stats["min_season"] = min(self._seasons, default=np.nan)
+        team_advanced_stats["max_season"] = max(self._seasons, default=np.nan)
 
         return team_advanced_stats
 
@@ -120,40 +242,47 @@ class TeamTotals:
 
         return rowout
 
-    def _rapm_matrix_creation(self):
+    @instrument.stage
+    def _rapm_matrix_creation(self, tbg):
         """
         function to create train_x and train_y matrices for input into a Ridge
         regression
+
+        Inputs:
+        tbg - dataframe of the team by game rows in the regression
         """
-        self.tbg["points_per_100_poss"] = (
-            self.tbg["points_for"] / self.tbg["possessions"]
-        ) * 100
+        points_per_100_poss = (tbg["points_for"] / tbg["possessions"]) * 100
 
-        teams = list(self.tbg["team_id"].unique())
+        teams = list(tbg["team_id"].unique())
         teams.sort()
 
-        train_x = self.tbg[["team_id", "opponent", "is_home"]].to_numpy()
+        train_x = tbg[["team_id", "opponent", "is_home"]].to_numpy()
         train_x = np.apply_along_axis(TeamTotals.rapm_matrix_map, 1, train_x, teams)
-        train_y = self.tbg[["points_per_100_poss"]].to_numpy()
+        train_y = points_per_100_poss.to_numpy().reshape(-1, 1)
 
         return train_x, train_y
 
-    def team_rapm_results(self):
+    @instrument.stage
+    def team_rapm_results(self, lambdas_rapm=None):
         """
         function will return RAPM regression results based on the the teambygamestats()
-        results passed to the TeamTotals object when instantiated
+        results passed to the TeamTotals object when instantiated. lambdas_rapm
+        is the list of lambdas to cross validate over and defaults to
+        [0.01, 0.05, 0.1]
         """
 
         def lambda_to_alpha(lambda_value, samples):
             return (lambda_value * samples) / 2.0
 
-        train_x, train_y = self._rapm_matrix_creation()
-        possessions = self.tbg["possessions"]
-        teams = list(self.tbg["team_id"].unique())
+        tbg = self.tbg
+        train_x, train_y = self._rapm_matrix_creation(tbg)
+        possessions = tbg["possessions"]
+        teams = list(tbg["team_id"].unique())
         teams.sort()
-        lambdas_rapm = [0.01, 0.05, 0.1]
+        if lambdas_rapm is None:
+            lambdas_rapm = [0.01, 0.05, 0.1]
         alphas = [lambda_to_alpha(l, train_x.shape[0]) for l in lambdas_rapm]
-        clf = RidgeCV(alphas=alphas, cv=5, fit_intercept=True, normalize=False)
+        clf = RidgePathCV(alphas=alphas, cv=5, fit_intercept=True)
         model = clf.fit(train_x, train_y, sample_weight=possessions)
         team_arr = np.transpose(np.array(teams).reshape(1, len(teams)))
 
@@ -183,12 +312,12 @@ class TeamTotals:
         teams_coef[f"{name}_intercept"] = intercept[0]
 
         results_df = teams_coef.merge(
-            self.tbg[["team_id", "team_abbrev"]].drop_duplicates(), on="team_id"
+            tbg[["team_id", "team_abbrev"]].drop_duplicates(), on="team_id"
         )
 
         results_df["team_id"] = results_df["team_id"].astype(int)
-        results_df["min_season"] = self.tbg["season"].min()
-        results_df["max_season"] = self.tbg["season"].max()
+        results_df["min_season"] = tbg["season"].min()
+        results_df["max_season"] = tbg["season"].max()
         results_df = np.round(results_df, decimals=2)
 
         return results_df
@@ -1,7 +1,13 @@
 import pytest
+import numpy as np
 import pandas as pd
 import nba_parser as npar
 
+# player RAPM columns compared between fits that solve the regression
+# differently, the ranks of players tied in the regression can swap
+RAPM_VALUE_COLUMNS = ["player_id", "rapm_off", "rapm_def", "rapm", "rapm_intercept"]
+RAPM_VALUE_COLUMNS += ["player_name", "min_season", "max_season"]
+
 
 @pytest.fixture(scope="session")
 def setup():
@@ -72,6 +78,70 @@ def test_player_advanced_stats(setup):
     )
 
 
+def test_player_totals_add_remove_game(setup):
+    """
+    test to make sure adding and removing games from the running totals
+    matches building the totals from scratch
+    """
+    pbg_list, _, _ = setup
+
+    all_games = npar.PlayerTotals(pbg_list).player_advanced_stats()
+    player_totals = npar.PlayerTotals(pbg_list[:-1])
+    player_totals.add_game(pbg_list[-1])
+
+    pd.testing.assert_frame_equal(player_totals.player_advanced_stats(), all_games)
+
+    player_totals.remove_game(pbg_list[-1]["game_id"].iloc[0])
+
+    pd.testing.assert_frame_equal(
+        player_totals.player_advanced_stats(),
+        npar.PlayerTotals(pbg_list[:-1]).player_advanced_stats(),
+    )
+    assert player_totals.pbg.shape[0] == sum(pbg.shape[0] for pbg in pbg_list[:-1])
+
+
+def test_player_totals_add_game_keeps_history(setup):
+    """
+    test to make sure adding a game leaves the rows of the games already in
+    the totals where they are instead of copying them, and replacing a game
+    moves it to the end of pbg
+    """
+    pbg_list, _, _ = setup
+
+    player_totals = npar.PlayerTotals(pbg_list[:-1])
+    games = dict(player_totals._games)
+    player_totals.add_game(pbg_list[-1])
+
+    assert all(player_totals._games[game_id] is games[game_id] for game_id in games)
+
+    player_totals.add_game(pbg_list[0])
+    pd.testing.assert_frame_equal(
+        player_totals.pbg, pd.concat(pbg_list[1:] + pbg_list[:1])
+    )
+    pd.testing.assert_frame_equal(
+        player_totals.player_advanced_stats(),
+        npar.PlayerTotals(pbg_list).player_advanced_stats(),
+    )
+
+
+def test_player_totals_empty(setup):
+    """
+    test to make sure an empty PlayerTotals has no stats and setting pbg
+    rebuilds the totals the same as passing the games in
+    """
+    pbg_list, _, _ = setup
+
+    player_totals = npar.PlayerTotals()
+    assert player_totals.player_advanced_stats().shape[0] == 0
+    assert player_totals.pbg.shape[0] == 0
+
+    player_totals.pbg = pd.concat(pbg_list)
+    pd.testing.assert_frame_equal(
+        player_totals.player_advanced_stats(),
+        npar.PlayerTotals(pbg_list).player_advanced_stats(),
+    )
+
+
 def test_team_advanced_stats(setup):
     """
     test to make sure the advanced stats are calculating properly
@@ -107,6 +177,100 @@ def test_team_advanced_stats(setup):
     )
 
 
+def test_team_totals_add_remove_game(setup):
+    """
+    test to make sure adding and removing games from the running team totals
+    matches building the totals from scratch
+    """
+    _, tbg_list, _ = setup
+
+    all_games = npar.TeamTotals(tbg_list).team_advanced_stats()
+    team_totals = npar.TeamTotals(tbg_list[:-1])
+    team_totals.add_game(tbg_list[-1])
+
+    pd.testing.assert_frame_equal(team_totals.team_advanced_stats(), all_games)
+
+    team_totals.remove_game(tbg_list[-1]["game_id"].iloc[0])
+
+    pd.testing.assert_frame_equal(
+        team_totals.team_advanced_stats(),
+        npar.TeamTotals(tbg_list[:-1]).team_advanced_stats(),
+    )
+    pd.testing.assert_frame_equal(team_totals.tbg, pd.concat(tbg_list[:-1]))
+
+
+def test_team_totals_add_game_keeps_history(setup):
+    """
+    test to make sure adding a game leaves the rows of the games already in
+    the totals where they are instead of copying them, and replacing a game
+    moves it to the end of tbg
+    """
+    _, tbg_list, _ = setup
+
+    team_totals = npar.TeamTotals(tbg_list[:-1])
+    games = dict(team_totals._games)
+    team_totals.add_game(tbg_list[-1])
+
+    assert all(team_totals._games[game_id] is games[game_id] for game_id in games)
+
+    team_totals.add_game(tbg_list[0])
+    pd.testing.assert_frame_equal(
+        team_totals.tbg, pd.concat(tbg_list[1:] + tbg_list[:1])
+    )
+    pd.testing.assert_frame_equal(
+        team_totals.team_advanced_stats(),
+        npar.TeamTotals(tbg_list).team_advanced_stats(),
+    )
+
+
+def test_team_totals_one_row_at_a_time(setup):
+    """
+    test to make sure the two rows of a game can be added one at a time and
+    a game with only one of its rows isn't counted in the stats, games
+    played, or seasons
+    """
+    _, tbg_list, _ = setup
+
+    without_last = npar.TeamTotals(tbg_list[:-1]).team_advanced_stats()
+    team_totals = npar.TeamTotals(tbg_list[:-1])
+    team_totals.add_game(tbg_list[-1].iloc[:1])
+
+    pd.testing.assert_frame_equal(team_totals.team_advanced_stats(), without_last)
+
+    team_totals.add_game(tbg_list[-1].iloc[1:])
+    pd.testing.assert_frame_equal(
+        team_totals.team_advanced_stats(),
+        npar.TeamTotals(tbg_list).team_advanced_stats(),
+    )
+
+    team_totals = npar.TeamTotals()
+    for tbg in tbg_list:
+        for row in range(tbg.shape[0]):
+            team_totals.add_game(tbg.iloc[[row]])
+    pd.testing.assert_frame_equal(
+        team_totals.team_advanced_stats(),
+        npar.TeamTotals(tbg_list).team_advanced_stats(),
+    )
+
+
+def test_team_totals_empty(setup):
+    """
+    test to make sure an empty TeamTotals has no stats and setting tbg
+    rebuilds the totals the same as passing the games in
+    """
+    _, tbg_list, _ = setup
+
+    team_totals = npar.TeamTotals()
+    assert team_totals.team_advanced_stats().shape[0] == 0
+    assert team_totals.tbg.shape[0] == 0
+
+    team_totals.tbg = pd.concat(tbg_list)
+    pd.testing.assert_frame_equal(
+        team_totals.team_advanced_stats(),
+        npar.TeamTotals(tbg_list).team_advanced_stats(),
+    )
+
+
 def test_team_rapm(setup):
     """
     test to make sure rapm code runs properly
@@ -130,3 +294,130 @@ def test_player_rapm(setup):
     player_rapm = npar.PlayerTotals.player_rapm_results(rapm_possession)
 
     print(player_rapm)
+
+
+def test_player_rapm_incremental(setup):
+    """
+    test to make sure adding games to PlayerRapm one at a time gives the same
+    RAPM as player_rapm_results on all of them with the same lambda
+    """
+    _, _, pbp_list = setup
+    possessions = [x.rapm_possessions() for x in pbp_list]
+
+    player_rapm = npar.PlayerRapm(lambda_rapm=0.05)
+    for game_possessions in possessions:
+        player_rapm.add_possessions(game_possessions)
+    results = player_rapm.player_rapm_results()
+
+    expected = npar.PlayerTotals.player_rapm_results(
+        pd.concat(possessions), lambdas_rapm=[0.05]
+    )
+
+    pd.testing.assert_frame_equal(
+        results[RAPM_VALUE_COLUMNS], expected[RAPM_VALUE_COLUMNS]
+    )
+
+
+def test_player_rapm_stints(setup):
+    """
+    test to make sure collapsing possessions into weighted stints keeps every
+    possession and gives the same RAPM as fitting each possession
+    """
+    _, _, pbp_list = setup
+    rapm_possession = pd.concat([x.rapm_possessions() for x in pbp_list])
+
+    expected = npar.PlayerTotals.player_rapm_results(
+        rapm_possession.copy(), lambdas_rapm=[0.05]
+    )
+    player_rapm = npar.PlayerTotals.player_rapm_results(
+        rapm_possession, lambdas_rapm=[0.05], collapse_stints=True
+    )
+
+    stints = npar.PlayerTotals._rapm_stints(rapm_possession)
+    assert stints.shape[0] < rapm_possession.shape[0]
+    assert stints["possessions"].sum() == rapm_possession.shape[0]
+    assert stints["points_made"].sum() == rapm_possession["points_made"].sum()
+
+    pd.testing.assert_frame_equal(player_rapm, expected)
+
+
+def test_player_rapm_matrix(setup):
+    """
+    test to make sure the sparse rapm matrix has five offensive and five
+    defensive players in every row
+    """
+    _, _, pbp_list = setup
+
+    rapm_shifts = pbp_list[0].rapm_possessions()
+    rapm_shifts["points_per_100_poss"] = rapm_shifts["points_made"] * 100
+    rapm_shifts["is_home"] = 0
+    players = npar.PlayerIndex(rapm_shifts)
+
+    train_x, train_y = npar.PlayerTotals._rapm_matrix_creation(rapm_shifts, players)
+
+    assert train_x.shape == (rapm_shifts.shape[0], 2 * len(players) + 1)
+    assert train_x.nnz == rapm_shifts.shape[0] * 10
+    assert (train_x[:, : len(players)].sum(axis=1) == 5).all()
+    assert (train_x[:, len(players) :].sum(axis=1) == -5).all()
+    assert train_y.shape == (rapm_shifts.shape[0], 1)
+
+
+def test_player_index(setup):
+    """
+    test to make sure players keep their position in the index as more
+    possessions are added and that reusing an index gives the same RAPM
+    """
+    _, _, pbp_list = setup
+    first_game = pbp_list[0].rapm_possessions()
+    second_game = pbp_list[1].rapm_possessions()
+
+    player_index = npar.PlayerIndex(first_game)
+    first_players = player_index.player_ids.copy()
+    second_players = player_index.add_players(second_game)
+
+    assert (player_index.player_ids[: len(first_players)] == first_players).all()
+    assert set(player_index.player_ids) == set(first_players) | set(second_players)
+    assert len(set(player_index.player_ids)) == len(player_index)
+    positions = player_index.positions(second_game["off_player_1_id"])
+    assert (player_index.player_ids[positions] == second_game["off_player_1_id"]).all()
+    assert (player_index.positions([0]) == -1).all()
+
+    # the second game is fit with first game players in the index that it
+    # doesn't have any possessions for
+    expected = npar.PlayerTotals.player_rapm_results(
+        second_game.copy(), lambdas_rapm=[0.05]
+    )
+    player_rapm = npar.PlayerTotals.player_rapm_results(
+        second_game, lambdas_rapm=[0.05], player_index=player_index
+    )
+
+    assert player_rapm["player_id"].dtype == np.int64
+    pd.testing.assert_frame_equal(
+        player_rapm[RAPM_VALUE_COLUMNS], expected[RAPM_VALUE_COLUMNS]
+    )
+
+
+def test_player_index_parquet(setup, tmp_path):
+    """
+    test to make sure a saved index loads back with every player in the same
+    position and keeps adding new players after them
+    """
+    pytest.importorskip("pyarrow")
+    _, _, pbp_list = setup
+    first_game = pbp_list[0].rapm_possessions()
+    second_game = pbp_list[1].rapm_possessions()
+
+    player_index = npar.PlayerIndex(first_game)
+    player_index.to_parquet(tmp_path / "player_index.parquet")
+    loaded = npar.PlayerIndex.read_parquet(tmp_path / "player_index.parquet")
+
+    pd.testing.assert_frame_equal(loaded.to_frame(), player_index.to_frame())
+    assert loaded.player_ids.dtype == np.int64
+
+    loaded.add_players(second_game)
+    player_index.add_players(second_game)
+    pd.testing.assert_frame_equal(loaded.to_frame(), player_index.to_frame())
+    assert (
+        loaded.positions(second_game["off_player_1_id"])
+        == player_index.positions(second_game["off_player_1_id"])
+    ).all()
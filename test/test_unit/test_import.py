@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+# prints the top level packages a fresh interpreter has loaded after running
+# the imports passed to it, leaving out aliases like __main__
+LOADED_PACKAGES = """
+import sys
+{imports}
+packages = {{name.split(".")[0] for name in sys.modules}}
+print(" ".join(sorted(name for name in packages if not name.startswith("__"))))
+"""
+# prints the seconds it takes to import nba_parser once pandas is loaded
+IMPORT_SECONDS = """
+import time
+import pandas
+start = time.perf_counter()
+import nba_parser
+print(time.perf_counter() - start)
+"""
+# every package importing nba_parser is allowed to load: numpy, pandas, and
+# the standard library modules nba_parser imports along with whatever those
+# load themselves. nba_parser.synthetic isn't imported by nba_parser so the
+# modules only it uses aren't allowed
+ALLOWED_IMPORTS = """
+import functools
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+import numpy
+import pandas
+"""
+# seconds importing nba_parser may take on top of pandas, it takes a few
+# hundredths of a second while loading sklearn up front takes around one
+IMPORT_SECONDS_BUDGET = 0.5
+
+
+def run_python(code):
+    """
+    function to run code in a fresh interpreter and return what it printed
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    return result.stdout
+
+
+def loaded_packages(imports):
+    """
+    function to import modules in a fresh interpreter and return the top
+    level packages it ended up loading
+    """
+    return set(run_python(LOADED_PACKAGES.format(imports=imports)).split())
+
+
+def test_import_budget():
+    """
+    test to make sure importing nba_parser only loads numpy, pandas, and the
+    standard library modules it uses and leaves the RAPM dependencies to be
+    loaded when a regression is run
+    """
+    allowed_packages = loaded_packages(ALLOWED_IMPORTS)
+    nba_parser_packages = loaded_packages("import nba_parser")
+
+    assert "scipy" not in nba_parser_packages
+    assert "sklearn" not in nba_parser_packages
+    assert nba_parser_packages - allowed_packages == {"nba_parser"}
+
+
+def test_import_time():
+    """
+    test to make sure importing nba_parser stays fast once pandas is loaded.
+    The fastest of three imports is used so a busy machine doesn't fail it
+    """
+    seconds = min(float(run_python(IMPORT_SECONDS)) for _ in range(3))
+
+    assert seconds < IMPORT_SECONDS_BUDGET
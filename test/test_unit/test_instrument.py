@@ -0,0 +1,89 @@
+import pandas as pd
+import pytest
+import nba_parser as npar
+from nba_parser import instrument
+
+
+@pytest.fixture(scope="session")
+def game_df():
+    """
+    function for test setup and teardown
+    """
+    yield pd.read_csv("test/21900002.csv")
+
+
+def test_no_hooks(game_df):
+    """
+    test to make sure stages stop recording once their hook is removed and
+    the hooks don't change the results
+    """
+    records = []
+    instrument.add_hook(records.append)
+    pbg_instrumented = npar.PbP(game_df).playerbygamestats()
+    instrument.remove_hook(records.append)
+    recorded = len(records)
+    pbg = npar.PbP(game_df).playerbygamestats()
+
+    assert instrument._hooks == []
+    assert recorded > 0
+    assert len(records) == recorded
+    pd.testing.assert_frame_equal(pbg, pbg_instrumented)
+
+
+def test_hook_records(game_df):
+    """
+    test to make sure every stage of a calculation is passed to the hooks
+    with its rows, and nested stages are reported before the stage calling
+    them
+    """
+    records = []
+    instrument.add_hook(records.append)
+    try:
+        pbp = npar.PbP(game_df)
+        pbg = pbp.playerbygamestats()
+        rapm_shifts = pbp.rapm_possessions()
+    finally:
+        instrument.remove_hook(records.append)
+
+    stages = [record["stage"] for record in records]
+    assert stages[0] == "PbP._possession_calc"
+    assert stages.index("PbP._player_stat_events") < stages.index(
+        "PbP.playerbygamestats"
+    )
+    assert stages[-1] == "PbP.rapm_possessions"
+    assert records[stages.index("PbP.playerbygamestats")]["rows"] == pbg.shape[0]
+    assert records[-1]["rows"] == rapm_shifts.shape[0]
+    assert all(record["seconds"] >= 0 for record in records)
+    assert all(record["peak_memory"] is None for record in records)
+
+
+def test_report_summary(game_df):
+    """
+    test to make sure Report aggregates the records of a batch run by stage
+    and traces the peak memory of nested stages
+    """
+    with instrument.Report() as report:
+        pbp = npar.PbP(game_df)
+        pbg = pbp.playerbygamestats()
+        tbg = pbp.teambygamestats()
+        npar.PlayerTotals.player_rapm_results(pbp.rapm_possessions())
+        npar.TeamTotals([tbg]).team_rapm_results()
+
+    summary = report.summary().set_index("stage")
+
+    assert instrument._hooks == []
+    assert summary["calls"].sum() == len(report.records)
+    assert summary.loc["PbP.playerbygamestats", "rows"] == pbg.shape[0]
+    for name in [
+        "PlayerTotals._rapm_matrix_creation",
+        "PlayerTotals.player_rapm_results",
+        "TeamTotals.team_rapm_results",
+        "RidgePathCV.fit",
+    ]:
+        assert summary.loc[name, "calls"] >= 1
+    assert (summary["peak_memory"] >= 0).all()
+    assert (
+        summary.loc["PbP.playerbygamestats", "peak_memory"]
+        >= summary.loc["PbP._player_stat_events", "peak_memory"]
+        > 0
+    )
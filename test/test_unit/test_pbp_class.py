@@ -1,4 +1,5 @@
 from nba_parser import PbP
+from nba_parser.store import typed_pbp
 import pandas as pd
 import pytest
 
@@ -35,6 +36,37 @@ def test_class_build(setup):
     assert pbp.season == 2008
 
 
+def test_compact_dtypes(setup):
+    """
+    test to make sure the play by play is converted to compact dtypes on load
+    without changing the dataframe that was passed in
+    """
+    pbp_df = pd.read_csv("test/21100736.csv")
+    pbp = PbP(pbp_df)
+
+    assert pbp.df["event_type_de"].dtype == "category"
+    assert pbp.df["home_player_1"].dtype == "category"
+    assert pbp.df["event_team"].dtype == pbp.df["home_team_abbrev"].dtype
+    assert pbp.df["home_player_1_id"].dtype == "int32"
+    assert pbp.df["is_three"].dtype == "bool"
+    assert pbp_df["event_type_de"].dtype == "O"
+    assert pbp_df["game_date"].dtype == "O"
+    assert pbp.df.memory_usage(deep=True).sum() < pbp_df.memory_usage(deep=True).sum()
+
+
+def test_event_mask(setup):
+    """
+    test to make sure the event type masks match the event_type_de column
+    """
+    pbp, _ = setup
+
+    shots = pbp.df["event_type_de"].isin(["shot", "missed_shot"]).to_numpy()
+
+    assert (pbp._event_mask("shot", "missed_shot") == shots).all()
+    assert (pbp._event_mask("foul") == (pbp.df["event_type_de"] == "foul")).all()
+    assert not pbp._event_mask("not-an-event").any()
+
+
 def test_point_calc_player(setup):
     """
     testing to make sure points, field goals attempted/made, three pointers
@@ -233,6 +265,30 @@ def test_plus_minus_calc_player(setup):
     assert stats_df.loc[stats_df["player_id"] == 2546, "plus_minus"].values[0] == 14
 
 
+def test_plus_minus_stacked_fouls(setup):
+    """
+    test to make sure free throws are only credited once when more than one
+    foul is called at the same time
+    """
+    pbp_df = pd.read_csv("test/21100736.csv")
+    # the foul before the game's first free throw
+    ft_row = pbp_df.index[pbp_df["event_type_de"] == "free-throw"][0]
+    foul_row = pbp_df.index[
+        (pbp_df["event_type_de"] == "foul") & (pbp_df.index < ft_row)
+    ][-1]
+    stacked_df = pd.concat(
+        [pbp_df.loc[:foul_row], pbp_df.loc[[foul_row]], pbp_df.loc[foul_row + 1 :]],
+        ignore_index=True,
+    )
+
+    keys = ["player_id", "team_id", "game_id"]
+    plus_minus = PbP(pbp_df)._plus_minus_calc_player().sort_values(keys)
+    stacked_plus_minus = PbP(stacked_df)._plus_minus_calc_player().sort_values(keys)
+
+    assert (plus_minus["plus"].values == stacked_plus_minus["plus"].values).all()
+    assert (plus_minus["minus"].values == stacked_plus_minus["minus"].values).all()
+
+
 def test_toc_calc_player(setup):
     """
     testing time on court calculations
@@ -248,6 +304,26 @@ def test_toc_calc_player(setup):
     assert toc.loc[toc["player_id"] == 947, "toc_string"].values[0] == "40:52"
 
 
+def test_on_court_long(setup):
+    """
+    testing the melted lineup table has one row per lineup slot per event
+    """
+
+    pbp, _ = setup
+
+    on_court = pbp._on_court_long()
+
+    assert on_court.shape[0] == pbp.df.shape[0] * 10
+    assert on_court["is_home"].sum() == pbp.df.shape[0] * 5
+    assert (
+        on_court.loc[on_court["is_home"], "team_id"].unique()[0] == pbp.home_team_id
+    )
+    assert on_court.loc[pbp.df.shape[0] * 5, "player_id"] == pbp.df.loc[
+        0, "away_player_1_id"
+    ]
+    assert pbp._on_court_long() is on_court
+
+
 def test_playerbygamestats(setup):
 
     pbp, _ = setup
@@ -326,6 +402,24 @@ def test_playerbygamestats(setup):
     assert pbg.loc[pbg["player_id"] == 1894, "is_home"].values[0] == 0
 
 
+def test_player_stat_events(setup):
+    """
+    test to make sure the stacked player stat table sums to the same totals as
+    the individual stat calculations
+    """
+    pbp, _ = setup
+
+    events = pbp._player_stat_events()
+    totals = events.groupby("stat")["value"].sum()
+    pbg = pbp.playerbygamestats()
+
+    assert totals["points"] == pbp._point_calc_player()["points"].sum()
+    assert totals["blk"] == pbp._block_calc_player()["blk"].sum()
+    assert totals["plus"] == pbp._plus_minus_calc_player()["plus"].sum()
+    assert pbg["points"].dtype == "int64"
+    assert not pbg.isna().any().any()
+
+
 def test_calc_poss_player(setup):
     """
     test to make sure possession calculation is working hard to test without
@@ -501,6 +595,27 @@ def test_teambygamestats(setup):
     assert tbg.loc[tbg["team_id"] == 1610612743, "opponent_abbrev"].values[0] == "LAC"
 
 
+def test_team_stat_totals(setup):
+    """
+    test to make sure the home and away team totals match the individual team
+    stat calculations and the opponent stats are the other team's
+    """
+    pbp, _ = setup
+
+    totals, stats = pbp._team_stat_totals()
+    points = pbp._point_calc_team().set_index("team_id")["points_for"]
+    tbg = pbp.teambygamestats().set_index("team_id")
+
+    assert totals.shape == (1, 2, len(stats))
+    assert totals[0, 0, stats.index("points_for")] == points[pbp.home_team_id]
+    assert totals[0, 1, stats.index("points_for")] == points[pbp.away_team_id]
+    assert (
+        tbg.loc[pbp.home_team_id, "points_against"]
+        == tbg.loc[pbp.away_team_id, "points_for"]
+    )
+    assert tbg.loc[pbp.home_team_id, "opponent"] == pbp.away_team_id
+
+
 def test_pbg_edge_case(setup):
     """
     test some edge cases where pbg calcs created two rows in the old playerbygamestats
@@ -512,3 +627,115 @@ def test_pbg_edge_case(setup):
     pbg = pbp.playerbygamestats()
 
     assert pbg.loc[pbg["player_id"] == 1882, "dreb"].values[0] == 4
+
+
+def test_rapm_possessions(setup):
+    """
+    test to make sure rapm possessions have the home lineup on offense for
+    home possessions and the home lineup on defense for away possessions
+    """
+    pbp, _ = setup
+    poss = pbp.rapm_possessions()
+
+    home_ids = set(
+        pbp.df[[f"home_player_{i}_id" for i in range(1, 6)]].to_numpy().ravel()
+    )
+    home_off = poss["off_player_1_id"].isin(home_ids)
+
+    assert poss.shape[0] == 223
+    assert not poss.loc[home_off, "def_player_1_id"].isin(home_ids).any()
+    assert list(poss.columns) == sorted(poss.columns)
+
+
+def test_selected_stats(setup):
+    """
+    test to make sure asking for only some of the player and team stats
+    returns just those stats with the same values as the full box scores and
+    that unknown stats are rejected
+    """
+    pbp, _ = setup
+    pbg = pbp.playerbygamestats()
+    tbg = pbp.teambygamestats()
+
+    lineup_pbg = pbp.playerbygamestats(stats=["toc", "plus_minus"])
+    assert "plus_minus" in lineup_pbg.columns
+    assert not {"plus", "minus", "fga", "possessions"} & set(lineup_pbg.columns)
+    pd.testing.assert_frame_equal(lineup_pbg, pbg[lineup_pbg.columns])
+
+    tbg_selected = pbp.teambygamestats(stats=["is_win", "fouls_drawn"])
+    assert not {"points_for", "points_against", "pf"} & set(tbg_selected.columns)
+    pd.testing.assert_frame_equal(tbg_selected, tbg[tbg_selected.columns])
+
+    with pytest.raises(ValueError):
+        pbp.playerbygamestats(stats=["toc", "shots_blocked"])
+
+
+def test_cached_results():
+    """
+    test to make sure repeated calls return the cached results, changing a
+    returned dataframe doesn't change the cache, and setting a new play by
+    play dataframe clears it
+    """
+    pbp_df = pd.read_csv("test/21100736.csv")
+    pbp = PbP(pbp_df)
+    pbg = pbp.playerbygamestats()
+    rapm_shifts = pbp.rapm_possessions()
+    cached = len(pbp._cache)
+
+    rapm_shifts["possessions"] = 1
+    pbg_points = pbg["points"].copy()
+    pbg.loc[:, "points"] = -1
+
+    assert "possessions" not in pbp.rapm_possessions().columns
+    pd.testing.assert_series_equal(pbp.playerbygamestats()["points"], pbg_points)
+    assert len(pbp._cache) == cached
+
+    pbp.df = pbp_df[pbp_df["period"] == 1]
+    assert pbp._cache == {}
+    assert pbp.playerbygamestats()["toc"].sum() < pbg["toc"].sum()
+
+
+def test_new_game_attributes():
+    """
+    test to make sure setting a new play by play dataframe or clearing the
+    cache after changing it in place updates the game's teams, season, and
+    date along with the cached results
+    """
+    pbp = PbP(pd.read_csv("test/20700233.csv"))
+    pbp_df = pd.read_csv("test/21100736.csv")
+    new_game = PbP(pbp_df)
+
+    pbp.df = pbp_df
+    for attribute in ["home_team", "away_team", "home_team_id", "away_team_id"]:
+        assert getattr(pbp, attribute) == getattr(new_game, attribute)
+    assert pbp.season == new_game.season
+    assert pbp.game_date == new_game.game_date
+    assert pbp.home_team != "DEN"
+
+    pbp.df["season"] = 2012
+    pbp.clear_cache()
+    assert pbp.season == 2012
+
+
+def test_cache_follows_df():
+    """
+    test to make sure changing the dataframe a PbP was built from doesn't
+    change its play by play, and replacing a column of pbp.df clears the
+    cache without calling clear_cache
+    """
+    # play by play that is already typed, like games loaded from the store,
+    # has no columns that need converting
+    pbp_df = typed_pbp(pd.read_csv("test/21100736.csv"))
+    pbp = PbP(pbp_df)
+    pbg = pbp.playerbygamestats()
+
+    # written into the arrays of pbp_df itself instead of replacing them
+    for col in ["event_length", "points_made", "home_player_1_id"]:
+        pbp_df[col].to_numpy()[:] = 0
+    assert (pbp.df["event_length"] > 0).any()
+    assert (pbp.df["points_made"] > 0).any()
+    pd.testing.assert_frame_equal(pbp.playerbygamestats(), pbg)
+
+    pbp.df["points_made"] = 0
+    assert pbp.playerbygamestats()["points"].sum() == 0
+    assert pbp.teambygamestats()["points_for"].sum() == 0
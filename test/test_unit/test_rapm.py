@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from nba_parser.rapm import IncrementalRidge, RidgePathCV
+
+
+def test_ridge_path_matches_closed_form():
+    """
+    test to make sure the eigendecomposition path solver gives the same
+    weighted ridge solution as solving the normal equations directly
+    """
+    rng = np.random.default_rng(0)
+    train_x = (rng.random((300, 20)) < 0.25).astype(float)
+    train_y = train_x[:, :3].sum(axis=1) + rng.normal(size=300)
+    weights = rng.integers(1, 4, 300).astype(float)
+    alpha = 5.0
+
+    model = RidgePathCV(alphas=[alpha], cv=5).fit(
+        sparse.csr_matrix(train_x), train_y.reshape(-1, 1), sample_weight=weights
+    )
+
+    # centered normal equations with the intercept left unpenalized
+    x_mean = weights @ train_x / weights.sum()
+    y_mean = weights @ train_y / weights.sum()
+    centered_x = train_x - x_mean
+    coef = np.linalg.solve(
+        centered_x.T @ (centered_x * weights[:, None]) + alpha * np.eye(20),
+        centered_x.T @ (weights * (train_y - y_mean)),
+    )
+
+    assert model.coef_.shape == (1, 20)
+    assert np.allclose(model.coef_[0], coef)
+    assert np.isclose(model.intercept_[0], y_mean - x_mean @ coef)
+
+
+def test_ridge_path_cv_errors():
+    """
+    test to make sure the gram matrix cross validation errors match refitting
+    on each fold
+    """
+    rng = np.random.default_rng(1)
+    train_x = rng.normal(size=(100, 5))
+    train_y = train_x @ np.arange(5) + rng.normal(size=100)
+    alphas = [0.1, 10.0, 1000.0]
+
+    model = RidgePathCV(alphas=alphas, cv=4).fit(train_x, train_y)
+
+    errors = np.zeros(len(alphas))
+    for rows in np.array_split(np.arange(100), 4):
+        train = np.setdiff1d(np.arange(100), rows)
+        for i, alpha in enumerate(alphas):
+            fold_model = RidgePathCV(alphas=[alpha], cv=2)._solve_path(
+                RidgePathCV._weighted_gram(
+                    train_x[train], train_y[train], np.ones(len(train))
+                )
+            )
+            predictions = train_x[rows] @ fold_model[0][:, 0] + fold_model[1][0]
+            errors[i] += ((train_y[rows] - predictions) ** 2).sum()
+
+    assert np.allclose(model.cv_errors_, errors)
+    assert model.alpha_ == 0.1
+
+
+def test_incremental_ridge():
+    """
+    test to make sure adding rows and features to the incremental ridge a
+    batch at a time gives the same solution as fitting every row at once
+    """
+    rng = np.random.default_rng(2)
+    train_x = (rng.random((400, 30)) < 0.2).astype(float)
+    train_y = train_x[:, :5].sum(axis=1) + rng.normal(size=400)
+    alpha = 3.0
+
+    model = IncrementalRidge()
+    for rows in np.array_split(np.arange(400), 4):
+        # each batch only has the features seen so far
+        features = np.flatnonzero(train_x[: rows[-1] + 1].any(axis=0))
+        model.add(
+            sparse.csr_matrix(train_x[np.ix_(rows, features)]),
+            train_y[rows],
+            columns=features,
+        ).solve(alpha)
+
+    batch = RidgePathCV(alphas=[alpha], cv=2).fit(train_x, train_y)
+
+    assert np.allclose(model.coef_, batch.coef_)
+    assert np.isclose(model.intercept_, batch.intercept_)
+
+    # warm starting from the solution needs no more iterations
+    model.solve(alpha)
+    assert model.n_iter_ == 0
+
+
+def test_incremental_ridge_convergence():
+    """
+    test to make sure solving before any rows are added raises and a solve
+    cut off by max_iter warns and isn't flagged as converged
+    """
+    with pytest.raises(ValueError):
+        IncrementalRidge().solve(1.0)
+
+    rng = np.random.default_rng(3)
+    train_x = rng.normal(size=(200, 20))
+    train_y = train_x @ np.arange(20) + rng.normal(size=200)
+
+    model = IncrementalRidge(max_iter=1).add(train_x, train_y)
+    with pytest.warns(RuntimeWarning):
+        model.solve(1.0)
+    assert not model.converged_
+    assert model.n_iter_ == 1
+
+    model.max_iter = None
+    model.solve(1.0)
+    assert model.converged_
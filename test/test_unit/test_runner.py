@@ -0,0 +1,40 @@
+import pandas as pd
+import nba_parser as npar
+
+
+def test_season_bygamestats():
+    """
+    test to make sure the process pool runner returns the same stats as
+    building each game's PbP object by hand
+    """
+    files = ["test/21900002.csv", "test/21900025.csv", "test/21900040.csv"]
+
+    pbg, tbg = npar.season_bygamestats(files, workers=2, chunksize=2)
+
+    games = [npar.PbP(pd.read_csv(f)) for f in files]
+    game_pbg = pd.concat([g.playerbygamestats() for g in games])
+    game_tbg = pd.concat([g.teambygamestats() for g in games])
+
+    keys = ["game_id", "player_id", "team_id"]
+    pd.testing.assert_frame_equal(
+        pbg.sort_values(keys).reset_index(drop=True),
+        game_pbg.sort_values(keys).reset_index(drop=True),
+    )
+    pd.testing.assert_frame_equal(
+        tbg.sort_values(["game_id", "team_id"]).reset_index(drop=True),
+        game_tbg.sort_values(["game_id", "team_id"]).reset_index(drop=True),
+    )
+    assert npar.PlayerTotals([pbg]).player_advanced_stats().shape[0] > 0
+
+
+def test_season_bygamestats_serial():
+    """
+    test to make sure running with one worker takes dataframes as well as
+    files
+    """
+    game_dfs = [pd.read_csv("test/21900002.csv"), pd.read_csv("test/21900025.csv")]
+
+    pbg, tbg = npar.season_bygamestats(game_dfs, workers=1)
+
+    assert tbg.shape[0] == 4
+    assert set(pbg["game_id"]) == {21900002, 21900025}
@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+import nba_parser as npar
+
+
+@pytest.fixture(scope="session")
+def setup():
+    """
+    function for test setup and teardown
+    """
+    files = ["20700233.csv", "21100736.csv", "21900002.csv", "21900025.csv"]
+    game_dfs = [pd.read_csv(f"test/{f}") for f in files]
+    season = npar.SeasonPbP(pd.concat(game_dfs, ignore_index=True))
+    games = [npar.PbP(game_df) for game_df in game_dfs]
+
+    yield season, games
+
+
+def sort_frame(df, keys):
+    return df.sort_values(keys).reset_index(drop=True)
+
+
+def test_season_games(setup):
+    """
+    test to make sure the game info table has one row per game
+    """
+    season, games = setup
+
+    assert season.games.shape[0] == len(games)
+    assert season.games.loc[20700233, "home_team_abbrev"] == games[0].home_team
+
+
+def test_season_playerbygamestats(setup):
+    """
+    test to make sure the batch player box scores are the same as building
+    each game on its own
+    """
+    season, games = setup
+    keys = ["game_id", "player_id", "team_id"]
+
+    season_pbg = sort_frame(season.playerbygamestats(), keys)
+    game_pbg = sort_frame(pd.concat([g.playerbygamestats() for g in games]), keys)
+
+    pd.testing.assert_frame_equal(season_pbg, game_pbg)
+
+
+def test_season_player_stat_sums(setup):
+    """
+    test to make sure the player stat sums of many games only have a row for
+    each player's team and games instead of every combination of them
+    """
+    season, _ = setup
+    stat_sums = season._player_stat_sums()
+
+    assert stat_sums.shape[0] == season.playerbygamestats().shape[0]
+    assert stat_sums.index.is_unique
+
+
+def test_season_teambygamestats(setup):
+    """
+    test to make sure the batch team box scores are the same as building
+    each game on its own
+    """
+    season, games = setup
+    keys = ["game_id", "team_id"]
+
+    season_tbg = sort_frame(season.teambygamestats(), keys)
+    game_tbg = sort_frame(pd.concat([g.teambygamestats() for g in games]), keys)
+
+    pd.testing.assert_frame_equal(season_tbg, game_tbg)
+
+
+def test_season_rapm_possessions(setup):
+    """
+    test to make sure the batch rapm possessions are the same as building
+    each game on its own
+    """
+    season, games = setup
+
+    season_poss = season.rapm_possessions().reset_index(drop=True)
+    game_poss = pd.concat([g.rapm_possessions() for g in games], ignore_index=True)
+
+    pd.testing.assert_frame_equal(season_poss, game_poss)
+
+
+def test_live_pbp(setup):
+    """
+    test to make sure streaming every game into LivePbP a few events at a
+    time ends up with the same box scores as the whole season at once
+    """
+    season, games = setup
+    game_dfs = [pd.read_csv(f"test/{g.games.index[0]}.csv") for g in games]
+    live = npar.LivePbP()
+
+    for start in range(0, max(df.shape[0] for df in game_dfs), 25):
+        live.add_events(pd.concat([df[start : start + 25] for df in game_dfs]))
+
+    assert live.events == season.df.shape[0]
+
+    keys = ["game_id", "player_id", "team_id"]
+    pd.testing.assert_frame_equal(
+        sort_frame(live.playerbygamestats(), keys),
+        sort_frame(season.playerbygamestats(), keys),
+    )
+    pd.testing.assert_frame_equal(live.teambygamestats(), season.teambygamestats())
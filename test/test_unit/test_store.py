@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+import nba_parser as npar
+from nba_parser import store
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="session")
+def game_store(tmp_path_factory):
+    """
+    function for test setup and teardown
+    """
+    path = tmp_path_factory.mktemp("store")
+    store.write_games(["test/21900002.csv", "test/21900025.csv"], path)
+
+    yield path
+
+
+def test_store_schema(game_store):
+    """
+    test to make sure games are read back with the typed schema
+    """
+    pbp_df = store.load_games(game_store, game_ids=[21900025])
+
+    assert set(pbp_df["game_id"]) == {21900025}
+    assert pbp_df["home_player_1_id"].dtype == "int32"
+    assert pbp_df["event_type_de"].dtype == "category"
+    assert pbp_df["game_date"].dtype == "datetime64[ns]"
+    assert pbp_df["event_team"].dtype == pbp_df["home_team_abbrev"].dtype
+
+
+def test_store_projection(game_store):
+    """
+    test to make sure only the columns PbP needs are read from the store
+    """
+    pbp = npar.PbP.from_store(game_store, game_ids=[21900002])
+
+    assert "wctimestring" not in pbp.df.columns
+    assert set(npar.pbp.PBP_COLUMNS) <= set(pbp.df.columns)
+
+
+def test_store_playerbygamestats(game_store):
+    """
+    test to make sure stats calculated from the store match the csv files
+    """
+    pbp = npar.PbP.from_store(game_store, game_ids=[21900002])
+    csv_pbp = npar.PbP(pd.read_csv("test/21900002.csv"))
+
+    keys = ["player_id", "team_id"]
+    pd.testing.assert_frame_equal(
+        pbp.playerbygamestats().sort_values(keys).reset_index(drop=True),
+        csv_pbp.playerbygamestats().sort_values(keys).reset_index(drop=True),
+        check_dtype=False,
+    )
+
+
+def test_store_season(game_store):
+    """
+    test to make sure whole seasons can be loaded into SeasonPbP
+    """
+    season = npar.SeasonPbP.from_store(game_store, seasons=[2020])
+
+    assert season.teambygamestats().shape[0] == 4
+
+
+def test_arrow_zero_copy(tmp_path):
+    """
+    test to make sure PbP built from a memory mapped feather file calculates
+    its stats without copying or writing to the mapped columns
+    """
+    path = tmp_path / "season.feather"
+    store.write_feather(["test/21900002.csv", "test/21900025.csv"], path)
+    season = npar.SeasonPbP.from_arrow(path)
+
+    pbg = season.playerbygamestats()
+    tbg = season.teambygamestats()
+    season.rapm_possessions()
+
+    assert "home_possession" not in season.df.columns
+    assert not season.df["home_player_1_id"].to_numpy().flags.writeable
+    assert not season.df["seconds_elapsed"].to_numpy().flags.writeable
+    assert set(pbg["game_id"]) == {21900002, 21900025}
+    assert tbg.shape[0] == 4
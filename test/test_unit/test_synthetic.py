@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+import nba_parser as npar
+from nba_parser import synthetic
+
+LINEUP_COLUMNS = [
+    f"{team}_player_{i}_id" for team in ["home", "away"] for i in range(1, 6)
+]
+
+
+@pytest.fixture(scope="session")
+def season_df():
+    """
+    function for test setup and teardown
+    """
+    yield synthetic.generate_season(10, seed=7)
+
+
+def test_generate_season_schema(season_df):
+    """
+    test to make sure synthetic games have the columns and dtypes of the
+    nba_scraper csv files and the same seed gives the same games
+    """
+    game_df = pd.read_csv("test/21900002.csv")
+
+    assert list(season_df.columns) == list(game_df.columns)
+    assert (season_df.dtypes == game_df.dtypes).all()
+    assert season_df["game_id"].nunique() == 10
+    assert season_df.equals(synthetic.generate_season(10, seed=7))
+
+
+def test_generate_season_lineups(season_df):
+    """
+    test to make sure every event has ten different players on the court and
+    the player credited with a shot, rebound, free throw, turnover or foul is
+    one of them
+    """
+    lineups = np.sort(season_df[LINEUP_COLUMNS].to_numpy(), axis=1)
+    events = season_df["event_type_de"].isin(
+        ["shot", "missed_shot", "rebound", "free-throw", "turnover", "foul"]
+    )
+    on_court = season_df.loc[events, LINEUP_COLUMNS].to_numpy() == (
+        season_df.loc[events, "player1_id"].to_numpy()[:, None]
+    )
+
+    assert (lineups[:, 1:] != lineups[:, :-1]).all()
+    assert on_court.any(axis=1).all()
+
+
+def test_generate_season_box_scores(season_df):
+    """
+    test to make sure the box scores of synthetic games add up to the final
+    score and five players on the court for the whole game
+    """
+    season = npar.SeasonPbP(season_df)
+    tbg = season.teambygamestats()
+    pbg = season.playerbygamestats()
+
+    final_score = season_df.groupby("game_id")["score"].last().str.split(" - ")
+    home = tbg[tbg["is_home"] == 1].sort_values("game_id")
+    team_toc = pbg.groupby(["game_id", "team_id"])["toc"].sum().groupby("game_id")
+    game_length = season_df.groupby("game_id")["seconds_elapsed"].max()
+
+    # every groupby is sorted by game_id so the games line up
+    assert (home["points_for"].to_numpy() == final_score.str[1].astype(int)).all()
+    assert (home["points_against"].to_numpy() == final_score.str[0].astype(int)).all()
+    assert (team_toc.min().to_numpy() == 5 * game_length).all()
+    assert (team_toc.max().to_numpy() == 5 * game_length).all()
+    assert 85 < tbg["possessions"].mean() < 115
+
+
+def test_season_scales_linearly():
+    """
+    test to make sure a SeasonPbP of a hundred synthetic games only has a
+    row in its player stat sums for each player in each game they played,
+    at most the 13 players of both rosters per game
+    """
+    season = npar.SeasonPbP(synthetic.generate_season(100, seed=3))
+    stat_sums = season._player_stat_sums()
+    pbg = season.playerbygamestats()
+
+    assert stat_sums.shape[0] == pbg.shape[0]
+    assert stat_sums.shape[0] <= 100 * 2 * 13
+    assert pbg.groupby("game_id").size().max() <= 2 * 13